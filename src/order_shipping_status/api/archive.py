@@ -0,0 +1,294 @@
+# src/order_shipping_status/api/archive.py
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import os
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .normalize import index_payload_by_tn
+from ..utils import jsoncodec
+
+# Compressed replay archives: one independently compressed frame per API body
+# (a gzip member or a zstd frame), each holding one JSON document + "\n".
+# Concatenated frames are still a valid .gz/.zst stream, so the file can be
+# decompressed as a whole; `<archive>.idx.json` adds random access:
+#   {"format": "gz", "size": <archive bytes>, "frames": [[offset, length], ...],
+#    "tns": {"<tn>": <frame number>}}
+ARCHIVE_SUFFIXES = {".gz": "gz", ".zst": "zst"}
+INDEX_SUFFIX = ".idx.json"
+
+
+def archive_format(path: Union[str, Path]) -> Optional[str]:
+    """Return "gz"/"zst" for compressed archive paths, None for plain JSON."""
+    return ARCHIVE_SUFFIXES.get(Path(path).suffix.lower())
+
+
+def index_path_for(path: Union[str, Path]) -> Path:
+    p = Path(path)
+    return p.with_name(p.name + INDEX_SUFFIX)
+
+
+def _zstd():
+    try:
+        import zstandard  # optional dependency
+    except ImportError as ex:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "Reading/writing .zst replay archives requires the optional "
+            "'zstandard' package (pip install zstandard); use .gz instead."
+        ) from ex
+    return zstandard
+
+
+def _compress(data: bytes, fmt: str, level: Optional[int]) -> bytes:
+    if fmt == "gz":
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    return _zstd().ZstdCompressor(level=3 if level is None else level).compress(data)
+
+
+def _decompress(frame: bytes, fmt: str) -> bytes:
+    if fmt == "gz":
+        return gzip.decompress(frame)
+    return _zstd().ZstdDecompressor().decompress(frame)
+
+
+def _body_tracking_numbers(body: Any) -> List[str]:
+    tns = list(index_payload_by_tn(body))
+    if not tns and isinstance(body, dict) and body.get("trackingNumber"):
+        tns.append(str(body["trackingNumber"]))
+    return tns
+
+
+class ArchiveWriter:
+    """
+    Append API bodies to a compressed archive, one frame per body.
+
+    The index is rewritten every `index_every` appends and on `close()`;
+    readers ignore an index whose recorded size does not match the archive
+    and fall back to streaming, so a crash never yields wrong lookups.
+    Appending to an existing archive continues its index.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        level: Optional[int] = None,
+        index_every: int = 16,
+    ) -> None:
+        self.path = Path(path)
+        fmt = archive_format(self.path)
+        if fmt is None:
+            raise ValueError(
+                f"Not a compressed archive path (.gz/.zst): {self.path}")
+        self.format = fmt
+        self.level = level
+        self.index_every = max(1, int(index_every))
+        self.index_path = index_path_for(self.path)
+        self._lock = threading.Lock()
+        self._frames: List[List[int]] = []
+        self._tns: Dict[str, int] = {}
+        self._dirty = 0
+        self._load_existing()
+
+    def _load_existing(self) -> None:
+        if not self.path.exists():
+            return
+        idx = _read_index(self.path, self.format)
+        if idx is not None:
+            self._frames = [list(f) for f in idx["frames"]]
+            self._tns = dict(idx["tns"])
+            return
+        # No usable index: rebuild it by walking the existing frames
+        for i, (offset, length, body) in enumerate(_scan_frames(self.path, self.format)):
+            self._frames.append([offset, length])
+            for tn in _body_tracking_numbers(body):
+                self._tns[tn] = i
+
+    def append(self, body: Any, tracking_numbers: Optional[Iterable[str]] = None) -> None:
+        data = jsoncodec.dumps_bytes(body) + b"\n"
+        frame = _compress(data, self.format, self.level)
+        tns = [str(t) for t in tracking_numbers] if tracking_numbers is not None else []
+        tns = tns or _body_tracking_numbers(body)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as fh:
+                fh.seek(0, os.SEEK_END)
+                offset = fh.tell()
+                fh.write(frame)
+            n = len(self._frames)
+            self._frames.append([offset, len(frame)])
+            for tn in tns:
+                self._tns[tn] = n  # last write wins (e.g. a successful retry)
+            self._dirty += 1
+            if self._dirty >= self.index_every:
+                self._write_index()
+
+    def _write_index(self) -> None:
+        size = self.path.stat().st_size if self.path.exists() else 0
+        data = jsoncodec.dumps_bytes({"format": self.format, "size": size,
+                                      "frames": self._frames, "tns": self._tns})
+        tmp = self.index_path.with_name(f".{self.index_path.name}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, self.index_path)
+        self._dirty = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._write_index()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _read_index(path: Path, fmt: str) -> Optional[Dict[str, Any]]:
+    ip = index_path_for(path)
+    try:
+        idx = jsoncodec.loads(ip.read_bytes())
+        if idx.get("format") == fmt and idx.get("size") == path.stat().st_size:
+            return idx
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _scan_frames(path: Path, fmt: str) -> Iterator[Tuple[int, int, Any]]:
+    """Yield (offset, length, body) for every frame by walking frame boundaries."""
+    data = memoryview(path.read_bytes())
+    offset = 0
+    while offset < len(data):
+        if fmt == "gz":
+            d = zlib.decompressobj(31)
+            out = d.decompress(data[offset:])
+            out += d.flush()
+            length = len(data) - offset - len(d.unused_data)
+        else:
+            zstd = _zstd()
+            d = zstd.ZstdDecompressor().decompressobj()
+            out = d.decompress(data[offset:])
+            length = len(data) - offset - len(d.unused_data)
+        if length <= 0:
+            break
+        for line in out.splitlines():
+            if line.strip():
+                yield offset, length, jsoncodec.loads(line)
+        offset += length
+
+
+def iter_archive(path: Union[str, Path]) -> Iterator[Any]:
+    """Stream every body from an archive (whole-file decompression, constant memory)."""
+    p = Path(path)
+    fmt = archive_format(p)
+    if fmt == "gz":
+        raw = gzip.open(p, "rb")
+    elif fmt == "zst":
+        raw = _zstd().ZstdDecompressor().stream_reader(
+            p.open("rb"), read_across_frames=True, closefd=True)
+    else:
+        raise ValueError(f"Not a compressed archive path (.gz/.zst): {p}")
+    with io.TextIOWrapper(raw, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield jsoncodec.loads(line)
+
+
+class ArchiveReader:
+    """
+    Random access to single bodies through `<archive>.idx.json`.
+
+    `frame_for(tn)` returns the frame number holding a TN's body and
+    `read_frame(i)` seeks and decompresses only that frame. Recently read
+    frames are cached (consecutive TNs usually share a 30-TN body).
+    """
+
+    def __init__(self, path: Union[str, Path], *, cache_frames: int = 8) -> None:
+        self.path = Path(path)
+        fmt = archive_format(self.path)
+        if fmt is None:
+            raise ValueError(
+                f"Not a compressed archive path (.gz/.zst): {self.path}")
+        self.format = fmt
+        self._index = _read_index(self.path, fmt)
+        self._cache: "OrderedDict[int, Any]" = OrderedDict()
+        self._cache_frames = max(1, int(cache_frames))
+        self._lock = threading.Lock()
+
+    @property
+    def has_index(self) -> bool:
+        return self._index is not None
+
+    def tracking_numbers(self) -> List[str]:
+        return list(self._index["tns"]) if self._index else []
+
+    def frame_for(self, tn: str) -> Optional[int]:
+        if not self._index:
+            return None
+        return self._index["tns"].get(str(tn))
+
+    def read_frame(self, i: int) -> Any:
+        with self._lock:
+            if i in self._cache:
+                self._cache.move_to_end(i)
+                return self._cache[i]
+        offset, length = self._index["frames"][i]
+        with self.path.open("rb") as fh:
+            fh.seek(offset)
+            frame = fh.read(length)
+        body = jsoncodec.loads(_decompress(frame, self.format))
+        with self._lock:
+            self._cache[i] = body
+            while len(self._cache) > self._cache_frames:
+                self._cache.popitem(last=False)
+        return body
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter_archive(self.path)
+
+
+def compress_dump(src: Union[str, Path], dest: Union[str, Path], *, level: Optional[int] = None) -> int:
+    """Convert a plain JSON dump (array or single body) into an indexed archive."""
+    raw = jsoncodec.loads(Path(src).read_bytes())
+    bodies = raw if isinstance(raw, list) else [raw]
+    d = Path(dest)
+    if d.exists():
+        d.unlink()
+    with ArchiveWriter(d, level=level) as w:
+        for body in bodies:
+            w.append(body)
+    return len(bodies)
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        prog="oss-archive",
+        description="Convert a JSON API-body dump into an indexed .gz/.zst replay archive.",
+    )
+    p.add_argument("src", type=Path, help="Plain JSON dump (array of bodies).")
+    p.add_argument("dest", type=Path, help="Archive path ending in .gz or .zst.")
+    p.add_argument("--level", type=int, default=None)
+    args = p.parse_args(argv)
+    try:
+        n = compress_dump(args.src, args.dest, level=args.level)
+    except (OSError, ValueError, RuntimeError) as ex:
+        print(f"error: {ex}", file=sys.stderr)
+        return 2
+    print(f"wrote {n} bodies → {args.dest} "
+          f"({args.src.stat().st_size} → {args.dest.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
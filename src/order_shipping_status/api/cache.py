@@ -0,0 +1,107 @@
+# src/order_shipping_status/api/cache.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class CachingClient:
+    """
+    TTL cache in front of any shipping client (`fetch_status` / `fetch_batch`).
+
+    Intended for long-lived processes (watch mode, service) where the same
+    tracking numbers show up again within minutes. Only non-empty payloads are
+    cached, so failed or unmatched lookups are retried on the next request.
+    `fetch_batch` forwards only the cache misses to the wrapped client; other
+    attributes (e.g. the helper's `_writer`) are read from it.
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        *,
+        ttl_seconds: float = 900.0,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.inner = inner
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = int(max_entries)
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found normally (e.g. `_writer`)
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def _get(self, tn: str, now: float) -> Optional[dict]:
+        hit = self._entries.get(tn)
+        if hit is None:
+            return None
+        if hit[0] <= now:
+            del self._entries[tn]
+            return None
+        return hit[1]
+
+    def _put(self, tn: str, payload: Any, now: float) -> None:
+        if not payload or self.ttl_seconds <= 0:
+            return
+        if len(self._entries) >= self.max_entries:
+            # Drop expired entries first, then the oldest insertions
+            for k in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                del self._entries[k]
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        self._entries[tn] = (now + self.ttl_seconds, payload)
+
+    def fetch_status(self, tracking_number: str, carrier_code: Optional[str] = None) -> dict:
+        tn = str(tracking_number)
+        with self._lock:
+            cached = self._get(tn, self._clock())
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+        payload = self.inner.fetch_status(tn, carrier_code) or {}
+        with self._lock:
+            self._put(tn, payload, self._clock())
+        return payload
+
+    def fetch_batch(self, tracking_numbers: list[str], carrier_map: Optional[Dict[str, str]] = None) -> Dict[str, dict]:
+        out: Dict[str, dict] = {}
+        missing: list[str] = []
+        with self._lock:
+            now = self._clock()
+            for tn in tracking_numbers:
+                tn = str(tn)
+                cached = self._get(tn, now)
+                if cached is not None:
+                    out[tn] = cached
+                    self.hits += 1
+                elif tn not in missing:
+                    missing.append(tn)
+            self.misses += len(missing)
+        if missing:
+            if hasattr(self.inner, "fetch_batch"):
+                fetched = self.inner.fetch_batch(
+                    missing, carrier_map=carrier_map) or {}
+            else:
+                fetched = {tn: self.inner.fetch_status(
+                    tn, (carrier_map or {}).get(tn)) or {} for tn in missing}
+            with self._lock:
+                now = self._clock()
+                for tn in missing:
+                    payload = fetched.get(tn, {})
+                    out[tn] = payload
+                    self._put(tn, payload, now)
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
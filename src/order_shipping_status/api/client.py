@@ -2,11 +2,12 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Protocol, Any, List
-import json
+from typing import Optional, Protocol, Any, Iterable, List
+from order_shipping_status.utils import jsoncodec
+from order_shipping_status.api.archive import ArchiveReader, archive_format, iter_archive
 
 # NEW: import the new normalizer + model
-from order_shipping_status.api.normalize import normalize_fedex
+from order_shipping_status.api.normalize import index_payload_by_tn, normalize_fedex
 from order_shipping_status.models import NormalizedShippingData
 
 
@@ -19,14 +20,20 @@ class ShippingClient(Protocol):
 class ReplayClient:
     """Replay client that uses a single JSON file containing one or more API bodies.
 
+    `.gz`/`.zst` archives written by `FedExWriter` (see `api.archive`) are read
+    transparently; with their index only the frames holding requested TNs are
+    decompressed.
+
     The provided `replay_dir` must be a path to a file (not a directory). The file
     may contain a single JSON object or a JSON array. The client builds an index
     mapping tracking numbers to payloads on initialization and serves payloads
-    from that index for `fetch_status` calls.
+    from that index for `fetch_status` calls. Batch bodies are split into
+    TN-scoped payloads while indexing, so callers never re-scan a 30-TN body.
     """
 
     replay_dir: Path
     _index: dict[str, Any] | None = None
+    _archive: Any = None
 
     def __post_init__(self) -> None:
         if not self.replay_dir.exists():
@@ -36,20 +43,40 @@ class ReplayClient:
                 "ReplayClient requires a single JSON file containing one or more API bodies; directories of per-TN files are not supported."
             )
 
-        raw = json.loads(self.replay_dir.read_text(encoding="utf-8"))
-        entries: List[Any]
-        if isinstance(raw, list):
-            entries = raw
+        entries: Iterable[Any]
+        if archive_format(self.replay_dir):
+            # Compressed archive: with a valid index, bodies are decompressed
+            # one frame at a time on lookup; otherwise stream the whole file.
+            reader = ArchiveReader(self.replay_dir)
+            if reader.has_index:
+                self._archive = reader
+                self._index = {}
+                return
+            entries = iter_archive(self.replay_dir)
         else:
-            entries = [raw]
+            raw = jsoncodec.loads(self.replay_dir.read_bytes())
+            entries = raw if isinstance(raw, list) else [raw]
 
         idx: dict[str, Any] = {}
         for entry in entries:
-            for tn in self._extract_tracking_numbers(entry):
-                idx[str(tn)] = entry
+            idx.update(self._index_entry(entry))
 
         self._index = idx
 
+    def _index_entry(self, entry: Any) -> dict[str, Any]:
+        # Only batch bodies are split; a single-TN entry is already scoped
+        # and is served whole (it may carry extra flat fields).
+        idx: dict[str, Any] = {}
+        scoped = index_payload_by_tn(entry)
+        if len(scoped) > 1:
+            idx.update(scoped)
+        else:
+            scoped = {}
+        for tn in self._extract_tracking_numbers(entry):
+            if str(tn) not in scoped:
+                idx[str(tn)] = entry
+        return idx
+
     def _extract_tracking_numbers(self, payload: Any) -> List[str]:
         results: List[str] = []
         try:
@@ -92,7 +119,14 @@ class ReplayClient:
 
     def fetch_status(self, tracking_number: str, carrier_code: Optional[str] = None) -> dict[str, Any]:
         # Only combined-file mode supported: return indexed payload or empty dict
-        return self._index.get(str(tracking_number), {})
+        tn = str(tracking_number)
+        if self._archive is not None and tn not in self._index:
+            frame = self._archive.frame_for(tn)
+            if frame is None:
+                return {}
+            self._index.update(self._index_entry(
+                self._archive.read_frame(frame)))
+        return self._index.get(tn, {})
 
 
 # NEW: Back-compat shim. Keeps older tests/callers working.
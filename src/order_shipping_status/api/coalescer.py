@@ -0,0 +1,147 @@
+# src/order_shipping_status/api/coalescer.py
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+
+class CoalescingClient:
+    """
+    Pack per-TN `fetch_status` calls into `fetch_batch` calls of up to
+    `max_batch` TNs.
+
+    `submit()` queues a TN and returns a Future; a dispatcher thread waits up
+    to `window_ms` after the first queued TN (or until `max_batch` TNs are
+    queued) and sends them in one request. Concurrent submits for the same TN
+    share one Future. `fetch_status()` is `submit().result()`, so existing
+    per-TN callers get batch-level round trips when called from several
+    threads or when TNs are submitted ahead of time (see `Enricher`).
+
+    Unknown attributes are delegated to the wrapped client.
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        *,
+        window_ms: float = 5.0,
+        max_batch: int = 30,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.inner = inner
+        self.window = max(0.0, float(window_ms)) / 1000.0
+        self.max_batch = max(1, int(max_batch))
+        self.logger = logger
+        self._cond = threading.Condition()
+        self._queue: List[str] = []
+        self._carriers: Dict[str, str] = {}
+        self._pending: Dict[str, Future] = {}
+        self._first_at: Optional[float] = None
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="oss-coalescer", daemon=True)
+        self._thread.start()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found normally (e.g. `_writer`)
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def submit(self, tracking_number: str, carrier_code: Optional[str] = None) -> Future:
+        tn = str(tracking_number)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("coalescing client is closed")
+            fut = self._pending.get(tn)
+            if fut is not None:
+                return fut
+            fut = Future()
+            self._pending[tn] = fut
+            self._queue.append(tn)
+            if carrier_code:
+                self._carriers[tn] = carrier_code
+            if self._first_at is None:
+                self._first_at = time.monotonic()
+            self._cond.notify()
+            return fut
+
+    def fetch_status(self, tracking_number: str, carrier_code: Optional[str] = None) -> dict:
+        return self.submit(tracking_number, carrier_code).result()
+
+    def fetch_batch(self, tracking_numbers: list[str], carrier_map: Optional[Dict[str, str]] = None) -> Dict[str, dict]:
+        carrier_map = carrier_map or {}
+        futures = {str(tn): self.submit(tn, carrier_map.get(tn))
+                   for tn in tracking_numbers}
+        return {tn: fut.result() for tn, fut in futures.items()}
+
+    # ---- dispatcher ----
+    def _next_batch(self) -> Optional[tuple[List[str], Dict[str, str]]]:
+        with self._cond:
+            while True:
+                if self._queue:
+                    if len(self._queue) >= self.max_batch or self._closed:
+                        break
+                    remaining = self._first_at + self.window - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait()
+            batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+            carriers = {tn: self._carriers.pop(tn)
+                        for tn in batch if tn in self._carriers}
+            self._first_at = time.monotonic() if self._queue else None
+            return batch, carriers
+
+    def _run(self) -> None:
+        while True:
+            nxt = self._next_batch()
+            if nxt is None:
+                return
+            batch, carriers = nxt
+            try:
+                if hasattr(self.inner, "fetch_batch"):
+                    results = self.inner.fetch_batch(
+                        batch, carrier_map=carriers) or {}
+                else:
+                    results = {tn: self.inner.fetch_status(
+                        tn, carriers.get(tn)) or {} for tn in batch}
+                error = None
+            except Exception as ex:
+                results, error = {}, ex
+                if self.logger:
+                    try:
+                        self.logger.warning(
+                            "Coalesced fetch failed (%d TNs): %s", len(batch), ex)
+                    except Exception:
+                        pass
+            with self._cond:
+                futures = [(tn, self._pending.pop(tn, None)) for tn in batch]
+            for tn, fut in futures:
+                if fut is None:
+                    continue
+                if error is not None:
+                    fut.set_exception(error)
+                else:
+                    fut.set_result(results.get(tn, {}))
+
+    def close(self) -> None:
+        """Flush queued TNs and stop the dispatcher thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def __enter__(self) -> "CoalescingClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
-import json
+from typing import Any, Dict, Optional, Tuple
 import time
 import logging
 
 from .transport import RequestsTransport
+from ..config.logging_config import BodyLogSampler, LazyPayload
+from ..utils.metrics import MetricsSink, NullMetrics
 
 
 @dataclass
@@ -33,7 +34,11 @@ class FedExClient:
       responsible for batching and persistence.
 
     The client uses RequestsTransport for HTTP operations so it fits the
-    project's transport abstraction.
+    project's transport abstraction. Request latency, response size, retries,
+    429s and token refreshes are reported to the optional `metrics` sink.
+
+    Request/response bodies are only rendered for DEBUG logging, lazily, and
+    optionally thinned out by a `body_sampler`.
     """
 
     def __init__(
@@ -43,6 +48,8 @@ class FedExClient:
         transport: Optional[RequestsTransport] = None,
         *,
         logger: Optional[logging.Logger] = None,
+        metrics: Optional[MetricsSink] = None,
+        body_sampler: Optional[BodyLogSampler] = None,
     ) -> None:
         self.auth = auth
         self.cfg = cfg
@@ -52,6 +59,69 @@ class FedExClient:
         self.logger: logging.Logger = logger or logging.getLogger(
             "order_shipping_status.api.fedex"
         )
+        self.metrics: MetricsSink = metrics or NullMetrics()
+        self.body_sampler = body_sampler
+
+    def _should_log_bodies(self) -> bool:
+        """True when DEBUG is enabled and the sampler (if any) admits this call."""
+        try:
+            if not self.logger.isEnabledFor(logging.DEBUG):
+                return False
+        except Exception:
+            return False
+        return self.body_sampler is None or self.body_sampler.allow()
+
+    def _record_response(self, resp: Any, elapsed: float) -> None:
+        """Report latency, size, retry and 429 counts for one tracking POST."""
+        try:
+            m = self.metrics
+            m.inc("fedex_requests_total")
+            m.observe("fedex_request_seconds", elapsed)
+            content = getattr(resp, "content", None)
+            if isinstance(content, (bytes, bytearray)):
+                m.observe("fedex_response_bytes", len(content))
+            status = getattr(resp, "status_code", None)
+            # urllib3 records the retries it performed on the raw response;
+            # Http2Transport lists the retried attempts' statuses instead
+            retries = getattr(getattr(resp, "raw", None), "retries", None)
+            history = [getattr(h, "status", None)
+                       for h in getattr(retries, "history", None) or ()]
+            if not history:
+                ext = getattr(resp, "extensions", None)
+                history = list(ext.get("retry_statuses") or ()) if isinstance(ext, dict) else []
+            self._record_retries(history, status)
+            if isinstance(status, int) and status >= 400:
+                m.inc("fedex_request_errors_total")
+        except Exception:
+            pass
+
+    def _record_failure(self, ex: BaseException, elapsed: float) -> None:
+        """Report a tracking POST that raised (e.g. retries exhausted on 429s)."""
+        try:
+            m = self.metrics
+            m.inc("fedex_requests_total")
+            m.observe("fedex_request_seconds", elapsed)
+            m.inc("fedex_request_errors_total")
+            # requests wraps urllib3's MaxRetryError, which RequestsTransport
+            # tags with the attempt history (terminal attempt last)
+            cause = ex.args[0] if ex.args else None
+            history = getattr(cause, "history", None) or getattr(ex, "history", None)
+            if history:
+                statuses = [getattr(h, "status", None) for h in history]
+                self._record_retries(statuses[:-1], statuses[-1])
+            else:
+                self._record_retries(list(getattr(ex, "retry_statuses", None) or ()), None)
+        except Exception:
+            pass
+
+    def _record_retries(self, retried: list, status: Optional[int]) -> None:
+        """Count the retried attempts and every 429 among them and the final `status`."""
+        m = self.metrics
+        if retried:
+            m.inc("fedex_retries_total", len(retried))
+        throttled = sum(1 for h in retried if h == 429) + (status == 429)
+        if throttled:
+            m.inc("fedex_http_429_total", throttled)
 
     def authenticate(self) -> Optional[str]:
         """Ensure an access token is available and return it.
@@ -102,6 +172,7 @@ class FedExClient:
             self._token = j.get("access_token")
             expires_in = int(j.get("expires_in", 3600))
             self._token_expires_at = time.time() + expires_in
+            self.metrics.inc("fedex_token_refreshes_total")
             try:
                 self.logger.debug(
                     "FedEx token acquired (expires_in=%s status=%s)", expires_in, status
@@ -143,31 +214,38 @@ class FedExClient:
           call `authenticate()` and use the cached token.
         - The function returns the parsed JSON response (or an empty dict on error).
         """
+        return self.post_tracking_with_status(body, access_token)[0]
+
+    def post_tracking_with_status(self, body: Dict[str, Any], access_token: Optional[str] = None) -> Tuple[Dict[str, Any], Optional[int]]:
+        """Like `post_tracking`, but also return the HTTP status.
+
+        The status is None when no response was received (no token, transport
+        error, retries exhausted), which lets callers tell an outage from a
+        4xx rejection of the request's contents.
+        """
         token = access_token or self.authenticate()
         if not token:
-            return {}
+            return {}, None
 
         headers = {"Authorization": f"Bearer {token}",
                    "Content-Type": "application/json"}
         endpoint = self._endpoint_for_tracking()
 
-        try:
-            body_text = json.dumps(body, ensure_ascii=False)
-        except Exception:
-            body_text = str(body)
-
-        try:
-            self.logger.debug(
-                "FedEx POST endpoint=%s request_body=%s",
-                endpoint,
-                (body_text[:4000] +
-                 "...") if len(body_text) > 4000 else body_text,
-            )
-        except Exception:
-            pass
+        log_bodies = self._should_log_bodies()
+        if log_bodies:
+            try:
+                self.logger.debug(
+                    "FedEx POST endpoint=%s request_body=%s",
+                    endpoint,
+                    LazyPayload(body),
+                )
+            except Exception:
+                pass
 
         try:
+            started = time.perf_counter()
             resp = self.transport.post(endpoint, headers=headers, json=body)
+            self._record_response(resp, time.perf_counter() - started)
             try:
                 status = resp.status_code
             except Exception:
@@ -175,24 +253,17 @@ class FedExClient:
             try:
                 resp.raise_for_status()
                 j = resp.json()
-                try:
-                    resp_text = json.dumps(j, ensure_ascii=False)
-                except Exception:
+                if log_bodies:
                     try:
-                        resp_text = resp.text
+                        self.logger.debug(
+                            "FedEx POST endpoint=%s status=%s response_body=%s",
+                            endpoint,
+                            status,
+                            LazyPayload(j),
+                        )
                     except Exception:
-                        resp_text = str(j)
-                try:
-                    self.logger.debug(
-                        "FedEx POST endpoint=%s status=%s response_body=%s",
-                        endpoint,
-                        status,
-                        (resp_text[:4000] + "...") if resp_text and len(
-                            resp_text) > 4000 else resp_text,
-                    )
-                except Exception:
-                    pass
-                return j
+                        pass
+                return j, status
             except Exception as ex:
                 resp_text = None
                 try:
@@ -205,16 +276,16 @@ class FedExClient:
                         endpoint,
                         status,
                         ex,
-                        (resp_text[:4000] + "...") if resp_text and len(
-                            resp_text) > 4000 else resp_text,
+                        LazyPayload(resp_text),
                     )
                 except Exception:
                     pass
-                return {}
+                return {}, status
         except Exception as ex:
+            self._record_failure(ex, time.perf_counter() - started)
             try:
                 self.logger.warning(
                     "FedEx transport POST failed for endpoint=%s: %s", endpoint, ex)
             except Exception:
                 pass
-            return {}
+            return {}, None
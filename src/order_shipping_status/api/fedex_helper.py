@@ -1,97 +1,230 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
 import logging
 
+from .normalize import _complete_track_results, index_payload_by_tn
+from ..utils.metrics import MetricsSink, NullMetrics
+
+# Statuses that say nothing about the chunk's TNs: the API is down or refusing us
+OUTAGE_STATUSES = (401, 403, 408, 429)
+
 
 class FedexHelper:
     """Adapter that exposes fetch_batch/fetch_status to the existing pipeline.
 
     It performs batching (<=30 TNs per POST), calls the low-level FedExClient
     for auth and POST, and optionally writes API bodies via FedExWriter.
+    Results are always TN-keyed and TN-scoped (`index_payload_by_tn`), so
+    consumers never re-scan a 30-TN batch body.
+    Chunk sizes, empty per-TN results and whole-body fallbacks are reported to
+    the optional `metrics` sink.
+
+    With `bisect_failures`, a chunk whose POST failed (`{}` or no
+    completeTrackResults) is split and re-requested, down to single TNs, to
+    isolate poison TNs; at most `bisect_budget` extra POSTs are spent per
+    chunk. Clients exposing `post_tracking_with_status` let an outage
+    (transport error, 5xx, 401/403/408/429) be told apart from a 4xx
+    rejection, and an outage is not bisected. TNs that still fail are kept
+    in `failed_tns` and added to the optional `retry_queue`
+    (`io.retry_queue.RetryQueue`); fetched TNs are discarded from it.
+
+    With a `journal` (`io.journal.ChunkJournal`), TNs already journaled are
+    served without a request and each completed chunk's results (minus
+    failed TNs and empty payloads) are checkpointed, so a crashed run can
+    resume and still re-request whatever came back empty.
     """
 
-    def __init__(self, client, writer: Optional[Any] = None, logger: Optional[logging.Logger] = None) -> None:
+    def __init__(
+        self,
+        client,
+        writer: Optional[Any] = None,
+        logger: Optional[logging.Logger] = None,
+        *,
+        metrics: Optional[MetricsSink] = None,
+        bisect_failures: bool = False,
+        bisect_budget: int = 60,
+        retry_queue: Optional[Any] = None,
+        journal: Optional[Any] = None,
+    ) -> None:
         self._client = client
         self._writer = writer
         self._logger = logger
+        self._metrics: MetricsSink = metrics or NullMetrics()
+        self._bisect = bisect_failures
+        self._bisect_budget = max(0, int(bisect_budget))
+        self._retry_queue = retry_queue
+        self._journal = journal
+        self.failed_tns: Dict[str, Optional[str]] = {}
+
+    def _warn(self, msg: str, *args) -> None:
+        if self._logger:
+            try:
+                self._logger.warning(msg, *args)
+            except Exception:
+                pass
 
     def fetch_batch(self, tracking_numbers: list[str], carrier_map: Optional[Dict[str, str]] = None) -> Dict[str, dict]:
         if not tracking_numbers:
             return {}
+        if self._journal is not None:
+            journaled = {tn: self._journal.get(tn)
+                         for tn in tracking_numbers if tn in self._journal}
+            if journaled:
+                remaining = [
+                    tn for tn in tracking_numbers if tn not in journaled]
+                if self._logger:
+                    try:
+                        self._logger.info(
+                            "Journal: %d TN(s) reused, %d to fetch", len(journaled), len(remaining))
+                    except Exception:
+                        pass
+                self._metrics.inc("fedex_journal_hits_total", len(journaled))
+                out = self._fetch_chunks(remaining, carrier_map) if remaining else {}
+                return {tn: out[tn] if tn in out else journaled[tn] for tn in tracking_numbers}
+        return self._fetch_chunks(tracking_numbers, carrier_map)
+
+    def _fetch_chunks(self, tracking_numbers: list[str], carrier_map: Optional[Dict[str, str]]) -> Dict[str, dict]:
         token = self._client.authenticate()
         if not token:
+            self._metrics.inc("fedex_empty_results_total", len(tracking_numbers))
+            self._mark_failed(tracking_numbers, carrier_map)
             return {tn: {} for tn in tracking_numbers}
 
         out: Dict[str, dict] = {}
         CHUNK = 30
         for i in range(0, len(tracking_numbers), CHUNK):
             chunk = tracking_numbers[i:i+CHUNK]
-            tracking_info = []
-            for tn in chunk:
-                info = {"trackingNumberInfo": {"trackingNumber": tn}}
-                if carrier_map and carrier_map.get(tn):
-                    info["carrierCode"] = carrier_map.get(tn)
-                tracking_info.append(info)
-
-            body = {"trackingInfo": tracking_info,
-                    "includeDetailedScans": True}
-            j = self._client.post_tracking(body, access_token=token)
-
-            # persist raw bodies if requested
-            if self._writer:
+            j, outage = self._post_chunk(chunk, carrier_map, token)
+            if not self._chunk_failed(j):
+                res = self._scope_chunk(chunk, j)
+            elif self._bisect and not outage:
+                res = self._bisect_chunk(chunk, carrier_map, token)
+            else:
+                self._mark_failed(chunk, carrier_map)
+                res = self._scope_chunk(chunk, j)
+            out.update(res)
+            if self._journal is not None:
                 try:
-                    self._writer.write(list(chunk), j)
-                except Exception:
-                    if self._logger:
-                        try:
-                            self._logger.warning(
-                                "Failed to write API body for chunk %s", chunk)
-                        except Exception:
-                            pass
-
-            # Map per-TN results similar to earlier behavior
-            per_tn_map: Dict[str, dict] = {}
+                    self._journal.record(
+                        {tn: p for tn, p in res.items() if p and tn not in self.failed_tns})
+                except Exception as ex:
+                    self._warn("Failed to journal chunk: %s", ex)
+
+        return out
+
+    def _post_chunk(self, chunk: list[str], carrier_map: Optional[Dict[str, str]], token: str) -> Tuple[Any, bool]:
+        """POST one chunk; returns `(body, outage)` (`outage` only from status-aware clients)."""
+        self._metrics.observe("fedex_chunk_size", len(chunk))
+        tracking_info = []
+        for tn in chunk:
+            info = {"trackingNumberInfo": {"trackingNumber": tn}}
+            if carrier_map and carrier_map.get(tn):
+                info["carrierCode"] = carrier_map.get(tn)
+            tracking_info.append(info)
+
+        body = {"trackingInfo": tracking_info,
+                "includeDetailedScans": True}
+        post = getattr(self._client, "post_tracking_with_status", None)
+        if post is not None:
+            j, status = post(body, access_token=token)
+            outage = status is None or status >= 500 or status in OUTAGE_STATUSES
+        else:
+            j, outage = self._client.post_tracking(body, access_token=token), False
+
+        # persist raw bodies if requested
+        if self._writer:
             try:
-                ctr = None
-                if isinstance(j, dict):
-                    if "completeTrackResults" in j and isinstance(j.get("completeTrackResults"), list):
-                        ctr = j.get("completeTrackResults")
-                    else:
-                        cand = j
-                        for key in ("output", "body", "response", "data"):
-                            if isinstance(cand.get(key, None), dict):
-                                cand = cand.get(key)
-                        if isinstance(cand.get("completeTrackResults", None), list):
-                            ctr = cand.get("completeTrackResults")
-
-                if ctr:
-                    for cr in ctr:
-                        if not isinstance(cr, dict):
-                            continue
-                        tn_in = str(cr.get("trackingNumber", "")).strip()
-                        if tn_in:
-                            per_tn_map[tn_in] = {"completeTrackResults": [cr]}
-                            continue
-                        tr_list = cr.get("trackResults") or []
-                        if isinstance(tr_list, list):
-                            for tr in tr_list:
-                                if not isinstance(tr, dict):
-                                    continue
-                                tinfo = tr.get("trackingNumberInfo") or {}
-                                tn_nested = str(
-                                    tinfo.get("trackingNumber", "")).strip()
-                                if tn_nested:
-                                    per_tn_map[tn_nested] = {
-                                        "completeTrackResults": [cr]}
+                self._writer.write(list(chunk), j)
             except Exception:
-                per_tn_map = {}
-
-            for tn in chunk:
-                out[tn] = per_tn_map.get(tn, j or {})
+                self._warn("Failed to write API body for chunk %s", chunk)
+        return j, outage
+
+    @staticmethod
+    def _chunk_failed(j: Any) -> bool:
+        """A failed POST yields `{}`; an error body carries no completeTrackResults."""
+        return not _complete_track_results(j)
+
+    def _scope_chunk(self, chunk: list[str], j: Any) -> Dict[str, dict]:
+        # Index the response once: every TN (direct or nested under
+        # trackResults) maps to its own scoped payload.
+        try:
+            per_tn_map = index_payload_by_tn(j)
+        except Exception:
+            per_tn_map = {}
 
+        out: Dict[str, dict] = {}
+        for tn in chunk:
+            scoped = per_tn_map.get(tn)
+            if scoped is None:
+                # Never hand a multi-TN body to a single TN; a one-TN
+                # request's body is that TN's by definition.
+                if j and len(set(chunk)) == 1:
+                    self._metrics.inc("fedex_whole_body_fallbacks_total")
+                    scoped = j
+                else:
+                    scoped = {}
+            if not scoped:
+                self._metrics.inc("fedex_empty_results_total")
+            out[tn] = scoped
+
+        if self._retry_queue is not None and not self._chunk_failed(j):
+            # TNs the response had nothing for stay queued for the next retry
+            self._retry_queue.discard_many([tn for tn in chunk if out[tn]])
         return out
 
+    def _bisect_chunk(self, chunk: list[str], carrier_map: Optional[Dict[str, str]], token: str) -> Dict[str, dict]:
+        """
+        Re-request a failed chunk as halves, splitting failed halves again
+        (breadth-first) until every poison TN is isolated on its own. Stops
+        when `bisect_budget` POSTs are spent or a POST reports an outage;
+        every TN not fetched by then is marked failed.
+        """
+        out: Dict[str, dict] = {}
+        failed: list[str] = []
+        budget = self._bisect_budget
+        outage = False
+        parts = deque([chunk])
+        while parts:
+            part = parts.popleft()
+            if outage or budget <= 0:
+                failed.extend(part)
+                continue
+            self._metrics.inc("fedex_chunk_splits_total")
+            mid = len(part) // 2
+            for half in (part[:mid], part[mid:]):
+                if outage or budget <= 0:
+                    failed.extend(half)
+                    continue
+                budget -= 1
+                j, outage = self._post_chunk(half, carrier_map, token)
+                if not self._chunk_failed(j):
+                    out.update(self._scope_chunk(half, j))
+                elif outage or len(half) == 1:
+                    failed.extend(half)
+                else:
+                    parts.append(half)
+
+        if failed:
+            if outage:
+                self._warn("FedEx outage while bisecting a chunk; queuing %d TN(s) for a later run",
+                           len(failed))
+            elif budget <= 0:
+                self._warn("Bisect budget spent; queuing %d TN(s) for a later run", len(failed))
+            self._mark_failed(failed, carrier_map)
+            self._metrics.inc("fedex_empty_results_total", len(failed))
+            out.update({tn: {} for tn in failed})
+        return {tn: out[tn] for tn in chunk}
+
+    def _mark_failed(self, tns: list[str], carrier_map: Optional[Dict[str, str]]) -> None:
+        self._metrics.inc("fedex_failed_tns_total", len(tns))
+        for tn in tns:
+            carrier = (carrier_map or {}).get(tn)
+            self.failed_tns[tn] = carrier
+            if self._retry_queue is not None:
+                self._retry_queue.add(tn, carrier)
+
     def fetch_status(self, tracking_number: str, carrier_code: Optional[str] = None) -> Dict[str, Any]:
         res = self.fetch_batch([tracking_number], carrier_map={
                                tracking_number: carrier_code} if carrier_code else None)
@@ -2,16 +2,23 @@ from __future__ import annotations
 
 import logging
 import threading
-import json
 from typing import Any, Dict, Optional
 from pathlib import Path
 from dataclasses import dataclass
 
+from .archive import ArchiveWriter, archive_format, iter_archive
+from ..utils import jsoncodec
+
 
 @dataclass
 class FedExWriter:
     """Persist ONLY FedEx API response bodies as a single JSON array.
 
+    A `.gz`/`.zst` path writes an indexed compressed archive instead
+    (see `api.archive`), which `ReplayClient` reads transparently. Its
+    index is rewritten every `index_every` bodies; call `close()` at the
+    end of the run to write the final one.
+
     File shape on disk:
         [
           { ...response body 1... },
@@ -23,6 +30,7 @@ class FedExWriter:
     path: Path
     json_list: bool = True
     logger: Optional[logging.Logger] = None
+    index_every: int = 100
 
     def __post_init__(self) -> None:
         self.path = Path(self.path)
@@ -31,28 +39,48 @@ class FedExWriter:
         # lock to make append/persist thread-safe
         self._lock = threading.Lock()
         # Ensure parent dir exists lazily on first write
+        # `.gz`/`.zst` paths append one compressed frame per body (api.archive);
+        # rewriting the whole index per body would make long runs quadratic.
+        self._archive = None
+        if archive_format(self.path):
+            self._archive = ArchiveWriter(self.path, index_every=self.index_every)
 
     def write(self, requested: Any, response: Any) -> None:
-        """Back-compat entrypoint: now ignores `requested` and persists only `response`."""
+        """Back-compat entrypoint: persists only `response`; `requested` TNs index archives."""
+        if self._archive is not None:
+            self._append_archive(response, requested)
+            return
         self.add_response(response)
 
+    def _append_archive(self, response: Any, requested: Any = None) -> None:
+        try:
+            tns = list(requested) if isinstance(requested, (list, tuple)) else None
+            self._archive.append(response, tns)
+        except Exception as ex:
+            try:
+                self.logger.warning(
+                    "Failed to append FedEx API response to %s: %s", self.path, ex)
+            except Exception:
+                pass
+
     def add_response(self, response: Any) -> None:
         """Append a single response body (dict-like) into the on-disk JSON array."""
+        if self._archive is not None:
+            self._append_archive(response)
+            return
         try:
             with self._lock:
                 self.path.parent.mkdir(parents=True, exist_ok=True)
                 items = []
                 if self.path.exists():
                     try:
-                        with self.path.open("r", encoding="utf-8") as fh:
-                            data = json.load(fh)
-                            if isinstance(data, list):
-                                items = data
+                        data = jsoncodec.loads(self.path.read_bytes())
+                        if isinstance(data, list):
+                            items = data
                     except Exception:
                         items = []
                 items.append(response)
-                with self.path.open("w", encoding="utf-8") as fh:
-                    json.dump(items, fh, ensure_ascii=False, indent=2)
+                self.path.write_bytes(jsoncodec.dumps_bytes(items, indent=2))
         except Exception as ex:
             try:
                 self.logger.warning(
@@ -60,14 +88,28 @@ class FedExWriter:
             except Exception:
                 pass
 
+    def close(self) -> None:
+        """Flush the archive index (no-op for JSON arrays, which are rewritten per body)."""
+        if self._archive is None:
+            return
+        try:
+            self._archive.close()
+        except Exception as ex:
+            try:
+                self.logger.warning(
+                    "Failed to write archive index for %s: %s", self.path, ex)
+            except Exception:
+                pass
+
     def read_all(self) -> list:
         """Read and return all saved response bodies (JSON array)."""
         try:
             if not self.path.exists():
                 return []
-            with self.path.open("r", encoding="utf-8") as fh:
-                data = json.load(fh)
-                return data if isinstance(data, list) else []
+            if self._archive is not None:
+                return list(iter_archive(self.path))
+            data = jsoncodec.loads(self.path.read_bytes())
+            return data if isinstance(data, list) else []
         except Exception as ex:
             try:
                 self.logger.warning(
@@ -1,10 +1,85 @@
 # src/order_shipping_status/api/normalize.py
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 import pandas as pd
 
 
+_WRAPPER_KEYS = ("output", "body", "response", "data")
+
+
+def _complete_track_results(payload: Any) -> List[Any] | None:
+    """Locate the completeTrackResults list (top-level or under output/body/response/data)."""
+    if not isinstance(payload, dict):
+        return None
+    ctr = payload.get("completeTrackResults")
+    if isinstance(ctr, list):
+        return ctr
+    cand = payload
+    for key in _WRAPPER_KEYS:
+        if isinstance(cand.get(key, None), dict):
+            cand = cand.get(key)
+    ctr = cand.get("completeTrackResults")
+    return ctr if isinstance(ctr, list) else None
+
+
+def _scoped(cr: Dict[str, Any]) -> Dict[str, Any]:
+    return {"output": {"completeTrackResults": [cr]}}
+
+
+def index_payload_by_tn(payload: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    Walk a (possibly 30-TN) FedEx body once and return {tn: TN-scoped payload}.
+
+    Each scoped payload has the shape `{"output": {"completeTrackResults": [cr]}}`.
+    A container with a direct `trackingNumber` is kept whole; a container that
+    only identifies TNs via `trackResults[*].trackingNumberInfo.trackingNumber`
+    is narrowed to the trackResults of each nested TN. The first match wins.
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    for cr in _complete_track_results(payload) or ():
+        if not isinstance(cr, dict):
+            continue
+        direct = str(cr.get("trackingNumber") or "").strip()
+        if direct and direct not in index:
+            index[direct] = _scoped(cr)
+
+        tr_list = cr.get("trackResults")
+        if not isinstance(tr_list, list):
+            continue
+        nested: Dict[str, List[Any]] = {}
+        for tr in tr_list:
+            if not isinstance(tr, dict):
+                continue
+            tinfo = tr.get("trackingNumberInfo") or {}
+            tn = str(tinfo.get("trackingNumber") or "").strip() if isinstance(
+                tinfo, dict) else ""
+            if tn:
+                nested.setdefault(tn, []).append(tr)
+        for tn, trs in nested.items():
+            if tn in index:
+                continue
+            if direct or len(nested) == 1:
+                index[tn] = _scoped(cr)
+            else:
+                index[tn] = _scoped({**cr, "trackResults": trs})
+    return index
+
+
+def scope_payload_to_tn(payload: Any, tracking_number: str) -> Any:
+    """
+    Return the part of `payload` that belongs to `tracking_number`.
+
+    Payloads that are already scoped (zero or one completeTrackResults entry)
+    are returned unchanged without scanning; batch bodies are indexed once and
+    fall back to the original payload when the TN is not found.
+    """
+    ctr = _complete_track_results(payload)
+    if not ctr or len(ctr) == 1:
+        return payload
+    return index_payload_by_tn(payload).get(str(tracking_number).strip(), payload)
+
+
 def _from_latest_status_detail(payload: Dict[str, Any]) -> Tuple[str, str, str, str]:
     """
     Try to extract (code, derivedCode, statusByLocale, description) from
@@ -177,39 +252,11 @@ def normalize_fedex(
     Timestamp/backfill (LatestEventTimestampUtc) is intentionally NOT performed here
     to keep unit tests deterministic; that happens later during enrichment/processing.
     """
-    # If the payload contains a batch of completeTrackResults, try to narrow
-    # the payload down to the matching entry for this tracking number so our
-    # helpers examine the correct record (avoid taking ctr[0] blindly).
-    focus_payload = payload
+    # If the payload contains a batch of completeTrackResults, narrow it to the
+    # matching entry for this tracking number (avoid taking ctr[0] blindly).
+    # Pre-scoped payloads (FedexHelper/ReplayClient) pass through untouched.
     try:
-        out = payload.get("output", payload) if isinstance(
-            payload, dict) else payload
-        if isinstance(out, dict):
-            ctr = out.get("completeTrackResults")
-            if isinstance(ctr, list) and len(ctr) > 1:
-                match = None
-                for cr in ctr:
-                    if not isinstance(cr, dict):
-                        continue
-                    # direct trackingNumber on the container
-                    if str(cr.get("trackingNumber") or "") == str(tracking_number):
-                        match = cr
-                        break
-                    # check nested trackResults[*].trackingNumberInfo.trackingNumber
-                    tr_list = cr.get("trackResults")
-                    if isinstance(tr_list, list):
-                        for tr in tr_list:
-                            if not isinstance(tr, dict):
-                                continue
-                            tinfo = tr.get("trackingNumberInfo") or {}
-                            if str(tinfo.get("trackingNumber") or "") == str(tracking_number):
-                                match = cr
-                                break
-                        if match:
-                            break
-                if match is not None:
-                    focus_payload = {"output": {
-                        "completeTrackResults": [match]}}
+        focus_payload = scope_payload_to_tn(payload, tracking_number)
     except Exception:
         # Best-effort scoping; fall back to original payload on any error
         focus_payload = payload
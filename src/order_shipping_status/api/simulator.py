@@ -0,0 +1,394 @@
+# src/order_shipping_status/api/simulator.py
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from order_shipping_status.api.normalize import _complete_track_results
+from order_shipping_status.utils import jsoncodec
+
+TOKEN_PATH = "/oauth/token"
+TRACK_PATH = "/track/v1/trackingnumbers"
+# FedEx rejects Track requests with more TNs than this
+MAX_TNS_PER_REQUEST = 30
+
+_NOT_FOUND = {
+    "code": "TRACKING.TRACKINGNUMBER.NOTFOUND",
+    "message": "Tracking number cannot be found. Please correct the tracking number and try again.",
+}
+
+# (code, statusByLocale, description, latest event age in days)
+_SYNTHETIC_STATUSES = (
+    ("OC", "Label created", "Shipment information sent to FedEx", 6),
+    ("PU", "Picked up", "Picked up", 1),
+    ("IT", "In transit", "In transit", 1),
+    ("IT", "In transit", "Departed FedEx location", 7),
+    ("DL", "Delivered", "Delivered", 2),
+    ("DE", "Delivery exception", "Customer not available or business closed", 3),
+    ("RS", "Return to shipper", "Returning package to shipper", 2),
+)
+
+PayloadSource = Callable[[str], Any]
+
+
+@dataclass
+class SimulatorConfig:
+    """
+    Fault/latency profile of a `FedExSimulator`.
+
+    `latency_ms` +/- uniform `jitter_ms` is slept before every response.
+    `rate_429`/`rate_5xx` are per-request probabilities of an injected error
+    (a 5xx is one of 500/502/503/504). `quota_per_second` caps Track requests
+    per wall-clock second (0 = unlimited); requests beyond it get a 429.
+    `retry_after` adds a Retry-After header (seconds) to 429s. `token_ttl` is
+    the lifetime of issued tokens; Track calls with an unknown or expired
+    token get a 401.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    quota_per_second: int = 0
+    retry_after: Optional[float] = None
+    token_ttl: int = 3600
+    seed: Optional[int] = None
+
+
+def synthetic_payload(tracking_number: str, *, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """A FedEx-shaped completeTrackResult for a TN; the status is a stable function of the TN."""
+    tn = str(tracking_number)
+    code, by_locale, description, age = _SYNTHETIC_STATUSES[
+        zlib.crc32(tn.encode("utf-8")) % len(_SYNTHETIC_STATUSES)]
+    latest = (now or datetime.now(timezone.utc)) - timedelta(days=age)
+    stamp = latest.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    return {
+        "trackingNumber": tn,
+        "trackResults": [{
+            "trackingNumberInfo": {"trackingNumber": tn, "carrierCode": "FDXG"},
+            "latestStatusDetail": {
+                "code": code,
+                "derivedCode": code,
+                "statusByLocale": by_locale,
+                "description": description,
+            },
+            "dateAndTimes": [{"type": "ACTUAL_TENDER", "dateTime": stamp}],
+            "scanEvents": [{
+                "date": stamp,
+                "eventType": code,
+                "derivedStatusCode": code,
+                "eventDescription": description,
+            }],
+        }],
+    }
+
+
+def replay_source(path: Path) -> PayloadSource:
+    """Serve TNs from a replay dump or archive (anything `ReplayClient` reads)."""
+    from order_shipping_status.api.client import ReplayClient  # lazy import
+
+    client = ReplayClient(Path(path))
+    return client.fetch_status
+
+
+def _not_found(tn: str) -> Dict[str, Any]:
+    return {
+        "trackingNumber": tn,
+        "trackResults": [{
+            "trackingNumberInfo": {"trackingNumber": tn},
+            "error": dict(_NOT_FOUND),
+        }],
+    }
+
+
+class FedExSimulator:
+    """
+    Local stand-in for the FedEx OAuth + Track API, for load tests and CI.
+
+    Serves `POST /oauth/token` (form body, like `FedExClient.authenticate`)
+    and `POST /track/v1/trackingnumbers` (the `trackingInfo` body built by
+    `FedexHelper`). Each requested TN is looked up in `source` (TN -> payload
+    or None, e.g. `replay_source(dump)`; default `synthetic_payload`); a TN
+    the source has no completeTrackResults for is answered with FedEx's
+    NOTFOUND error entry, as the real API does.
+
+    Faults from `SimulatorConfig` apply to Track requests only. The server is
+    a ThreadingHTTPServer speaking HTTP/1.1, so client connection pools and
+    keep-alive behave as against the real API. `stats()` reports request,
+    error and peak in-flight counts. Use `start()`/`stop()` or `with`; point
+    a client at `base_url` and `token_url`.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SimulatorConfig] = None,
+        *,
+        source: Optional[PayloadSource] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config or SimulatorConfig()
+        self.source: PayloadSource = source or synthetic_payload
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, float] = {}
+        self._token_ids = itertools.count(1)
+        self._window = (0, 0)  # (second, requests seen in it)
+        self._in_flight = 0
+        self._stats: Dict[str, int] = dict.fromkeys((
+            "token_requests", "track_requests", "tracking_numbers", "ok",
+            "injected_429", "injected_5xx", "quota_429", "unauthorized",
+            "bad_request", "max_in_flight"), 0)
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- lifecycle ----
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        """Value for `FedExConfig.base_url` / FEDEX_BASE_URL."""
+        return self.url + "/track"
+
+    @property
+    def token_url(self) -> str:
+        """Value for `FedExAuth.token_url` / FEDEX_TOKEN_URL."""
+        return self.url + TOKEN_PATH
+
+    def start(self) -> "FedExSimulator":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                name="fedex-simulator", daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "FedExSimulator":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    # ---- request handling ----
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    def _sleep(self) -> None:
+        cfg = self.config
+        with self._lock:
+            jitter = self._rng.uniform(-cfg.jitter_ms, cfg.jitter_ms) if cfg.jitter_ms else 0.0
+        delay = max(0.0, cfg.latency_ms + jitter) / 1000.0
+        if delay:
+            time.sleep(delay)
+
+    def _issue_token(self) -> Dict[str, Any]:
+        with self._lock:
+            self._stats["token_requests"] += 1
+            token = f"sim-{next(self._token_ids)}"
+            self._tokens[token] = time.time() + self.config.token_ttl
+        return {"access_token": token, "token_type": "bearer",
+                "expires_in": self.config.token_ttl, "scope": "CXS"}
+
+    def _authorized(self, header: Optional[str]) -> bool:
+        scheme, _, token = (header or "").partition(" ")
+        if scheme.lower() != "bearer":
+            return False
+        with self._lock:
+            expires = self._tokens.get(token.strip())
+        return expires is not None and time.time() < expires
+
+    def _injected_fault(self) -> Optional[int]:
+        """429 (quota or injected) / 5xx status for this Track request, or None."""
+        cfg = self.config
+        with self._lock:
+            if cfg.quota_per_second > 0:
+                second = int(time.time())
+                seen = self._window[1] + 1 if self._window[0] == second else 1
+                self._window = (second, seen)
+                if seen > cfg.quota_per_second:
+                    self._stats["quota_429"] += 1
+                    return 429
+            roll = self._rng.random()
+            if roll < cfg.rate_429:
+                self._stats["injected_429"] += 1
+                return 429
+            if roll < cfg.rate_429 + cfg.rate_5xx:
+                self._stats["injected_5xx"] += 1
+                return self._rng.choice((500, 502, 503, 504))
+        return None
+
+    def _track(self, body: Any) -> Dict[str, Any]:
+        tns: List[str] = []
+        for info in body.get("trackingInfo") or ():
+            tn = str(((info or {}).get("trackingNumberInfo") or {}).get("trackingNumber") or "").strip()
+            if tn:
+                tns.append(tn)
+        if not tns or len(tns) > MAX_TNS_PER_REQUEST:
+            raise ValueError(f"trackingInfo must hold 1..{MAX_TNS_PER_REQUEST} tracking numbers")
+
+        results: List[Any] = []
+        for tn in tns:
+            payload = self.source(tn)
+            if isinstance(payload, dict) and "trackResults" in payload:
+                results.append(payload)  # already a completeTrackResult
+            else:
+                results.extend(_complete_track_results(payload) or [_not_found(tn)])
+        self._count("tracking_numbers", len(tns))
+        return {"transactionId": f"sim-{time.monotonic_ns()}",
+                "output": {"completeTrackResults": results}}
+
+    def handle(self, method: str, path: str, headers: Any, raw: bytes) -> tuple[int, Dict[str, str], Any]:
+        """Route one request; returns (status, extra headers, JSON payload)."""
+        if method != "POST":
+            return 405, {}, {"errors": [{"code": "METHOD.NOT.ALLOWED", "message": "use POST"}]}
+        if path == TOKEN_PATH:
+            form = parse_qs(raw.decode("utf-8", "replace"))
+            if form.get("grant_type", [""])[0] != "client_credentials":
+                self._count("bad_request")
+                return 400, {}, {"errors": [{"code": "BAD.REQUEST.ERROR",
+                                             "message": "grant_type must be client_credentials"}]}
+            return 200, {}, self._issue_token()
+        if path.rstrip("/") != TRACK_PATH:
+            return 404, {}, {"errors": [{"code": "NOT.FOUND.ERROR", "message": f"unknown path {path}"}]}
+
+        self._count("track_requests")
+        with self._lock:
+            self._in_flight += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+        try:
+            self._sleep()
+            if not self._authorized(headers.get("Authorization")):
+                self._count("unauthorized")
+                return 401, {}, {"errors": [{"code": "NOT.AUTHORIZED.ERROR",
+                                             "message": "invalid or expired token"}]}
+            status = self._injected_fault()
+            if status is not None:
+                extra = {}
+                if status == 429 and self.config.retry_after is not None:
+                    extra["Retry-After"] = f"{self.config.retry_after:g}"
+                return status, extra, {"errors": [{"code": "SIMULATED.ERROR",
+                                                   "message": f"simulated HTTP {status}"}]}
+            try:
+                payload = self._track(jsoncodec.loads(raw) if raw else {})
+            except (ValueError, TypeError, AttributeError) as ex:
+                self._count("bad_request")
+                return 400, {}, {"errors": [{"code": "BAD.REQUEST.ERROR", "message": str(ex)}]}
+            self._count("ok")
+            return 200, {}, payload
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+def _handler_for(sim: FedExSimulator) -> type:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            status, extra, payload = sim.handle(
+                self.command, urlsplit(self.path).path, self.headers, raw)
+            body = jsoncodec.dumps_bytes(payload)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in extra.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_POST = _serve
+        do_GET = _serve
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return _Handler
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="oss-fedex-sim",
+        description="Local FedEx OAuth + Track API simulator for load tests (no network).",
+    )
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8089)
+    p.add_argument("--replay", type=Path, default=None,
+                   help="Serve TNs from a replay dump/archive instead of synthetic payloads.")
+    p.add_argument("--latency-ms", type=float, default=0.0)
+    p.add_argument("--jitter-ms", type=float, default=0.0)
+    p.add_argument("--rate-429", type=float, default=0.0,
+                   help="Probability of an injected 429 per Track request.")
+    p.add_argument("--rate-5xx", type=float, default=0.0,
+                   help="Probability of an injected 500/502/503/504 per Track request.")
+    p.add_argument("--quota-per-second", type=int, default=0,
+                   help="Track requests allowed per second before 429s (0 = unlimited).")
+    p.add_argument("--retry-after", type=float, default=None,
+                   help="Retry-After seconds sent with 429s.")
+    p.add_argument("--token-ttl", type=int, default=3600)
+    p.add_argument("--seed", type=int, default=None)
+    return p
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        source = replay_source(args.replay) if args.replay else None
+    except (OSError, ValueError, RuntimeError) as ex:
+        print(f"error: {ex}", file=sys.stderr)
+        return 2
+    config = SimulatorConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        quota_per_second=args.quota_per_second,
+        retry_after=args.retry_after,
+        token_ttl=args.token_ttl,
+        seed=args.seed,
+    )
+    sim = FedExSimulator(config, source=source, host=args.host, port=args.port)
+    print(f"FEDEX_BASE_URL={sim.base_url}\nFEDEX_TOKEN_URL={sim.token_url}", flush=True)
+    try:
+        sim.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+        print(f"stats: {sim.stats()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -1,36 +1,235 @@
 from __future__ import annotations
 
+import socket
+import threading
+import time
 from typing import Any, Dict, Optional
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import RequestHistory, Retry
+
+# Status codes retried by both transports
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 
 class RequestsTransport:
     """Requests session wrapper with retry/backoff.
 
     Retries on typical transient errors and on specified status codes.
+
+    Connection pooling: `pool_connections` is the number of per-host pools
+    kept, `pool_maxsize` the connections kept alive per host (size it to the
+    number of threads sharing the transport, otherwise extra connections are
+    opened and discarded on every burst), and `pool_block=True` makes threads
+    wait for a free connection instead. `tcp_keepalive` enables SO_KEEPALIVE
+    so idle pooled connections are not silently dropped by NATs/proxies.
+    `connection_stats()` reports how many requests reused a pooled connection.
     """
 
-    def __init__(self, timeout: int = 30, max_retries: int = 3, backoff_factor: float = 0.3) -> None:
+    def __init__(
+        self,
+        timeout: int = 30,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        tcp_keepalive: bool = False,
+    ) -> None:
         self.session = requests.Session()
         self.timeout = timeout
 
-        retry = Retry(
+        retry = _HistoryRetry(
             total=max_retries,
             read=max_retries,
             connect=max_retries,
             backoff_factor=backoff_factor,
-            status_forcelist=(429, 500, 502, 503, 504),
+            status_forcelist=RETRY_STATUSES,
             allowed_methods=("GET", "POST"),
         )
-        adapter = HTTPAdapter(max_retries=retry)
+        adapter = _TunedAdapter(
+            max_retries=retry,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            tcp_keepalive=tcp_keepalive,
+        )
         # mount both http and https
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
+        self._adapter = adapter
 
     def post(self, url: str, *, headers: Optional[Dict[str, str]] = None, data: Any = None, json: Any = None, params: Optional[Dict[str, Any]] = None):
         return self.session.post(url, headers=headers, data=data, json=json, params=params, timeout=self.timeout)
 
     def get(self, url: str, *, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None):
         return self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Requests sent vs connections opened across the live host pools
+        (retries count as requests). Pools evicted beyond `pool_connections`
+        drop out of the totals.
+        """
+        container = self._adapter.poolmanager.pools
+        pools = [container[k] for k in container.keys()]
+        requests_sent = sum(getattr(p, "num_requests", 0) for p in pools)
+        opened = sum(getattr(p, "num_connections", 0) for p in pools)
+        return {
+            "pools": len(pools),
+            "requests": requests_sent,
+            "connections_opened": opened,
+            "connections_reused": max(0, requests_sent - opened),
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class _HistoryRetry(Retry):
+    """Retry that leaves its attempt history on the MaxRetryError it raises.
+
+    urllib3 drops the history when retries run out; keeping it (terminal
+    attempt last) lets `FedExClient` count retries/429s for failed requests.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        try:
+            return super().increment(method, url, response, error, _pool, _stacktrace)
+        except MaxRetryError as ex:
+            status = getattr(response, "status", None)
+            ex.history = self.history + (RequestHistory(method, url, error, status, None),)
+            raise
+
+
+class _TunedAdapter(HTTPAdapter):
+    """HTTPAdapter that can turn on TCP keep-alive for pooled sockets."""
+
+    def __init__(self, *, tcp_keepalive: bool = False, **kwargs: Any) -> None:
+        self._tcp_keepalive = tcp_keepalive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        if self._tcp_keepalive:
+            from urllib3.connection import HTTPConnection
+
+            kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _httpx(*, http2: bool = False):
+    try:
+        import httpx  # optional dependency
+        if http2:
+            import h2  # noqa: F401  (httpx[http2] extra)
+    except ImportError as ex:
+        raise RuntimeError(
+            "Http2Transport requires the optional 'httpx' package "
+            "(and 'h2' for http2=True; pip install 'httpx[http2]')."
+        ) from ex
+    return httpx
+
+
+class Http2Transport:
+    """httpx-based drop-in for `RequestsTransport` (same post/get/connection_stats).
+
+    With `http2=True` (needs the `h2` package) requests to one host are
+    multiplexed over a single connection instead of one connection per
+    in-flight request. `max_connections` / `max_keepalive_connections` /
+    `keepalive_expiry` size the pool. Responses on RETRY_STATUSES and
+    transport errors are retried up to `max_retries` times with exponential
+    backoff, honoring a numeric Retry-After; the last response is returned
+    with the statuses of the retried attempts (None for a transport error)
+    in `resp.extensions["retry_statuses"]`, which `FedExClient` reports as
+    retry/429 metrics like urllib3's retry history.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        *,
+        http2: bool = True,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 5.0,
+    ) -> None:
+        httpx = _httpx(http2=http2)
+        self.timeout = timeout
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_factor = backoff_factor
+        self._connections: set[int] = set()
+        self._stats = {"requests": 0, "http2_requests": 0}
+        self._lock = threading.Lock()
+        self.client = httpx.Client(
+            http2=http2,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    def _record(self, resp: Any) -> None:
+        ext = getattr(resp, "extensions", {}) or {}
+        stream = ext.get("network_stream")
+        with self._lock:
+            self._stats["requests"] += 1
+            if getattr(resp, "http_version", "") == "HTTP/2":
+                self._stats["http2_requests"] += 1
+            if stream is not None:
+                self._connections.add(id(stream))
+
+    def _send(self, method: str, url: str, **kwargs: Any):
+        httpx = _httpx()
+        attempt = 0
+        retried: list[Optional[int]] = []
+        while True:
+            resp = None
+            try:
+                resp = self.client.request(method, url, **kwargs)
+            except httpx.TransportError as ex:
+                if attempt >= self.max_retries:
+                    ex.retry_statuses = tuple(retried)
+                    raise
+            else:
+                self._record(resp)
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    resp.extensions["retry_statuses"] = tuple(retried)
+                    return resp
+            retried.append(resp.status_code if resp is not None else None)
+            delay = self.backoff_factor * (2 ** attempt)
+            if resp is not None:
+                try:
+                    delay = max(delay, float(resp.headers.get("Retry-After") or 0))
+                except ValueError:
+                    pass  # HTTP-date form: keep the backoff
+            attempt += 1
+            if delay > 0:
+                time.sleep(delay)
+
+    def post(self, url: str, *, headers: Optional[Dict[str, str]] = None, data: Any = None, json: Any = None, params: Optional[Dict[str, Any]] = None):
+        return self._send("POST", url, headers=headers, data=data, json=json, params=params)
+
+    def get(self, url: str, *, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None):
+        return self._send("GET", url, headers=headers, params=params)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Requests sent vs distinct connections they went over (retries count as requests)."""
+        with self._lock:
+            requests_sent = self._stats["requests"]
+            opened = len(self._connections)
+            return {
+                "requests": requests_sent,
+                "http2_requests": self._stats["http2_requests"],
+                "connections_opened": opened,
+                "connections_reused": max(0, requests_sent - opened),
+            }
+
+    def close(self) -> None:
+        self.client.close()
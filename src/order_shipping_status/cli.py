@@ -5,10 +5,13 @@ import argparse
 import sys
 import datetime as dt
 from pathlib import Path
+from typing import Any, Optional, Tuple
 
-from .config.logging_config import get_logger
-from .io.paths import derive_output_paths
+from .config.logging_config import get_logger, stop_queue_logging
+from .io.paths import PROCESSED_SUFFIX, derive_batch_log_path, derive_output_paths
 from .config.env import get_app_env
+from .pipelines.carrier_registry import fedex_registry
+from .pipelines.preprocessor import week_windows
 from .pipelines.workbook_processor import WorkbookProcessor
 
 
@@ -17,12 +20,45 @@ def build_parser() -> argparse.ArgumentParser:
         prog="order-shipping-status",
         description="Process a shipping workbook and emit a *_processed.xlsx next to the input.",
     )
-    p.add_argument("input", type=Path, help="Path to input .xlsx file.")
+    p.add_argument("input", type=Path, help="Path to input .xlsx file (directory or glob with --batch).")
+    p.add_argument(
+        "--batch",
+        action="store_true",
+        help="Treat input as a directory or glob; fetch each tracking number once across all workbooks.",
+    )
+    p.add_argument(
+        "--batch-workers",
+        type=int,
+        default=4,
+        help="Number of workbooks enriched/written concurrently in --batch mode. Default: 4",
+    )
+    p.add_argument(
+        "--watch",
+        action="store_true",
+        help="Treat input as an inbox directory and process new .xlsx files as they arrive (runs until interrupted).",
+    )
+    p.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.25,
+        help="Seconds between inbox scans in --watch mode. A new file waits one to two scans (until its size/mtime settle) before processing starts. Default: 0.25",
+    )
+    p.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=900.0,
+        help="Seconds to reuse a carrier response for a repeated tracking number in --watch mode (0 disables). Default: 900",
+    )
     p.add_argument(
         "--no-console",
         action="store_true",
         help="Disable console logging (file logging remains).",
     )
+    p.add_argument(
+        "--async-logging",
+        action="store_true",
+        help="Format and write log records on a background thread (flushed at exit).",
+    )
     p.add_argument(
         "--log-level",
         default="INFO",
@@ -56,11 +92,35 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Write normalized sidecar JSON per tracking number to this directory.",
     )
+    p.add_argument(
+        "--sidecar-format",
+        choices=("jsonl", "files"),
+        default="jsonl",
+        help="Sidecar layout: one indexed JSON Lines file per run (jsonl, default) or one file per TN (files).",
+    )
     p.add_argument(
         "--dump-api-bodies",
         action="store_true",
         help="Dump raw API response bodies to <input-stem>-json-bodies.json next to the input file.",
     )
+    p.add_argument(
+        "--dump-compression",
+        choices=("none", "gz", "zst"),
+        default="none",
+        help="Write --dump-api-bodies as an indexed compressed archive (*.json.gz / *.json.zst; zst needs 'zstandard').",
+    )
+    p.add_argument(
+        "--weeks-from",
+        type=str,
+        default=None,
+        help="YYYY-MM-DD start of a backfill range; with --weeks-to, writes one processed workbook per Sunday..Saturday week.",
+    )
+    p.add_argument(
+        "--weeks-to",
+        type=str,
+        default=None,
+        help="YYYY-MM-DD end (inclusive) of the --weeks-from backfill range.",
+    )
     # NEW: allow disabling the date filter used by the Preprocessor
     p.add_argument(
         "--skip-date-filter",
@@ -74,19 +134,204 @@ def build_parser() -> argparse.ArgumentParser:
         default=4,
         help="If DaysSinceLatestEvent >= this value (and not Delivered/Exception/RTS), mark IsStalled=1. Default: 4",
     )
+    p.add_argument(
+        "--log-body-every",
+        type=int,
+        default=1,
+        help="At DEBUG, log only every Nth FedEx request/response body. Default: 1 (all).",
+    )
+    p.add_argument(
+        "--log-body-limit",
+        type=int,
+        default=None,
+        help="At DEBUG, log at most N FedEx request/response bodies per run.",
+    )
+    p.add_argument(
+        "--retry-queue",
+        type=Path,
+        default=None,
+        help="JSON file collecting TNs whose live lookup failed. Default: <input-stem>-retry-queue.json next to the input.",
+    )
+    p.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Only process rows whose TN is in the retry queue; writes <input-stem>_retry_processed.xlsx.",
+    )
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="With --use-api, reuse results checkpointed in <input-stem>-journal.jsonl by an interrupted run of the same input.",
+    )
+    p.add_argument(
+        "--coalesce-ms",
+        type=float,
+        default=0.0,
+        help="With --use-api, pack per-TN lookups queued within this many ms into 30-TN requests (0 disables). Default: 0",
+    )
+    p.add_argument(
+        "--http-pool-size",
+        type=int,
+        default=10,
+        help="With --use-api, keep-alive connections pooled per host; match it to the number of concurrent requests. Default: 10",
+    )
+    p.add_argument(
+        "--http2",
+        action="store_true",
+        help="With --use-api, send FedEx requests over HTTP/2 via httpx (requires the optional httpx[http2] package).",
+    )
+    p.add_argument(
+        "--http-tcp-keepalive",
+        action="store_true",
+        help="With --use-api (HTTP/1.1), enable TCP keep-alive probes on pooled connections so idle ones are not dropped by NATs/proxies.",
+    )
+    p.add_argument(
+        "--http-keepalive-expiry",
+        type=float,
+        default=5.0,
+        help="With --http2, seconds an idle pooled connection is kept before it is closed. Default: 5",
+    )
+    p.add_argument(
+        "--output-format",
+        choices=["xlsx", "csv", "jsonl"],
+        default="xlsx",
+        help="xlsx writes the processed workbook; csv/jsonl write one file per view into <input-stem>_views/ instead. Default: xlsx",
+    )
+    p.add_argument(
+        "--carrier-routing",
+        action="store_true",
+        help="Group rows by Carrier Code and leave rows whose code is not a known FedEx shipping code unenriched (default: every row goes through FedEx).",
+    )
+    p.add_argument(
+        "--emit-enriched",
+        choices=["parquet", "arrow"],
+        default=None,
+        help="Also write the enriched frame as <input-stem>_enriched.parquet/.arrow next to the processed workbook (requires pyarrow).",
+    )
+    p.add_argument(
+        "--from-enriched",
+        type=Path,
+        default=None,
+        help="Rebuild the processed workbook from an enriched .parquet/.arrow file instead of enriching the input again.",
+    )
+    p.add_argument(
+        "--metrics-out",
+        type=Path,
+        default=None,
+        help="Write API client metrics at the end of the run (.json for JSON, otherwise Prometheus textfile format).",
+    )
 
     return p
 
 
+def build_client(
+    env_cfg,
+    logger,
+    *,
+    replay_dir: Optional[Path] = None,
+    use_api: bool = False,
+    metrics=None,
+    body_sampler=None,
+    dump_api_bodies_path: Optional[Path] = None,
+    coalesce_ms: float = 0.0,
+    retry_queue=None,
+    journal=None,
+    http_pool_size: int = 10,
+    http2: bool = False,
+    tcp_keepalive: bool = False,
+    keepalive_expiry: float = 5.0,
+) -> Tuple[Any, Any]:
+    """
+    Return `(client, normalizer)` for the requested enrichment strategy.
+
+    Replay wins over the live API; `(None, None)` means no enrichment.
+    """
+    if replay_dir:
+        from .api.client import ReplayClient
+        from .api.normalize import normalize_fedex
+
+        logger.info("Replay mode enabled: %s", replay_dir)
+        return ReplayClient(replay_dir), normalize_fedex
+
+    if use_api:
+        from .api.fedex import FedExClient, FedExAuth, FedExConfig
+        from .api.transport import Http2Transport, RequestsTransport
+        from .api.normalize import normalize_fedex
+        from .api.fedex_writer import FedExWriter
+
+        token_url = getattr(env_cfg, "FEDEX_TOKEN_URL",
+                            None) or "https://apis.fedex.com/oauth/token"
+        base_url = getattr(env_cfg, "FEDEX_BASE_URL",
+                           None) or "https://apis.fedex.com/track"
+
+        auth = FedExAuth(
+            client_id=getattr(env_cfg, "SHIPPING_CLIENT_ID", ""),
+            client_secret=getattr(env_cfg, "SHIPPING_CLIENT_SECRET", ""),
+            token_url=token_url,
+        )
+        cfg = FedExConfig(base_url=base_url)
+        transport = None
+        if http2:
+            try:
+                transport = Http2Transport(
+                    max_connections=http_pool_size, max_keepalive_connections=http_pool_size,
+                    keepalive_expiry=keepalive_expiry)
+            except (RuntimeError, ImportError) as e:
+                logger.warning("%s Falling back to HTTP/1.1.", e)
+        if transport is None:
+            transport = RequestsTransport(
+                pool_maxsize=http_pool_size, tcp_keepalive=tcp_keepalive)
+        client_raw = FedExClient(
+            auth,
+            cfg,
+            transport=transport,
+            metrics=metrics,
+            body_sampler=body_sampler,
+        )
+
+        writer = None
+        if dump_api_bodies_path:
+            writer = FedExWriter(path=dump_api_bodies_path)
+
+        # Use the shared adapter module (keeps CLI small and allows reuse)
+        from .api.fedex_helper import FedexHelper
+
+        client = FedexHelper(client_raw, writer=writer,
+                             logger=logger, metrics=metrics,
+                             bisect_failures=True, retry_queue=retry_queue,
+                             journal=journal)
+        if coalesce_ms > 0:
+            from .api.coalescer import CoalescingClient
+
+            client = CoalescingClient(
+                client, window_ms=coalesce_ms, logger=logger)
+        logger.info("Live FedEx API enabled (base=%s)", base_url)
+        return client, normalize_fedex
+
+    return None, None
+
+
 def main(argv: list[str] | None = None) -> int:
     args = build_parser().parse_args(argv)
 
     # Resolve derived paths (also validates input exists)
-    try:
-        processed_path, log_path = derive_output_paths(args.input)
-    except FileNotFoundError:
-        print(f"error: input file not found: {args.input}", file=sys.stderr)
-        return 2
+    if args.watch:
+        if not args.input.is_dir():
+            print(f"error: inbox directory not found: {args.input}", file=sys.stderr)
+            return 2
+        processed_path, log_path = None, derive_batch_log_path(
+            args.input, "watch.log")
+    elif args.batch:
+        # Outputs are derived per workbook; only the run log is shared
+        processed_path, log_path = None, derive_batch_log_path(args.input)
+        if not log_path.parent.is_dir():
+            print(f"error: input directory not found: {log_path.parent}", file=sys.stderr)
+            return 2
+    else:
+        try:
+            processed_path, log_path = derive_output_paths(args.input)
+        except FileNotFoundError:
+            print(f"error: input file not found: {args.input}", file=sys.stderr)
+            return 2
 
     # Configure logging (file + optional console)
     logger = get_logger(
@@ -94,17 +339,37 @@ def main(argv: list[str] | None = None) -> int:
         level=args.log_level,
         console=not args.no_console,
         log_file=log_path,
+        use_queue=args.async_logging,
     )
+    try:
+        return _run(args, logger, processed_path, log_path)
+    finally:
+        if args.async_logging:
+            stop_queue_logging(logger.name)
+
+
+def _run(args: argparse.Namespace, logger, processed_path: Optional[Path], log_path: Path) -> int:
     logger.debug("Logger initialized.")
     logger.info("Input: %s", args.input)
-    logger.info("Processed output: %s", processed_path)
+    if processed_path is not None:
+        logger.info("Processed output: %s", processed_path)
     logger.info("Log file: %s", log_path)
 
+    if args.batch or args.watch:
+        # These modes derive one output per workbook and would ignore them
+        ignored = [flag for flag, value in (
+            ("--weeks-from/--weeks-to", args.weeks_from or args.weeks_to),
+            ("--from-enriched", args.from_enriched)) if value]
+        if ignored:
+            logger.error("%s cannot be combined with --batch/--watch", ", ".join(ignored))
+            return 2
+
     # If requested, compute the JSON bodies path: <input-stem>-json-bodies.json
     dump_api_bodies_path = None
     if args.dump_api_bodies:
+        suffix = {"none": "", "gz": ".gz", "zst": ".zst"}[args.dump_compression]
         dump_api_bodies_path = args.input.with_name(
-            f"{args.input.stem}-json-bodies.json")
+            f"{args.input.stem}-json-bodies.json{suffix}")
         logger.info("API bodies will be dumped to: %s", dump_api_bodies_path)
 
     # Load env (don’t fail unless user asked for strict)
@@ -119,47 +384,81 @@ def main(argv: list[str] | None = None) -> int:
         logger.error("Environment error: %s", e)
         return 2
 
-    # Decide enrichment strategy
-    client = None
-    normalizer = None
-
-    if args.replay_dir:
-        from .api.client import ReplayClient
-        from .api.normalize import normalize_fedex
+    metrics = None
+    if args.metrics_out:
+        from .utils.metrics import RunMetrics
 
-        client = ReplayClient(args.replay_dir)
-        normalizer = normalize_fedex
-        logger.info("Replay mode enabled: %s", args.replay_dir)
+        metrics = RunMetrics()
 
-    elif args.use_api:
-        from .api.fedex import FedExClient, FedExAuth, FedExConfig
-        from .api.transport import RequestsTransport
-        from .api.normalize import normalize_fedex
-        from .api.fedex_writer import FedExWriter
+    # Retry queue: failed live lookups are recorded for a follow-up run
+    retry_queue = None
+    retry_queue_path = args.retry_queue
+    if retry_queue_path is None and not (args.batch or args.watch):
+        retry_queue_path = args.input.with_name(
+            f"{args.input.stem}-retry-queue.json")
+    if retry_queue_path is not None and (args.use_api or args.retry_failed):
+        from .io.retry_queue import RetryQueue
 
-        token_url = getattr(env_cfg, "FEDEX_TOKEN_URL",
-                            None) or "https://apis.fedex.com/oauth/token"
-        base_url = getattr(env_cfg, "FEDEX_BASE_URL",
-                           None) or "https://apis.fedex.com/track"
+        try:
+            retry_queue = RetryQueue(retry_queue_path)
+        except (OSError, ValueError) as e:
+            logger.error("Could not read retry queue %s: %s",
+                         retry_queue_path, e)
+            return 2
+    if args.retry_failed:
+        if args.batch or args.watch:
+            # The retry output is named after the single input workbook
+            logger.error("--retry-failed processes one workbook; it cannot be combined with --batch/--watch")
+            return 2
+        if not len(retry_queue):
+            logger.info("Retry queue %s is empty; nothing to retry.",
+                        retry_queue_path)
+            return 0
+        processed_path = processed_path.with_name(
+            f"{args.input.stem}_retry{PROCESSED_SUFFIX}")
+        logger.info("Retrying %d queued TN(s) → %s",
+                    len(retry_queue), processed_path)
 
-        auth = FedExAuth(
-            client_id=getattr(env_cfg, "SHIPPING_CLIENT_ID", ""),
-            client_secret=getattr(env_cfg, "SHIPPING_CLIENT_SECRET", ""),
-            token_url=token_url,
-        )
-        cfg = FedExConfig(base_url=base_url)
-        client_raw = FedExClient(auth, cfg, transport=RequestsTransport())
+    # Checkpoint journal: every completed chunk is journaled during live runs
+    journal = None
+    if args.use_api and not args.replay_dir and not (args.batch or args.watch):
+        from .io.journal import ChunkJournal, file_sha256
 
-        writer = None
-        if dump_api_bodies_path:
-            writer = FedExWriter(path=dump_api_bodies_path)
+        journal_path = args.input.with_name(f"{args.input.stem}-journal.jsonl")
+        try:
+            journal = ChunkJournal(
+                journal_path, file_sha256(args.input), resume=args.resume, logger=logger)
+        except OSError as e:
+            logger.warning("Checkpoint journal disabled (%s): %s",
+                           journal_path, e)
+    elif args.resume:
+        logger.warning("--resume only applies to single-workbook --use-api runs")
 
-        # Use the shared adapter module (keeps CLI small and allows reuse)
-        from .api.fedex_helper import FedexHelper
+    # Decide enrichment strategy
+    body_sampler = None
+    if args.log_body_every > 1 or args.log_body_limit is not None:
+        from .config.logging_config import BodyLogSampler
 
-        client = FedexHelper(client_raw, writer=writer, logger=logger)
-        normalizer = normalize_fedex
-        logger.info("Live FedEx API enabled (base=%s)", base_url)
+        body_sampler = BodyLogSampler(
+            every=args.log_body_every, limit=args.log_body_limit)
+    client, normalizer = build_client(
+        env_cfg,
+        logger,
+        replay_dir=args.replay_dir,
+        use_api=args.use_api,
+        metrics=metrics,
+        body_sampler=body_sampler,
+        dump_api_bodies_path=dump_api_bodies_path,
+        coalesce_ms=args.coalesce_ms,
+        retry_queue=retry_queue,
+        journal=journal,
+        http_pool_size=args.http_pool_size,
+        http2=args.http2,
+        tcp_keepalive=args.http_tcp_keepalive,
+        keepalive_expiry=args.http_keepalive_expiry,
+    )
+    # Body dump (if any); closed after the run so archives get their final index
+    api_writer = getattr(client, "_writer", None)
 
     # Reference date (optional)
     reference_date = None
@@ -171,7 +470,31 @@ def main(argv: list[str] | None = None) -> int:
                 "Invalid --reference-date: %s (expected YYYY-MM-DD)", args.reference_date)
             return 2
 
+    # Backfill range (optional): one output per week from a single read/fetch
+    windows = None
+    if args.weeks_from or args.weeks_to:
+        if not (args.weeks_from and args.weeks_to):
+            logger.error("--weeks-from and --weeks-to must be used together")
+            return 2
+        try:
+            windows = week_windows(
+                dt.date.fromisoformat(args.weeks_from),
+                dt.date.fromisoformat(args.weeks_to),
+            )
+        except ValueError as e:
+            logger.error("Invalid --weeks-from/--weeks-to: %s", e)
+            return 2
+        logger.info("Backfilling %d week(s): %s..%s",
+                    len(windows), windows[0][0], windows[-1][1])
+
+    # Long-lived watch mode: keep responses for repeated TNs across files
+    if args.watch and client is not None and args.cache_ttl > 0:
+        from .api.cache import CachingClient
+
+        client = CachingClient(client, ttl_seconds=args.cache_ttl)
+
     # Orchestrate via WorkbookProcessor
+    rc = 0
     try:
         processor = WorkbookProcessor(
             logger,
@@ -180,25 +503,103 @@ def main(argv: list[str] | None = None) -> int:
             reference_date=reference_date,
             enable_date_filter=not args.skip_date_filter,  # <-- wire the flag
             stalled_threshold_days=args.stalled_threshold_days,
+            sidecar_format=args.sidecar_format,
+            only_tracking_numbers=(
+                retry_queue.tracking_numbers() if args.retry_failed else None),
+            enriched_format=args.emit_enriched,
+            output_format=args.output_format,
+            carrier_registry=(
+                fedex_registry(normalizer)
+                if args.carrier_routing and normalizer is not None else None),
         )
 
-        # Process workbook (write processed xlsx + marker)
-        processor.process(
-            args.input,
-            processed_path,
-            env_cfg=env_cfg,
-            sidecar_dir=args.debug_sidecar,
-        )
+        if args.watch:
+            from .pipelines.watcher import InboxWatcher
+
+            watcher = InboxWatcher(
+                processor,
+                args.input,
+                env_cfg,
+                poll_interval=args.poll_interval,
+                sidecar_dir=args.debug_sidecar,
+            )
+            try:
+                watcher.run()
+            except KeyboardInterrupt:
+                logger.info("Watch stopped.")
+        elif args.batch:
+            from .pipelines.batch_processor import BatchProcessor, discover_inputs
+
+            inputs = discover_inputs(args.input)
+            if not inputs:
+                logger.error("No input workbooks match: %s", args.input)
+                rc = 2
+            else:
+                results = BatchProcessor(
+                    processor, max_workers=args.batch_workers
+                ).run(inputs, env_cfg=env_cfg, sidecar_dir=args.debug_sidecar)
+                failed = [r for r in results if r.get("error")]
+                logger.info("Batch processed %d workbook(s), %d failed",
+                            len(results), len(failed))
+                if failed:
+                    rc = 1
+        elif args.from_enriched:
+            processor.process_enriched(
+                args.input,
+                args.from_enriched,
+                processed_path,
+                env_cfg=env_cfg,
+            )
+        elif windows:
+            processor.process_windows(
+                args.input,
+                windows,
+                env_cfg=env_cfg,
+                sidecar_dir=args.debug_sidecar,
+            )
+        else:
+            # Process workbook (write processed xlsx + marker)
+            processor.process(
+                args.input,
+                processed_path,
+                env_cfg=env_cfg,
+                sidecar_dir=args.debug_sidecar,
+            )
 
     except FileNotFoundError as e:
         logger.error("Input missing: %s", e)
-        return 2
+        rc = 2
     except Exception as e:
         logger.exception("Failed to process workbook: %s", e)
-        return 1
+        rc = 1
+    finally:
+        if api_writer is not None:
+            api_writer.close()
+
+    if journal is not None:
+        # A completed run needs no checkpoint; a failed one keeps it for --resume
+        journal.close(remove=(rc == 0))
+
+    if retry_queue is not None:
+        try:
+            if retry_queue.save() is not None:
+                logger.info("Retry queue: %d TN(s) pending in %s",
+                            len(retry_queue), retry_queue.path)
+        except Exception as e:
+            logger.warning("Failed to write retry queue %s: %s",
+                           retry_queue.path, e)
+
+    if metrics is not None:
+        try:
+            metrics.write(args.metrics_out)
+            logger.info("Metrics written to: %s", args.metrics_out)
+        except Exception as e:
+            logger.warning("Failed to write metrics to %s: %s",
+                           args.metrics_out, e)
 
-    logger.info("Done.")
-    return 0
+    if rc == 0:
+        logger.info("Done.")
+    return rc
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -187,6 +187,8 @@ def get_app_env(dotenv_path: Path | str | None = ".env", *, strict: bool = True)
     return EnvCfg(
         SHIPPING_CLIENT_ID=os.environ["SHIPPING_CLIENT_ID"],
         SHIPPING_CLIENT_SECRET=os.environ["SHIPPING_CLIENT_SECRET"],
+        FEDEX_BASE_URL=os.environ.get("FEDEX_BASE_URL", ""),
+        FEDEX_TOKEN_URL=os.environ.get("FEDEX_TOKEN_URL", ""),
     )
 
 
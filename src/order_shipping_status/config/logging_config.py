@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Dict, List, Optional, Union
 import os
+import queue
 import sys
+import threading
+
+from ..utils import jsoncodec
 
 # We’ll tag configured loggers to avoid duplicate handlers on repeated calls.
 _OSS_LOGGER_MARK = "_oss_logger_configured"
@@ -14,6 +19,11 @@ _OSS_LOGGER_MARK = "_oss_logger_configured"
 _DEFAULT_FMT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 _DEFAULT_DATEFMT = "%Y-%m-%d %H:%M:%S"
 
+# Queue mode: logger name -> listener that owns the real (console/file) handlers.
+_QUEUE_LISTENERS: Dict[str, QueueListener] = {}
+_QUEUE_LOCK = threading.Lock()
+_ATEXIT_REGISTERED = False
+
 
 def _coerce_level(level: Optional[Union[int, str]]) -> int:
     """
@@ -45,6 +55,66 @@ def _coerce_level(level: Optional[Union[int, str]]) -> int:
     return logging.INFO
 
 
+class LazyPayload:
+    """
+    Log argument that renders a payload only when a handler formats the record.
+
+    `jsoncodec.dumps` and truncation to `limit` characters happen in `__str__`, so
+    passing a LazyPayload to `logger.debug(...)` costs nothing when DEBUG is off.
+    Strings are used as-is (no re-serialization).
+    """
+
+    __slots__ = ("payload", "limit", "_text")
+
+    def __init__(self, payload: Any, limit: Optional[int] = 4000) -> None:
+        self.payload = payload
+        self.limit = limit
+        self._text: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            p = self.payload
+            if p is None or isinstance(p, str):
+                text = p
+            else:
+                try:
+                    text = jsoncodec.dumps(p)
+                except Exception:
+                    text = str(p)
+            if text and self.limit is not None and len(text) > self.limit:
+                text = text[:self.limit] + "..."
+            self._text = text if text is not None else "None"
+        return self._text
+
+    __repr__ = __str__
+
+
+class BodyLogSampler:
+    """
+    Bounded sampling for request/response body logging.
+
+    `allow()` returns True for every `every`-th call, and never more than
+    `limit` times in total (None = unbounded). Thread-safe.
+    """
+
+    def __init__(self, *, every: int = 1, limit: Optional[int] = None) -> None:
+        self.every = max(1, int(every))
+        self.limit = None if limit is None else max(0, int(limit))
+        self._seen = 0
+        self._logged = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            self._seen += 1
+            if self.limit is not None and self._logged >= self.limit:
+                return False
+            if (self._seen - 1) % self.every:
+                return False
+            self._logged += 1
+            return True
+
+
 def default_log_path_for_input(input_path: Union[str, Path]) -> Path:
     """
     Given an input file path, return the log file path in the same directory
@@ -54,6 +124,88 @@ def default_log_path_for_input(input_path: Union[str, Path]) -> Path:
     return p.with_suffix(".log")
 
 
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched, so message formatting
+    (including LazyPayload rendering) happens on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _queue_handlers(logger: logging.Logger) -> List[logging.Handler]:
+    return [h for h in logger.handlers if isinstance(h, QueueHandler)]
+
+
+def _target_handlers(logger: logging.Logger) -> List[logging.Handler]:
+    """Handlers that actually emit: direct ones plus those behind a queue listener."""
+    out = [h for h in logger.handlers if not isinstance(h, QueueHandler)]
+    listener = _QUEUE_LISTENERS.get(logger.name)
+    if listener is not None:
+        out.extend(listener.handlers)
+    return out
+
+
+def _attach_queue(logger: logging.Logger, extra: List[logging.Handler]) -> None:
+    """(Re)start the logger's queue listener with all target handlers."""
+    global _ATEXIT_REGISTERED
+    with _QUEUE_LOCK:
+        listener = _QUEUE_LISTENERS.get(logger.name)
+        direct = [h for h in logger.handlers if not isinstance(h, QueueHandler)]
+        if listener is not None and not extra and not direct and _queue_handlers(logger):
+            return  # already fully queued; nothing to change
+
+        handlers: List[logging.Handler] = []
+        if listener is not None:
+            listener.stop()  # drains pending records before we swap handlers
+            handlers.extend(listener.handlers)
+        for h in direct:
+            logger.removeHandler(h)
+            handlers.append(h)
+        handlers.extend(extra)
+        for h in _queue_handlers(logger):
+            logger.removeHandler(h)
+
+        q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        logger.addHandler(_DeferredQueueHandler(q))
+        listener = QueueListener(q, *handlers, respect_handler_level=True)
+        listener.start()
+        _QUEUE_LISTENERS[logger.name] = listener
+
+        if not _ATEXIT_REGISTERED:
+            atexit.register(stop_queue_logging)
+            _ATEXIT_REGISTERED = True
+
+
+def stop_queue_logging(name: Optional[str] = None) -> None:
+    """
+    Flush and stop queue-mode logging for `name` (or for every queued logger).
+
+    Pending records are written before this returns, and the real handlers are
+    moved back onto the logger so later records are emitted synchronously.
+    """
+    with _QUEUE_LOCK:
+        if name is None:
+            names = list(_QUEUE_LISTENERS)
+        else:
+            names = [logging.getLogger(name).name]
+        for n in names:
+            listener = _QUEUE_LISTENERS.pop(n, None)
+            if listener is None:
+                continue
+            listener.stop()
+            logger = logging.getLogger(None if n == "root" else n)
+            for h in _queue_handlers(logger):
+                logger.removeHandler(h)
+            for h in listener.handlers:
+                try:
+                    h.flush()
+                except Exception:
+                    pass
+                logger.addHandler(h)
+
+
 def get_logger(
     name: Optional[str] = None,
     *,
@@ -65,21 +217,29 @@ def get_logger(
     datefmt: str = _DEFAULT_DATEFMT,
     max_bytes: int = 5_000_000,
     backup_count: int = 5,
+    use_queue: bool = False,
 ) -> logging.Logger:
     """
     Create/configure a logger. Safe to call multiple times:
     - Won’t duplicate existing handlers
     - Will add missing targets (e.g., add file later)
+
+    With `use_queue=True` the console/file handlers are driven by a background
+    QueueListener and the logger only enqueues records, so callers never block
+    on formatting or disk I/O. Queued records are flushed at interpreter exit
+    or by `stop_queue_logging()`.
     """
     logger = logging.getLogger(name)
     logger.setLevel(_coerce_level(level))
     logger.propagate = propagate
 
     formatter = logging.Formatter(fmt=fmt, datefmt=datefmt)
+    targets = _target_handlers(logger)
+    new_handlers: List[logging.Handler] = []
 
     # Detect existing handlers
     def _has_console() -> bool:
-        for h in logger.handlers:
+        for h in targets:
             # Exclude FileHandlers; only count real console streams
             if isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler):
                 # Stream may be stderr or stdout
@@ -88,7 +248,7 @@ def get_logger(
         return False
 
     def _has_file(path: Path) -> bool:
-        for h in logger.handlers:
+        for h in targets:
             if isinstance(h, RotatingFileHandler):
                 try:
                     if Path(h.baseFilename) == path:
@@ -102,7 +262,7 @@ def get_logger(
         sh = logging.StreamHandler(stream=sys.stderr)
         sh.setFormatter(formatter)
         sh.setLevel(logger.level)
-        logger.addHandler(sh)
+        new_handlers.append(sh)
 
     # Add file if requested and missing
     if log_file is not None:
@@ -118,7 +278,13 @@ def get_logger(
             )
             fh.setFormatter(formatter)
             fh.setLevel(logger.level)
-            logger.addHandler(fh)
+            new_handlers.append(fh)
+
+    if use_queue or logger.name in _QUEUE_LISTENERS:
+        _attach_queue(logger, new_handlers)
+    else:
+        for h in new_handlers:
+            logger.addHandler(h)
 
     # Mark configured (for potential external checks), but DO NOT early-return above.
     setattr(logger, _OSS_LOGGER_MARK, True)
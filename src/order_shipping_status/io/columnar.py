@@ -0,0 +1,137 @@
+# src/order_shipping_status/io/columnar.py
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+
+from ..utils import jsoncodec
+from .schema import INDICATOR_COLS, OUTPUT_FEDEX_COLUMNS, OUTPUT_STATUS_COLUMN
+
+# Suffix -> format for the enriched-frame artifact
+COLUMNAR_SUFFIXES = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+ENRICHED_FORMATS = ("parquet", "arrow")
+_META_KEY = b"order_shipping_status"
+
+# Typed columns (everything else is inferred; nested values become JSON text).
+# 0/1 indicators are stored as int8 and widened back to the pipeline's int64.
+_FLAG_COLUMNS = tuple(INDICATOR_COLS)
+_INT_COLUMNS = ("DaysSinceLatestEvent",)
+_NULLABLE_INT_COLUMNS = ("ScanEventsCount",)  # blank for rows never enriched
+_STRING_COLUMNS = (
+    "Tracking Number", "Carrier Code", *OUTPUT_FEDEX_COLUMNS,
+    OUTPUT_STATUS_COLUMN, "CalculatedReasons", "LatestAncillaryText",
+)
+_UTC_COLUMNS = ("LatestEventTimestampUtc",)
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa  # optional dependency
+    except ImportError as ex:
+        raise RuntimeError(
+            "Parquet/Arrow output requires the optional 'pyarrow' package "
+            "(pip install pyarrow)."
+        ) from ex
+    return pa
+
+
+def columnar_format(path: Union[str, Path]) -> str:
+    fmt = COLUMNAR_SUFFIXES.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(
+            f"Unsupported enriched file {path}; expected one of {sorted(COLUMNAR_SUFFIXES)}")
+    return fmt
+
+
+def _is_nested(v: Any) -> bool:
+    return isinstance(v, (dict, list, tuple))
+
+
+def _to_typed(df: pd.DataFrame) -> tuple[pd.DataFrame, Dict[str, List[str]]]:
+    """Return a frame Arrow can store with stable types, plus restore metadata."""
+    pa = _pyarrow()
+    out = df.copy()
+    meta: Dict[str, List[str]] = {"json": [], "utc": []}
+    for col in out.columns:
+        s = out[col]
+        if col in _FLAG_COLUMNS:
+            out[col] = pd.to_numeric(s, errors="coerce").fillna(0).astype("int8")
+        elif col in _INT_COLUMNS:
+            out[col] = pd.to_numeric(s, errors="coerce").fillna(0).astype("int64")
+        elif col in _NULLABLE_INT_COLUMNS:
+            out[col] = pd.to_numeric(s, errors="coerce").astype("Int64")
+        elif col in _UTC_COLUMNS:
+            out[col] = pd.to_datetime(s.astype("string"), errors="coerce", utc=True)
+            meta["utc"].append(col)
+        elif col in _STRING_COLUMNS:
+            out[col] = s.astype("string")
+        elif s.dtype == object:
+            if s.map(_is_nested).any():
+                out[col] = s.map(lambda v: jsoncodec.dumps(v, default=str)
+                                 if _is_nested(v) else (None if pd.isna(v) else str(v))).astype("string")
+                meta["json"].append(col)
+                continue
+            try:
+                pa.array(s, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                # Mixed scalar types (common in spreadsheet input): keep as text
+                out[col] = s.map(lambda v: None if _is_nested(v) or pd.isna(v) else str(v)).astype("string")
+    return out, meta
+
+
+def _from_typed(df: pd.DataFrame, meta: Dict[str, List[str]]) -> pd.DataFrame:
+    out = df
+    for col in _FLAG_COLUMNS:
+        if col in out.columns:
+            out[col] = out[col].astype("int64")
+    for col in meta.get("json", []):
+        if col in out.columns:
+            out[col] = out[col].map(lambda v: jsoncodec.loads(v) if isinstance(v, str) else None).astype("object")
+    for col in meta.get("utc", []):
+        if col in out.columns:
+            # Back to the ISO 'Z' text the pipeline produces (Excel has no tz-aware datetimes)
+            ts = pd.to_datetime(out[col], utc=True)
+            out[col] = ts.map(lambda t: "" if pd.isna(t) else t.isoformat().replace("+00:00", "Z")).astype("object")
+    return out
+
+
+def write_enriched(df: pd.DataFrame, path: Union[str, Path]) -> Path:
+    """Write the enriched frame as Parquet (`.parquet`) or Arrow IPC (`.arrow`/`.feather`)."""
+    pa = _pyarrow()
+    p = Path(path)
+    fmt = columnar_format(p)
+    typed, meta = _to_typed(df)
+    table = pa.Table.from_pandas(typed, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _META_KEY: jsoncodec.dumps_bytes(meta),
+    })
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(f".{p.name}.tmp")
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, tmp)
+    else:
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    tmp.replace(p)
+    return p
+
+
+def read_enriched(path: Union[str, Path]) -> pd.DataFrame:
+    """Read a file written by `write_enriched` back into the pipeline's dtypes."""
+    pa = _pyarrow()
+    p = Path(path)
+    if columnar_format(p) == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(p)
+    else:
+        with pa.memory_map(str(p), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    raw_meta = (table.schema.metadata or {}).get(_META_KEY)
+    meta = jsoncodec.loads(raw_meta) if raw_meta else {}
+    return _from_typed(table.to_pandas(), meta)
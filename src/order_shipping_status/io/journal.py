@@ -0,0 +1,123 @@
+# src/order_shipping_status/io/journal.py
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from ..utils import jsoncodec
+
+
+def file_sha256(path: Union[str, Path], *, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ChunkJournal:
+    """
+    Append-only JSON Lines checkpoint of per-TN API results for one input.
+
+    Line 1 is a header binding the journal to the input's sha256; every
+    completed chunk appends `{"type": "chunk", "results": {tn: payload}}` and
+    is flushed + fsynced, so a crashed run loses at most the chunk in flight.
+
+    With `resume=True` an existing journal for the same input is loaded and
+    its TNs are served from `results`; otherwise (or when the input changed)
+    the journal starts over. A torn last line from a crash is ignored.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        input_sha256: str,
+        *,
+        resume: bool = False,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.input_sha256 = input_sha256
+        self.logger = logger
+        self.results: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+        if resume and self.path.exists():
+            self._load()
+        if self.results:
+            self._fh = self.path.open("a", encoding="utf-8")
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("w", encoding="utf-8")
+            self._append({
+                "type": "header",
+                "input_sha256": input_sha256,
+                "created_utc": dt.datetime.now(dt.timezone.utc).isoformat(),
+            })
+
+    def _log(self, level: str, msg: str, *args) -> None:
+        fn = getattr(self.logger, level, None)
+        if callable(fn):
+            try:
+                fn(msg, *args)
+            except Exception:
+                pass
+
+    def _load(self) -> None:
+        with self.path.open("r", encoding="utf-8") as fh:
+            lines = fh.read().splitlines()
+        try:
+            header = jsoncodec.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        if header.get("input_sha256") != self.input_sha256:
+            self._log("warning",
+                      "Journal %s belongs to a different input; starting over", self.path)
+            return
+        for line in lines[1:]:
+            try:
+                rec = jsoncodec.loads(line)
+            except ValueError:
+                continue  # torn write from a crash
+            if rec.get("type") == "chunk":
+                self.results.update(rec.get("results") or {})
+        self._log("info", "Resuming from %s: %d TN(s) already fetched",
+                  self.path, len(self.results))
+
+    def _append(self, rec: Dict[str, Any]) -> None:
+        self._fh.write(jsoncodec.dumps(rec) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def __contains__(self, tn: object) -> bool:
+        return str(tn) in self.results
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def get(self, tn: str, default: Any = None) -> Any:
+        return self.results.get(str(tn), default)
+
+    def record(self, results: Dict[str, Any]) -> None:
+        """Checkpoint one completed chunk."""
+        if not results:
+            return
+        with self._lock:
+            self._append({"type": "chunk", "results": results})
+            self.results.update(results)
+
+    def close(self, *, remove: bool = False) -> None:
+        """Close the file; `remove=True` deletes it (the run completed)."""
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+            if remove:
+                try:
+                    self.path.unlink()
+                except OSError:
+                    pass
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import datetime as dt
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 PROCESSED_SUFFIX = "_processed.xlsx"
 
@@ -20,3 +21,50 @@ def derive_output_paths(input_file: Path) -> Tuple[Path, Path]:
     processed = p.with_name(f"{stem}{PROCESSED_SUFFIX}")
     log = p.with_suffix(".log")
     return processed, log
+
+
+def derive_window_output_path(
+    input_file: Path,
+    start: dt.date,
+    end: dt.date,
+    *,
+    output_dir: Optional[Path] = None,
+) -> Path:
+    """
+    Processed path for one date window: `<stem>_<start>_<end>_processed.xlsx`,
+    next to the input unless `output_dir` is given.
+    """
+    p = Path(input_file)
+    name = f"{p.stem}_{start.isoformat()}_{end.isoformat()}{PROCESSED_SUFFIX}"
+    return (Path(output_dir) if output_dir is not None else p.parent) / name
+
+
+def derive_batch_log_path(input_spec: Path, name: str = "batch.log") -> Path:
+    """
+    Log path for a batch/watch run: `name` inside the input directory, or next
+    to the files matched by a glob pattern.
+    """
+    p = Path(input_spec)
+    return (p if p.is_dir() else p.parent) / name
+
+
+def derive_enriched_path(processed_path: Path, fmt: str = "parquet") -> Path:
+    """
+    Columnar enriched-frame path next to a processed workbook:
+    `<stem>_processed.xlsx` -> `<stem>_enriched.parquet` (or `.arrow`).
+    """
+    p = Path(processed_path)
+    name = p.name
+    stem = name[: -len(PROCESSED_SUFFIX)] if name.endswith(PROCESSED_SUFFIX) else p.stem
+    return p.with_name(f"{stem}_enriched.{fmt}")
+
+
+def derive_views_dir(processed_path: Path) -> Path:
+    """
+    Directory for CSV/JSONL view output next to a processed workbook path:
+    `<stem>_processed.xlsx` -> `<stem>_views/`.
+    """
+    p = Path(processed_path)
+    name = p.name
+    stem = name[: -len(PROCESSED_SUFFIX)] if name.endswith(PROCESSED_SUFFIX) else p.stem
+    return p.with_name(f"{stem}_views")
@@ -0,0 +1,78 @@
+# src/order_shipping_status/io/retry_queue.py
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+
+class RetryQueue:
+    """
+    Persistent set of tracking numbers whose carrier lookup failed.
+
+    File shape (JSON):
+        {"version": 1,
+         "items": {"<tn>": {"carrier": "FDX", "attempts": 2, "last_failed_utc": "..."}}}
+
+    `add()` records a failure, `discard()` drops a TN once it was fetched.
+    `save()` writes atomically and is skipped when the queue is empty and no
+    file exists yet, so healthy runs leave nothing behind.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8") or "{}")
+            items = data.get("items", {}) if isinstance(data, dict) else {}
+            self._items = {str(k): dict(v) for k, v in items.items()}
+
+    def add(self, tn: str, carrier: Optional[str] = None) -> None:
+        now = dt.datetime.now(dt.timezone.utc).isoformat()
+        with self._lock:
+            item = self._items.setdefault(str(tn), {"attempts": 0})
+            item["attempts"] = int(item.get("attempts", 0)) + 1
+            item["last_failed_utc"] = now
+            if carrier:
+                item["carrier"] = carrier
+
+    def discard(self, tn: str) -> None:
+        with self._lock:
+            self._items.pop(str(tn), None)
+
+    def discard_many(self, tns: Iterable[str]) -> None:
+        with self._lock:
+            for tn in tns:
+                self._items.pop(str(tn), None)
+
+    def tracking_numbers(self) -> list[str]:
+        with self._lock:
+            return list(self._items)
+
+    def carrier_map(self) -> Dict[str, str]:
+        with self._lock:
+            return {tn: v["carrier"] for tn, v in self._items.items() if v.get("carrier")}
+
+    def __contains__(self, tn: object) -> bool:
+        return str(tn) in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def save(self) -> Optional[Path]:
+        with self._lock:
+            if not self._items and not self.path.exists():
+                return None
+            text = json.dumps(
+                {"version": self.VERSION, "items": self._items}, indent=2)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, self.path)
+        return self.path
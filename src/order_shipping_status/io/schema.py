@@ -1,22 +1,93 @@
 # src/order_shipping_status/io/schema.py
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+import pandas as pd
+
 
 OUTPUT_FEDEX_COLUMNS = ["code", "derivedCode", "statusByLocale", "description"]
 OUTPUT_STATUS_COLUMN = "CalculatedStatus"
-INDICATOR_COLS = ["IsPreTransit", "IsDelivered",
-                  "HasException", "IsRTS", "Damaged", "UnableToDeliver", "IsStalled"]
+# Single source of truth for indicator names and their output order
+# (re-exported by pipelines.column_contract and rules.indicators)
+INDICATOR_COLS: tuple[str, ...] = (
+    "IsPreTransit",
+    "IsDelivered",
+    "HasException",
+    "IsRTS",
+    "IsStalled",
+    "Damaged",
+    "UnableToDeliver",
+)
 AUX_COLS = ["CalculatedReasons",
             "LatestEventTimestampUtc", "DaysSinceLatestEvent"]
 
 # desired order suffix (original columns are kept in their original order first)
 OUTPUT_SUFFIX_ORDER = OUTPUT_FEDEX_COLUMNS + \
-    INDICATOR_COLS + [OUTPUT_STATUS_COLUMN] + AUX_COLS
+    list(INDICATOR_COLS) + [OUTPUT_STATUS_COLUMN] + AUX_COLS
 
 # Known legacy name in the input (we won't rename input now; this is for reference)
 LEGACY_STATUS_COLUMN = "Delivery Tracking Status"
 
+# Declared dtypes for input columns (passed to read_excel): identifiers load as
+# text so numeric-looking TNs never round-trip through float. "Tracking Number"
+# is read through a per-cell converter instead (see
+# pipelines.tracking_numbers.tracking_number_cell) so text cells stay verbatim
+INPUT_DTYPES = {
+    "Carrier Code": str,
+}
+
 # Only add here if truly required to run the pipeline
 REQUIRED_INPUT_COLUMNS = [
     # e.g., "Tracking Number",
 ]
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    name: str
+    dtype: str  # "string" | "int64"
+    default: Any
+
+
+class CompiledSchema:
+    """
+    Output columns compiled once into name order, an astype mapping and a
+    fillna mapping, so `apply` is one reindex + one fillna + one astype
+    regardless of how many contract columns there are.
+
+    `apply` keeps the frame's own columns first, in their order, and appends
+    the missing contract columns in spec order. Missing/NA cells take the
+    column default; text columns become pandas "string", indicators int64.
+    """
+
+    def __init__(self, specs: Iterable[ColumnSpec]) -> None:
+        self.specs: tuple[ColumnSpec, ...] = tuple(specs)
+        self.names: tuple[str, ...] = tuple(s.name for s in self.specs)
+        self.dtypes: dict[str, str] = {s.name: s.dtype for s in self.specs}
+        self.defaults: dict[str, Any] = {s.name: s.default for s in self.specs}
+        self._numeric: list[str] = [s.name for s in self.specs if s.dtype != "string"]
+
+    def column_order(self, columns: Sequence[Any]) -> list[Any]:
+        present = set(columns)
+        return list(columns) + [n for n in self.names if n not in present]
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        out = df.reindex(columns=self.column_order(list(df.columns)))
+        out = out.fillna(self.defaults)
+        try:
+            return out.astype(self.dtypes)
+        except (TypeError, ValueError):
+            # Non-numeric junk in an indicator column: coerce those to 0, once
+            out[self._numeric] = out[self._numeric].apply(
+                pd.to_numeric, errors="coerce").fillna(0)
+            return out.astype(self.dtypes)
+
+
+OUTPUT_CONTRACT = CompiledSchema(
+    [ColumnSpec(c, "string", "") for c in OUTPUT_FEDEX_COLUMNS]
+    + [ColumnSpec(c, "int64", 0) for c in INDICATOR_COLS]
+    + [ColumnSpec(OUTPUT_STATUS_COLUMN, "string", ""),
+       ColumnSpec("CalculatedReasons", "string", "")]
+)
@@ -0,0 +1,214 @@
+# src/order_shipping_status/io/sidecar.py
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol, Tuple, Union
+
+from ..utils import jsoncodec
+
+SIDECAR_FORMATS = ("jsonl", "files")
+DEFAULT_RUN_NAME = "sidecars"
+
+
+class SidecarSink(Protocol):
+    def write(self, carrier: Optional[str], tn: str, record: Dict[str, Any]) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def sidecar_key(carrier: Optional[str], tn: str) -> str:
+    """Key/filename stem used by every sink: `<Carrier>_<TrackingNumber>`."""
+    return f"{carrier}_{tn}"
+
+
+class DirectorySidecarSink:
+    """Legacy layout: one `<Carrier>_<TrackingNumber>.json` file per TN, written inline."""
+
+    def __init__(self, directory: Union[str, Path], *, logger: Optional[logging.Logger] = None) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.logger = logger
+
+    def write(self, carrier: Optional[str], tn: str, record: Dict[str, Any]) -> None:
+        (self.directory / f"{sidecar_key(carrier, tn)}.json").write_bytes(
+            jsoncodec.dumps_bytes(record, default=str)
+        )
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "DirectorySidecarSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JsonlSidecarSink:
+    """
+    One JSON Lines file per run plus a byte-offset index.
+
+    Files (inside `directory`):
+      - `<name>.jsonl`       one `{"key", "carrier", "tn", "data"}` object per line
+      - `<name>.index.json`  `{key: [offset, length]}` for random access
+
+    `write()` only enqueues; a background thread serializes records and does
+    buffered appends. `close()` drains the queue and writes the index. When a
+    key is written more than once, the index points at the last line.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        *,
+        name: str = DEFAULT_RUN_NAME,
+        buffer_size: int = 1 << 20,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"{name}.jsonl"
+        self.index_path = self.directory / f"{name}.index.json"
+        self.logger = logger
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._fh = self.path.open("wb", buffering=buffer_size)
+        self._offset = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._drain, name="oss-sidecar-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, carrier: Optional[str], tn: str, record: Dict[str, Any]) -> None:
+        if self._closed:
+            raise RuntimeError("sidecar sink is closed")
+        self._queue.put((carrier, tn, record))
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            carrier, tn, record = item
+            key = sidecar_key(carrier, tn)
+            try:
+                line = jsoncodec.dumps_bytes(
+                    {"key": key, "carrier": carrier, "tn": tn, "data": record},
+                    default=str,
+                ) + b"\n"
+                self._fh.write(line)
+                self._index[key] = (self._offset, len(line))
+                self._offset += len(line)
+            except Exception as ex:
+                if self.logger:
+                    try:
+                        self.logger.warning(
+                            "Sidecar write failed for %s: %s", key, ex)
+                    except Exception:
+                        pass
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._fh.close()
+        self.index_path.write_bytes(
+            jsoncodec.dumps_bytes({k: list(v) for k, v in self._index.items()})
+        )
+
+    def __enter__(self) -> "JsonlSidecarSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_sidecar_sink(
+    directory: Union[str, Path],
+    fmt: str = "jsonl",
+    *,
+    logger: Optional[logging.Logger] = None,
+) -> SidecarSink:
+    if fmt == "jsonl":
+        return JsonlSidecarSink(directory, logger=logger)
+    if fmt == "files":
+        return DirectorySidecarSink(directory, logger=logger)
+    raise ValueError(
+        f"Unknown sidecar format {fmt!r}; expected one of {SIDECAR_FORMATS}")
+
+
+def _key_tn(key: str) -> str:
+    """TN part of a `sidecar_key` (carrier codes contain no `_`; TNs may)."""
+    return key.partition("_")[2]
+
+
+def read_sidecar(
+    directory: Union[str, Path],
+    tn: str,
+    carrier: Optional[str] = None,
+    *,
+    name: str = DEFAULT_RUN_NAME,
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the sidecar record for one TN, or None when absent.
+
+    Uses the JSON Lines index (one seek + one line read) when present and
+    falls back to the per-file layout. Without `carrier`, the first key
+    whose TN part (after the carrier's `_`) is exactly `tn` is used, so
+    `1` does not match the sidecar of TN `A_1`.
+    """
+    d = Path(directory)
+    index_path = d / f"{name}.index.json"
+    if index_path.exists():
+        index = jsoncodec.loads(index_path.read_bytes())
+        key = sidecar_key(carrier, tn) if carrier is not None else next(
+            (k for k in index if _key_tn(k) == tn), None)
+        loc = index.get(key) if key else None
+        if loc:
+            offset, length = loc
+            with (d / f"{name}.jsonl").open("rb") as fh:
+                fh.seek(offset)
+                return jsoncodec.loads(fh.read(length)).get("data")
+
+    if carrier is not None:
+        candidates = [d / f"{sidecar_key(carrier, tn)}.json"]
+    else:
+        candidates = sorted(p for p in d.glob(f"*_{tn}.json") if _key_tn(p.stem) == tn)
+    for p in candidates:
+        if p.exists():
+            return jsoncodec.loads(p.read_bytes())
+    return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        prog="oss-sidecar",
+        description="Print the normalized sidecar for one tracking number.",
+    )
+    p.add_argument("directory", type=Path, help="--debug-sidecar directory.")
+    p.add_argument("tracking_number")
+    p.add_argument("--carrier", default=None)
+    args = p.parse_args(argv)
+
+    rec = read_sidecar(args.directory, args.tracking_number, args.carrier)
+    if rec is None:
+        print(f"not found: {args.tracking_number}", file=sys.stderr)
+        return 1
+    print(json.dumps(rec, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+# src/order_shipping_status/io/view_writer.py
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+
+import pandas as pd
+
+from ..utils import jsoncodec
+
+# Flat-file alternatives to the xlsx workbook: one file per view
+VIEW_FORMATS = ("csv", "jsonl")
+_CHUNK_ROWS = 2000
+
+
+def view_file_name(view: str, fmt: str) -> str:
+    """'Damaged or Returned' -> 'damaged_or_returned.csv'."""
+    slug = re.sub(r"[^0-9a-z]+", "_", view.lower()).strip("_")
+    return f"{slug}.{fmt}"
+
+
+def _json_value(v: Any) -> Any:
+    if v is None or v is pd.NA or v is pd.NaT:
+        return None
+    if isinstance(v, float) and v != v:
+        return None
+    return v
+
+
+def _write_csv(df: pd.DataFrame, fh) -> None:
+    # chunksize keeps pandas from materializing the whole CSV text at once
+    df.to_csv(fh, index=False, na_rep="", chunksize=_CHUNK_ROWS, lineterminator="\n")
+
+
+def _write_jsonl(df: pd.DataFrame, fh) -> None:
+    cols = [str(c) for c in df.columns]
+    for start in range(0, len(df), _CHUNK_ROWS):
+        chunk = df.iloc[start:start + _CHUNK_ROWS]
+        lines = [
+            jsoncodec.dumps_bytes(
+                {c: _json_value(v) for c, v in zip(cols, row)}, default=str)
+            for row in chunk.itertuples(index=False, name=None)
+        ]
+        fh.write(b"\n".join(lines) + b"\n")
+
+
+def write_view(df: pd.DataFrame, path: Union[str, Path], fmt: str) -> Path:
+    """Stream one view to `path` (written to a temp file, then renamed)."""
+    p = Path(path)
+    tmp = p.with_name(f".{p.name}.tmp")
+    if fmt == "csv":
+        with tmp.open("w", encoding="utf-8", newline="") as fh:
+            _write_csv(df, fh)
+    elif fmt == "jsonl":
+        with tmp.open("wb") as fh:
+            _write_jsonl(df, fh)
+    else:
+        raise ValueError(f"Unknown view format {fmt!r}; expected one of {VIEW_FORMATS}")
+    os.replace(tmp, p)
+    return p
+
+
+def write_views(
+    views: Mapping[str, pd.DataFrame],
+    directory: Union[str, Path],
+    fmt: str,
+    *,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Path]:
+    """
+    Write every view as `<directory>/<view_slug>.<fmt>` concurrently.
+
+    Returns {view name: path} in the order of `views`. The first failure is
+    re-raised after the other writes finish.
+    """
+    if fmt not in VIEW_FORMATS:
+        raise ValueError(f"Unknown view format {fmt!r}; expected one of {VIEW_FORMATS}")
+    d = Path(directory)
+    d.mkdir(parents=True, exist_ok=True)
+    workers = max(1, min(len(views), max_workers or len(views) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="oss-view") as ex:
+        futures = {
+            name: ex.submit(write_view, df, d / view_file_name(name, fmt), fmt)
+            for name, df in views.items()
+        }
+    return {name: f.result() for name, f in futures.items()}
@@ -7,3 +7,6 @@ class EnvCfg:
     """Minimal shape we need from get_app_env()."""
     SHIPPING_CLIENT_ID: str = ""
     SHIPPING_CLIENT_SECRET: str = ""
+    # Optional endpoint overrides (blank = production FedEx URLs)
+    FEDEX_BASE_URL: str = ""
+    FEDEX_TOKEN_URL: str = ""
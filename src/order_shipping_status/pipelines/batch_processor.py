@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import copy
+import glob
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from order_shipping_status.io.paths import PROCESSED_SUFFIX, derive_output_paths
+from order_shipping_status.models import EnvCfg
+from order_shipping_status.pipelines.enricher import _text_values
+from order_shipping_status.pipelines.preprocessor import Preprocessor
+from order_shipping_status.pipelines.workbook_processor import WorkbookProcessor
+
+
+def discover_inputs(spec: Union[str, Path]) -> List[Path]:
+    """
+    Resolve a directory or glob pattern to input workbooks (sorted).
+
+    A directory yields its `*.xlsx` files. Processed outputs
+    (`*_processed.xlsx`) and Excel lock files (`~$*`) are always skipped.
+    """
+    p = Path(spec)
+    if p.is_dir():
+        candidates: Iterable[Path] = p.glob("*.xlsx")
+    else:
+        candidates = (Path(s) for s in glob.glob(str(spec)))
+    return sorted(
+        c for c in candidates
+        if c.is_file() and not c.name.endswith(PROCESSED_SUFFIX) and not c.name.startswith("~$")
+    )
+
+
+class PrefetchedClient:
+    """Client facade over payloads fetched up front; never calls the carrier."""
+
+    def __init__(self, payloads: Dict[str, dict]) -> None:
+        self._payloads = payloads
+
+    def fetch_batch(self, tracking_numbers: list[str], carrier_map: Optional[Dict[str, str]] = None) -> Dict[str, dict]:
+        return {tn: self._payloads.get(tn, {}) for tn in tracking_numbers}
+
+    def fetch_status(self, tracking_number: str, carrier_code: Optional[str] = None) -> dict:
+        return self._payloads.get(tracking_number, {})
+
+
+class _SharedNormalizer:
+    """Memoizes the normalizer per (TN, carrier) so shared TNs are normalized once across files."""
+
+    def __init__(self, normalizer: Any) -> None:
+        self._normalizer = normalizer
+        self._cache: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, payload, *, tracking_number: str, carrier_code: Optional[str] = None, source: str = "replay"):
+        key = (str(tracking_number), carrier_code)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        result = self._normalizer(
+            payload, tracking_number=tracking_number, carrier_code=carrier_code, source=source)
+        with self._lock:
+            self._cache.setdefault(key, result)
+        return result
+
+
+class BatchProcessor:
+    """
+    Process many workbooks with one carrier fetch per distinct tracking number.
+
+    Steps: read + preprocess every input, dedupe TNs across all of them, fetch
+    the union once through the configured client (`fetch_batch` when
+    available), then enrich and write each file's processed workbook in
+    parallel from the prefetched payloads.
+    """
+
+    def __init__(self, processor: WorkbookProcessor, *, max_workers: int = 4) -> None:
+        self.processor = processor
+        self.logger = processor.logger
+        self.max_workers = max(1, int(max_workers))
+
+    def _collect_tracking_numbers(self, frames: Iterable[pd.DataFrame]) -> Tuple[List[str], Dict[str, str]]:
+        tns: Dict[str, None] = {}
+        carrier_map: Dict[str, str] = {}
+        registry = getattr(self.processor, "carrier_registry", None)
+        for df in frames:
+            if "Tracking Number" not in df.columns:
+                continue
+            carriers = (_text_values(df["Carrier Code"]) if "Carrier Code" in df.columns
+                        else [None] * len(df))
+            for tn, carrier in zip(_text_values(df["Tracking Number"]), carriers):
+                if tn is None:
+                    continue
+                if registry is not None:
+                    # Only rows served by the processor's own client are prefetched
+                    name = registry.handler_for(carrier)
+                    if name is None or registry.get(name)[0] is not None:
+                        continue
+                tns.setdefault(tn, None)
+                if carrier is not None and tn not in carrier_map:
+                    carrier_map[tn] = carrier
+        return list(tns), carrier_map
+
+    def _fetch_all(self, tns: List[str], carrier_map: Dict[str, str]) -> Dict[str, dict]:
+        client = self.processor.client
+        if client is None or not tns:
+            return {}
+        if hasattr(client, "fetch_batch"):
+            try:
+                return client.fetch_batch(tns, carrier_map=carrier_map) or {}
+            except Exception as ex:
+                self.logger.warning(
+                    "Batch fetch failed (%d TNs): %s", len(tns), ex)
+                return {}
+        out: Dict[str, dict] = {}
+        for tn in tns:
+            try:
+                out[tn] = client.fetch_status(tn, carrier_map.get(tn)) or {}
+            except Exception as ex:
+                self.logger.warning("fetch failed for %s: %s", tn, ex)
+                out[tn] = {}
+        return out
+
+    def run(
+        self,
+        inputs: List[Path],
+        env_cfg: Optional[EnvCfg] = None,
+        *,
+        sidecar_dir: Optional[Path] = None,
+    ) -> List[Dict[str, Any]]:
+        """Process `inputs`; returns one result dict per input (with `error` on failure)."""
+        p = self.processor
+        prepared: List[Tuple[Path, pd.DataFrame, pd.DataFrame]] = []
+        results: Dict[Path, Dict[str, Any]] = {}
+        for path in inputs:
+            try:
+                df_in = p._read_input(Path(path))
+                df_prep = Preprocessor(
+                    p.reference_date,
+                    logger=self.logger,
+                    enable_date_filter=p.enable_date_filter,
+                ).prepare(df_in)
+                prepared.append((Path(path), df_in, p._restrict_to_queued(df_prep)))
+            except Exception as ex:
+                self.logger.exception("Failed to read %s: %s", path, ex)
+                results[Path(path)] = {"input_path": str(path), "error": str(ex)}
+
+        tns, carrier_map = self._collect_tracking_numbers(
+            df for _, _, df in prepared)
+        total_rows = sum(len(df) for _, _, df in prepared)
+        self.logger.info(
+            "Batch: %d workbook(s), %d row(s), %d distinct tracking number(s)",
+            len(prepared), total_rows, len(tns))
+        payloads = self._fetch_all(tns, carrier_map)
+
+        worker = copy.copy(p)
+        worker.client = PrefetchedClient(payloads)
+        if p.normalizer is not None:
+            worker.normalizer = _SharedNormalizer(p.normalizer)
+
+        def _one(item: Tuple[Path, pd.DataFrame, pd.DataFrame]) -> Dict[str, Any]:
+            path, df_in, df_prep = item
+            try:
+                processed_path, _ = derive_output_paths(path)
+                file_sidecar = (Path(sidecar_dir) / path.stem) if sidecar_dir else None
+                df_out = worker._enrich_prepared(
+                    df_prep, sidecar_dir=file_sidecar)
+                res = worker._emit(path, processed_path,
+                                   env_cfg, df_in, df_out)
+                res["input_path"] = str(path)
+                return res
+            except Exception as ex:
+                self.logger.exception("Failed to process %s: %s", path, ex)
+                return {"input_path": str(path), "error": str(ex)}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for item, res in zip(prepared, pool.map(_one, prepared)):
+                results[item[0]] = res
+
+        return [results[Path(path)] for path in inputs if Path(path) in results]
@@ -0,0 +1,82 @@
+# src/order_shipping_status/pipelines/carrier_registry.py
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+class CarrierRegistry:
+    """
+    Carrier Code -> (client, normalizer) handlers for `Enricher`.
+
+    Each handler has a name, an optional `client` (None = the Enricher's own
+    client, so wrappers swapped in later, e.g. batch prefetch or the service's
+    cache, are still used) and a `normalizer`. A code is matched by exact
+    code, then by a `match(code)` predicate; a blank code goes to the
+    `default` handler. Codes nobody claims resolve to None and their rows
+    are left unenriched instead of going through another carrier's parser.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: Dict[str, Tuple[Optional[Any], Any]] = {}
+        self._codes: Dict[str, str] = {}
+        self._matchers: list[Tuple[Callable[[str], bool], str]] = []
+        self._default: Optional[str] = None
+
+    def register(
+        self,
+        name: str,
+        normalizer: Any,
+        *,
+        client: Optional[Any] = None,
+        codes: Iterable[str] = (),
+        match: Optional[Callable[[str], bool]] = None,
+        default: bool = False,
+    ) -> "CarrierRegistry":
+        self._handlers[name] = (client, normalizer)
+        for code in codes:
+            self._codes[str(code).strip().upper()] = name
+        if match is not None:
+            self._matchers.append((match, name))
+        if default:
+            self._default = name
+        return self
+
+    def handler_for(self, carrier_code: Optional[str]) -> Optional[str]:
+        """Name of the handler for a carrier code, or None if unsupported."""
+        cc = (carrier_code or "").strip().upper()
+        if not cc:
+            return self._default
+        name = self._codes.get(cc)
+        if name is not None:
+            return name
+        for match, name in self._matchers:
+            try:
+                if match(cc):
+                    return name
+            except Exception:
+                continue
+        return None
+
+    def get(self, name: str) -> Tuple[Optional[Any], Any]:
+        return self._handlers[name]
+
+    def names(self) -> list[str]:
+        return list(self._handlers)
+
+
+# Workbook service codes whose TNs are FedEx TNs although the code does not
+# say so (AMZ = Amazon orders shipped FedEx; F*Z = FedEx service levels)
+FEDEX_SHIPPING_CODES: tuple[str, ...] = ("AMZ", "FESZ", "F2DZ", "FPOZ", "FPSZ")
+
+
+def _is_fedex_code(code: str) -> bool:
+    from order_shipping_status.api.normalize import _carrier_from_code  # lazy import
+
+    return _carrier_from_code(code) == "FedEx"
+
+
+def fedex_registry(normalizer: Any, *, client: Optional[Any] = None) -> CarrierRegistry:
+    """Registry with FedEx (FDX*/FEDEX*, FEDEX_SHIPPING_CODES and blank codes) as the only carrier."""
+    return CarrierRegistry().register(
+        "fedex", normalizer, client=client, codes=FEDEX_SHIPPING_CODES,
+        match=_is_fedex_code, default=True)
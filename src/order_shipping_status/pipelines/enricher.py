@@ -1,28 +1,49 @@
 from __future__ import annotations
 
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Any, Dict
 
-import pandas as pd
 import numpy as np
+import pandas as pd
+
+from order_shipping_status.io.sidecar import DirectorySidecarSink, SidecarSink
+
 
+def _text_values(series: pd.Series) -> list[Optional[str]]:
+    """Stripped text per cell; None for None/NaN/empty/"nan"/"none" (case-insensitive)."""
+    s = series.astype("string").str.strip()
+    blank = (s.isna() | s.str.lower().isin(["", "nan", "none"])).to_numpy(dtype=bool)
+    return [None if b else v for v, b in zip(s.tolist(), blank)]
 
-def _is_blank(val: Any) -> bool:
-    """True if value is None/NaN/empty/“nan”/“none” (case-insensitive)."""
-    if val is None:
-        return True
-    if isinstance(val, float) and np.isnan(val):
-        return True
-    s = str(val).strip()
-    return s == "" or s.lower() in {"nan", "none"}
+
+# Enriched columns holding dicts/lists; never coerced to string
+_OBJECT_COLS = ("latestStatusDetail", "ScanEventTimestamps")
 
 
 class Enricher:
-    def __init__(self, logger, *, client: Optional[Any], normalizer: Optional[Any]):
+    """
+    Fetch + normalize per tracking number; rows repeating a TN (multi-package
+    orders) share one fetch and one normalization. With a `registry`
+    (`CarrierRegistry`), rows are grouped by Carrier Code and each group is
+    enriched by its own client/normalizer pair, groups running concurrently
+    (`max_workers`); rows whose carrier has no handler are left as they are.
+    """
+
+    def __init__(
+        self,
+        logger,
+        *,
+        client: Optional[Any],
+        normalizer: Optional[Any],
+        registry: Optional[Any] = None,
+        max_workers: int = 4,
+    ):
         self.logger = logger
         self.client = client
         self.normalizer = normalizer
+        self.registry = registry
+        self.max_workers = max(1, int(max_workers))
 
     def _safe_log(self, level: str, msg: str, *args):
         fn = getattr(self.logger, level, None)
@@ -74,44 +95,12 @@ class Enricher:
         """
         If payload is a FedEx 'output' body containing many completeTrackResults,
         return a *new* minimal dict containing only the matching TN. Otherwise return
-        the original payload.
+        the original payload (already-scoped payloads are not re-scanned).
         """
-        try:
-            if not isinstance(payload, dict):
-                return payload
-            out = payload.get("output", payload)
-            if not isinstance(out, dict):
-                return payload
-            ctr = out.get("completeTrackResults")
-            if not isinstance(ctr, list) or not ctr:
-                return payload
+        from order_shipping_status.api.normalize import scope_payload_to_tn  # lazy import
 
-            matched = None
-            for cr in ctr:
-                if not isinstance(cr, dict):
-                    continue
-                # direct match on the container
-                if str(cr.get("trackingNumber", "")).strip() == str(tn):
-                    matched = cr
-                    break
-                # nested trackResults[*].trackingNumberInfo.trackingNumber
-                tr_list = cr.get("trackResults")
-                if isinstance(tr_list, list):
-                    for tr in tr_list:
-                        if not isinstance(tr, dict):
-                            continue
-                        tinfo = tr.get("trackingNumberInfo") or {}
-                        if str(tinfo.get("trackingNumber", "")).strip() == str(tn):
-                            matched = cr
-                            break
-                if matched is not None:
-                    break
-
-            if matched is None:
-                return payload  # best-effort
-
-            # Return a scoped shape that mirrors FedEx 'output' schema
-            return {"output": {"completeTrackResults": [matched]}}
+        try:
+            return scope_payload_to_tn(payload, tn)
         except Exception:
             return payload
 
@@ -216,7 +205,13 @@ class Enricher:
         return ts, int(scan_ct), scan_ts
 
     # -------------------------------- enrich --------------------------------
-    def enrich(self, df: pd.DataFrame, *, sidecar_dir: Optional[Path] = None) -> pd.DataFrame:
+    def enrich(
+        self,
+        df: pd.DataFrame,
+        *,
+        sidecar_dir: Optional[Path] = None,
+        sidecar_sink: Optional[SidecarSink] = None,
+    ) -> pd.DataFrame:
         """
         Merge normalized API columns row-by-row. Also attach:
           - raw (if normalizer adds it)
@@ -225,132 +220,218 @@ class Enricher:
           - LatestEventTimestampUtc (str, 'Z')
           - ScanEventsCount (int)
           - ScanEventTimestamps (list[str])
+
+        Normalized columns per TN go to `sidecar_sink` when given (the caller
+        owns and closes it); otherwise `sidecar_dir` gets one JSON file per TN.
         """
         if "Tracking Number" not in df.columns or "Carrier Code" not in df.columns:
             return df.copy()
 
         out = df.copy()
 
-        if self.client is None or self.normalizer is None:
+        if self.registry is None and (self.client is None or self.normalizer is None):
             return out
 
-        if sidecar_dir is not None:
-            Path(sidecar_dir).mkdir(parents=True, exist_ok=True)
+        owned_sink = False
+        if sidecar_sink is None and sidecar_dir is not None:
+            sidecar_sink = DirectorySidecarSink(sidecar_dir)
+            owned_sink = True
 
+        try:
+            if self.registry is not None:
+                return self._enrich_by_carrier(out, sidecar_sink)
+            return self._enrich_rows(out, sidecar_sink)
+        finally:
+            if owned_sink and sidecar_sink is not None:
+                sidecar_sink.close()
+
+    def _enrich_by_carrier(self, out: pd.DataFrame, sidecar_sink: Optional[SidecarSink]) -> pd.DataFrame:
+        groups: Dict[Optional[str], list[int]] = {}
+        for pos, carrier in enumerate(_text_values(out["Carrier Code"])):
+            groups.setdefault(self.registry.handler_for(carrier), []).append(pos)
+
+        unhandled = groups.pop(None, [])
+        if unhandled:
+            self._safe_log("info", "Skipping %d row(s) with unsupported carrier codes", len(unhandled))
+
+        def run(name: str, positions: list[int]) -> pd.DataFrame:
+            client, normalizer = self.registry.get(name)
+            sub = Enricher(self.logger, client=client if client is not None else self.client,
+                           normalizer=normalizer)
+            if sub.client is None or sub.normalizer is None:
+                return out.iloc[positions]
+            return sub._enrich_rows(out.iloc[positions], sidecar_sink)
+
+        if not groups:
+            return out
+        if len(groups) == 1 and not unhandled:
+            (name, positions), = groups.items()
+            return run(name, positions)
+
+        names = list(groups)
+        workers = min(self.max_workers, len(names))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="oss-carrier") as ex:
+            parts = list(ex.map(lambda n: run(n, groups[n]), names))
+        order = [p for n in names for p in groups[n]]
+        if unhandled:
+            parts.append(out.iloc[unhandled])
+            order.extend(unhandled)
+
+        # Merge back in the original row order
+        merged = pd.concat(parts).iloc[np.argsort(np.asarray(order), kind="stable")]
+        for k in merged.columns:
+            if k not in out.columns and k not in _OBJECT_COLS:
+                merged[k] = merged[k].astype("string").fillna("")
+        return merged
+
+    def _enrich_rows(self, out: pd.DataFrame, sidecar_sink: Optional[SidecarSink]) -> pd.DataFrame:
         created_cols: set[str] = set()
 
-        # Optional batch fetch
+        # TN / carrier text resolved once per column, not per row
+        rows = list(zip(out.index,
+                        _text_values(out["Tracking Number"]),
+                        _text_values(out["Carrier Code"])))
+
+        # Optional batch fetch (each TN once, in first-seen order)
         batch_payloads: dict[str, dict] = {}
         try:
             if hasattr(self.client, "fetch_batch"):
-                tns: list[str] = []
+                tns: Dict[str, None] = {}
                 carrier_map: dict[str, str] = {}
-                for _, row in out.iterrows():
-                    raw_tn = row.get("Tracking Number")
-                    raw_carrier = row.get("Carrier Code")
-                    if _is_blank(raw_tn):
+                for _, tn, carrier in rows:
+                    if tn is None:
                         continue
-                    tn = str(raw_tn).strip()
-                    tns.append(tn)
-                    if not _is_blank(raw_carrier):
-                        carrier_map[tn] = str(raw_carrier).strip()
+                    tns.setdefault(tn, None)
+                    if carrier is not None:
+                        carrier_map[tn] = carrier
                 if tns:
                     try:
                         batch_payloads = self.client.fetch_batch(
-                            tns, carrier_map=carrier_map)
+                            list(tns), carrier_map=carrier_map)
                     except Exception:
                         batch_payloads = {}
         except Exception:
             batch_payloads = {}
 
-        for idx, row in out.iterrows():
-            raw_tn = row.get("Tracking Number", None)
-            raw_carrier = row.get("Carrier Code", None)
-            if _is_blank(raw_tn):
+        # Per-TN fallback: queue every remaining TN up front on clients that
+        # coalesce submissions, so they go out as batch requests.
+        pending: dict[str, Any] = {}
+        if hasattr(self.client, "submit"):
+            for _, tn, carrier in rows:
+                if tn is None or tn in batch_payloads or tn in pending:
+                    continue
+                try:
+                    pending[tn] = self.client.submit(tn, carrier)
+                except Exception:
+                    pass
+
+        # Multi-package orders repeat TNs: fetch/normalize each (TN, carrier)
+        # once and broadcast its columns to every row that shares it
+        # (None = fetch/normalize failed, rows are left as they are).
+        per_tn: dict[tuple[str, Optional[str]], Optional[Dict[str, Any]]] = {}
+        for idx, tn, carrier in rows:
+            if tn is None:
                 continue
-
-            tn = str(raw_tn).strip()
-            carrier = None if _is_blank(
-                raw_carrier) else str(raw_carrier).strip()
-
-            # Prefer pre-fetched batch payload
-            payload: dict = {}
-            if tn in batch_payloads:
-                payload = batch_payloads.get(tn, {}) or {}
-            else:
+            key = (tn, carrier)
+            if key not in per_tn:
+                per_tn[key] = self._enrich_tn(
+                    tn, carrier, batch_payloads, pending, sidecar_sink)
+            values = per_tn[key]
+            if values is None:
+                continue
+            for k, v in values.items():
                 try:
-                    payload = self._fetch_payload(tn, carrier)
-                except Exception as ex:
-                    self._safe_log(
-                        "warning", "fetch failed for %s/%s: %s", carrier, tn, ex)
+                    out.at[idx, k] = v
+                except Exception:
+                    # e.g. a dict into an existing text column; optional field
                     continue
+                created_cols.add(k)
 
-            if not payload:
-                self._safe_log(
-                    "warning", "empty payload for %s/%s", carrier, tn)
+        # Normalize newly created cols to string-friendly blanks where appropriate
+        for k in created_cols:
+            if k not in out.columns:
+                out[k] = ""
+            # Don't coerce dict/list fields to string dtype
+            if k in _OBJECT_COLS:
+                continue
+            out[k] = out[k].astype("string").fillna("")
 
-            # Normalize to core excel columns
+        return out
+
+    def _enrich_tn(
+        self,
+        tn: str,
+        carrier: Optional[str],
+        batch_payloads: Dict[str, dict],
+        pending: Dict[str, Any],
+        sidecar_sink: Optional[SidecarSink],
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch + normalize one TN; column -> value for its rows, or None to skip them."""
+        # Prefer pre-fetched batch payload
+        payload: dict = {}
+        if tn in batch_payloads:
+            payload = batch_payloads.get(tn, {}) or {}
+        elif tn in pending:
             try:
-                cols = self._normalize(payload, tn, carrier)
+                payload = pending[tn].result() or {}
             except Exception as ex:
                 self._safe_log(
-                    "warning", "Normalization failed for %s/%s: %s", carrier, tn, ex)
-                continue
+                    "warning", "fetch failed for %s/%s: %s", carrier, tn, ex)
+                return None
+        else:
+            try:
+                payload = self._fetch_payload(tn, carrier)
+            except Exception as ex:
+                self._safe_log(
+                    "warning", "fetch failed for %s/%s: %s", carrier, tn, ex)
+                return None
 
-            for k, v in cols.items():
-                created_cols.add(k)
-                out.at[idx, k] = v
+        if not payload:
+            self._safe_log(
+                "warning", "empty payload for %s/%s", carrier, tn)
 
-            # ---------- Attach TN-scoped derived fields (always) ----------
-            # Use the raw payload if normalizer propagated it; otherwise use transport payload
-            raw_payload = cols.get("raw", payload) if isinstance(
-                cols, dict) else payload
-            scoped = self._scope_payload_to_tn(raw_payload, tn)
+        # Normalize to core excel columns
+        try:
+            cols = self._normalize(payload, tn, carrier)
+        except Exception as ex:
+            self._safe_log(
+                "warning", "Normalization failed for %s/%s: %s", carrier, tn, ex)
+            return None
 
-            # latestStatusDetail + ancillary text
-            try:
-                lsd = self._latest_status_detail_from_scoped(scoped)
-                out.at[idx, "latestStatusDetail"] = lsd
-                created_cols.add("latestStatusDetail")
+        values: Dict[str, Any] = dict(cols)
 
-                anc = self._ancillary_text_from_lsd(lsd)
-                out.at[idx, "LatestAncillaryText"] = anc
-                created_cols.add("LatestAncillaryText")
-            except Exception:
-                # keep going; these are optional
-                pass
+        # ---------- Attach TN-scoped derived fields (always) ----------
+        # Use the raw payload if normalizer propagated it; otherwise use transport payload
+        raw_payload = cols.get("raw", payload) if isinstance(
+            cols, dict) else payload
+        scoped = self._scope_payload_to_tn(raw_payload, tn)
 
-            # LatestEventTimestampUtc / ScanEventsCount / ScanEventTimestamps (TN-scoped)
-            try:
-                ts, scan_ct, scan_ts = self._compute_latest_ts_scan_counts(
-                    scoped)
-                if ts:
-                    out.at[idx, "LatestEventTimestampUtc"] = ts
-                    created_cols.add("LatestEventTimestampUtc")
-                out.at[idx, "ScanEventsCount"] = int(scan_ct)
-                created_cols.add("ScanEventsCount")
-                out.at[idx, "ScanEventTimestamps"] = scan_ts
-                created_cols.add("ScanEventTimestamps")
-            except Exception:
-                pass
+        # latestStatusDetail + ancillary text
+        try:
+            lsd = self._latest_status_detail_from_scoped(scoped)
+            values["latestStatusDetail"] = lsd
+            values["LatestAncillaryText"] = self._ancillary_text_from_lsd(lsd)
+        except Exception:
+            # keep going; these are optional
+            pass
 
-            # Optional sidecar write
-            if sidecar_dir is not None:
-                try:
-                    (Path(sidecar_dir) / f"{carrier}_{tn}.json").write_text(
-                        json.dumps(cols, ensure_ascii=False), encoding="utf-8"
-                    )
-                except Exception as ex:
-                    self._safe_log(
-                        "warning", "Sidecar write failed for %s/%s: %s", carrier, tn, ex)
+        # LatestEventTimestampUtc / ScanEventsCount / ScanEventTimestamps (TN-scoped)
+        try:
+            ts, scan_ct, scan_ts = self._compute_latest_ts_scan_counts(
+                scoped)
+            if ts:
+                values["LatestEventTimestampUtc"] = ts
+            values["ScanEventsCount"] = int(scan_ct)
+            values["ScanEventTimestamps"] = scan_ts
+        except Exception:
+            pass
 
-        # Normalize newly created cols to string-friendly blanks where appropriate
-        for k in created_cols:
-            if k not in out.columns:
-                out[k] = ""
-            # Don't coerce dict/list fields to string dtype
-            if k in ("latestStatusDetail", "ScanEventTimestamps"):
-                continue
-            out[k] = out[k].astype("string").fillna("")
+        # Optional sidecar write
+        if sidecar_sink is not None:
+            try:
+                sidecar_sink.write(carrier, tn, cols)
+            except Exception as ex:
+                self._safe_log(
+                    "warning", "Sidecar write failed for %s/%s: %s", carrier, tn, ex)
 
-        return out
+        return values
@@ -1,10 +1,43 @@
 # src/order_shipping_status/pipelines/preprocessor.py
 from __future__ import annotations
 import datetime as dt
+import warnings
+import numpy as np
 import pandas as pd
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from order_shipping_status.io.schema import LEGACY_STATUS_COLUMN
 
+DATE_COLUMN = "Promised Delivery Date"
+
+# Explicit formats tried (in order) when sniffing a text date column. Values that
+# match none of the detected formats fall back to per-element parsing.
+_DATE_FORMATS: Tuple[str, ...] = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%y",
+    "%Y/%m/%d",
+    "%d-%b-%Y",
+)
+_SNIFF_SAMPLE = 500
+
+DateWindow = Tuple[dt.date, dt.date]
+
+
+def week_windows(start: dt.date, end: dt.date) -> List[DateWindow]:
+    """Sunday..Saturday windows covering every day from `start` to `end` (inclusive)."""
+    if end < start:
+        raise ValueError(f"end {end} is before start {start}")
+    sun = start - dt.timedelta(days=(start.weekday() + 1) % 7)
+    out: List[DateWindow] = []
+    while sun <= end:
+        out.append((sun, sun + dt.timedelta(days=6)))
+        sun += dt.timedelta(days=7)
+    return out
+
 
 class Preprocessor:
     """Project’s input normalization and row filtering (prior week; not delivered)."""
@@ -19,6 +52,8 @@ class Preprocessor:
         self.reference_date = reference_date
         self.logger = logger
         self.enable_date_filter = enable_date_filter
+        # column name -> formats detected on first parse (reused across calls)
+        self._date_formats: Dict[str, Tuple[str, ...]] = {}
 
     def prior_week_range(self, ref: Optional[dt.date] = None) -> Tuple[dt.date, dt.date]:
         if ref is None:
@@ -32,37 +67,149 @@ class Preprocessor:
     def _drop_first_column(self, df: pd.DataFrame) -> pd.DataFrame:
         # Always drop the first column when present. Input files typically
         # have an extraneous index/placeholder column; dropping it keeps the
-        # downstream schema consistent.
-        if df.shape[1] <= 1:
-            # If there are zero or one columns, returning an empty frame is
-            # safer than returning the original with an unwanted leading col.
-            return df.iloc[:, 1:].copy()
-        return df.iloc[:, 1:].copy()
+        # downstream schema consistent. No copy here: prepare() materializes
+        # the result once, after filtering.
+        return df.iloc[:, 1:]
+
+    @staticmethod
+    def _sniff_date_formats(text: pd.Series) -> Tuple[str, ...]:
+        """Return the explicit formats (in _DATE_FORMATS order) that parse a sample of `text`."""
+        remaining = text.dropna().drop_duplicates().head(_SNIFF_SAMPLE)
+        found: list[str] = []
+        for fmt in _DATE_FORMATS:
+            if remaining.empty:
+                break
+            hit = pd.to_datetime(remaining, format=fmt, errors="coerce").notna()
+            if hit.any():
+                found.append(fmt)
+                remaining = remaining[~hit]
+        return tuple(found)
+
+    def _parse_dates(self, values: pd.Series, column: str = DATE_COLUMN) -> pd.Series:
+        """
+        Parse a date column to naive datetime64.
+
+        Already-datetime columns (the usual read_excel result) are used as-is.
+        Text/mixed columns are factorized so each distinct value is parsed once,
+        vectorially, with the formats sniffed once per column; only values none
+        of them match go through the slow `dateutil` fallback.
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            if getattr(values.dt, "tz", None) is not None:
+                return values.dt.tz_localize(None)
+            return values
+
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        text = pd.Series(uniques, dtype="object").astype("string").str.strip()
+        text = text.where(text != "")
+
+        formats = self._date_formats.get(column)
+        if formats is None:
+            formats = self._sniff_date_formats(text)
+            self._date_formats[column] = formats
+
+        # NaT slot at the end so the NA sentinel (-1) maps to NaT
+        parsed = np.full(len(text) + 1, np.datetime64("NaT"),
+                         dtype="datetime64[ns]")
+        pending = text.notna().to_numpy(dtype=bool, copy=True)
+
+        def _fill(chunk: pd.Series) -> None:
+            ok = chunk.notna().to_numpy(dtype=bool)
+            where = np.flatnonzero(pending)[ok]
+            parsed[where] = chunk.to_numpy()[ok].astype("datetime64[ns]")
+            pending[where] = False
+
+        for fmt in formats:
+            if not pending.any():
+                break
+            _fill(pd.to_datetime(text[pending], format=fmt, errors="coerce"))
+
+        if pending.any():
+            with warnings.catch_warnings():
+                warnings.filterwarnings(
+                    "ignore", message="Could not infer format, so each element will be parsed individually, falling back to `dateutil`.")
+                rest = pd.to_datetime(
+                    text[pending].astype("object"), errors="coerce")
+            if getattr(getattr(rest, "dt", None), "tz", None) is not None:
+                rest = rest.dt.tz_localize(None)
+            _fill(rest)
+        return pd.Series(parsed[codes], index=values.index)
+
+    def _prior_week_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Boolean mask of rows whose Promised Delivery Date is in the prior week."""
+        if not self.enable_date_filter or DATE_COLUMN not in df.columns:
+            return pd.Series(True, index=df.index)
+        start, end = self.prior_week_range()
+        dates = self._parse_dates(df[DATE_COLUMN])
+        lo = pd.Timestamp(start)
+        hi = pd.Timestamp(end) + pd.Timedelta(days=1)
+        return ((dates >= lo) & (dates < hi)).fillna(False).astype(bool)
+
+    def _window_codes(self, df: pd.DataFrame, windows: Sequence[DateWindow]) -> np.ndarray:
+        """
+        Index into `windows` for every row (-1 = in no window), in one pass.
+
+        Windows must not overlap; each row's date is located with a single
+        searchsorted over the sorted window starts.
+        """
+        if DATE_COLUMN not in df.columns:
+            return np.full(len(df), -1, dtype=np.int64)
+        starts = np.array([pd.Timestamp(w[0]).to_datetime64()
+                          for w in windows], dtype="datetime64[ns]")
+        ends = np.array([(pd.Timestamp(w[1]) + pd.Timedelta(days=1)).to_datetime64()
+                        for w in windows], dtype="datetime64[ns]")
+        if len(starts) > 1 and (starts[1:] < ends[:-1]).any():
+            raise ValueError("date windows must be sorted and non-overlapping")
+
+        dates = self._parse_dates(df[DATE_COLUMN]).to_numpy(
+            dtype="datetime64[ns]")
+        pos = np.searchsorted(starts, dates, side="right") - 1
+        valid = (pos >= 0) & ~np.isnat(dates)
+        valid[valid] &= dates[valid] < ends[pos[valid]]
+        return np.where(valid, pos, -1)
+
+    def prepare_windows(self, df: pd.DataFrame, windows: Sequence[DateWindow]) -> Dict[DateWindow, pd.DataFrame]:
+        """
+        Like `prepare`, but for many date windows at once.
+
+        Rows are assigned to a window in one vectorized pass and returned as
+        {window: frame} (every requested window is present, possibly empty).
+        Rows outside all windows and delivered rows are dropped. The original
+        row index is preserved, so bucket rows can be located in a frame
+        derived from their concatenation.
+        """
+        windows = sorted(windows)
+        df1 = self._drop_first_column(df)
+        codes = self._window_codes(df1, windows)
+        keep = (codes >= 0) & self._not_delivered_mask(df1).to_numpy(dtype=bool)
+        self._log_delta("filter_by_windows (%d)" % len(windows), len(df1),
+                        int((codes >= 0).sum()))
+        self._log_delta("filter_not_delivered", int(
+            (codes >= 0).sum()), int(keep.sum()))
+
+        kept = df1.loc[keep]
+        groups = dict(tuple(kept.groupby(codes[keep], sort=True)))
+        return {w: groups.get(i, kept.iloc[0:0]) for i, w in enumerate(windows)}
+
+    def _not_delivered_mask(self, df: pd.DataFrame) -> pd.Series:
+        if LEGACY_STATUS_COLUMN not in df.columns:
+            return pd.Series(True, index=df.index)
+        # Casefold each distinct status once, then broadcast via the codes
+        codes, uniques = pd.factorize(df[LEGACY_STATUS_COLUMN])
+        delivered = pd.Series(uniques, dtype="object").astype(
+            "string").str.casefold().eq("delivered").fillna(False).to_numpy(dtype=bool)
+        delivered = np.append(delivered, False)  # NA sentinel (-1) -> keep
+        return pd.Series(~delivered[codes], index=df.index)
 
     def _filter_by_prior_week(self, df: pd.DataFrame) -> pd.DataFrame:
-        if not self.enable_date_filter:
+        if not self.enable_date_filter or DATE_COLUMN not in df.columns:
             return df  # ← bypass filtering
-        if "Promised Delivery Date" not in df.columns:
-            return df
-        start, end = self.prior_week_range()
-        # Use infer_datetime_format to reduce noisy pandas warnings about format discovery.
-        # Wrap in warnings.catch_warnings to suppress a known pandas UserWarning about
-        # falling back to dateutil when formats are ambiguous.
-        import warnings
-
-        with warnings.catch_warnings():
-            warnings.filterwarnings(
-                "ignore", message="Could not infer format, so each element will be parsed individually, falling back to `dateutil`.")
-            dates = pd.to_datetime(
-                df["Promised Delivery Date"], errors="coerce", utc=False
-            ).dt.date
-        return df.loc[(dates >= start) & (dates <= end)].copy()
+        return df.loc[self._prior_week_mask(df)]
 
     def _filter_not_delivered(self, df: pd.DataFrame) -> pd.DataFrame:
         if LEGACY_STATUS_COLUMN not in df.columns:
             return df
-        s = df[LEGACY_STATUS_COLUMN].astype("string").fillna("")
-        return df.loc[s.str.casefold() != "delivered"].copy()
+        return df.loc[self._not_delivered_mask(df)]
 
     def _log_delta(self, label: str, before: int, after: int) -> None:
         if self.logger:
@@ -74,15 +221,16 @@ class Preprocessor:
         df1 = self._drop_first_column(df)
         self._log_delta("drop_first_column", before, len(df1))
 
+        # Both filters are evaluated as masks and applied in a single selection.
         before = len(df1)
-        df2 = self._filter_by_prior_week(df1)
+        keep = self._prior_week_mask(df1)
+        after_week = int(keep.sum())
         self._log_delta(
             "filter_by_prior_week" +
             ("" if self.enable_date_filter else " (skipped)"),
-            before, len(df2)
+            before, after_week
         )
 
-        before = len(df2)
-        df3 = self._filter_not_delivered(df2)
-        self._log_delta("filter_not_delivered", before, len(df3))
-        return df3
+        keep &= self._not_delivered_mask(df1)
+        self._log_delta("filter_not_delivered", after_week, int(keep.sum()))
+        return df1.loc[keep]
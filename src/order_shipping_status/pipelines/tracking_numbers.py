@@ -0,0 +1,93 @@
+# src/order_shipping_status/pipelines/tracking_numbers.py
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# Beyond this not every integer is a float, so larger values must not take
+# the float64 path (a 19-digit int would come back with its last digits changed)
+_FLOAT_EXACT_LIMIT = 2.0 ** 53
+
+
+def clean_tracking_number(v: Any) -> str:
+    """Return a clean string tracking number (no decimals/scientific)."""
+    if v is None:
+        return ""
+    s = str(v).strip()
+    if s == "" or s.lower() in ("nan", "none", "<na>"):
+        return ""
+    if s.isdigit():
+        # already a clean TN; leading zeros (e.g. SSCC '00...') are significant
+        return s
+    # common cases: 1.2345E+11, 123456789012.0, ints/floats
+    try:
+        # if it's numeric in any form, render as integer with no decimal
+        as_float = float(s.replace(",", ""))  # allow accidental commas
+        # guard against scientific strings like '1.234e+11' -> int ok
+        return str(int(as_float))
+    except Exception:
+        # not numeric -> keep as-is
+        # but if it's like '123456789012.0', strip trailing '.0'
+        if s.endswith(".0"):
+            return s[:-2]
+        return s
+
+
+def tracking_number_cell(v: Any) -> str:
+    """
+    `read_excel` converter for the Tracking Number column.
+
+    Text cells are the TN as typed and are only stripped (blank markers
+    become ""); numeric cells, whose TN Excel stored as a number, are
+    repaired with `clean_tracking_number` (no '.0' / exponent).
+    """
+    if isinstance(v, str):
+        s = v.strip()
+        return "" if s.lower() in ("nan", "none", "<na>") else s
+    return clean_tracking_number(v)
+
+
+def clean_tracking_numbers(values: pd.Series) -> pd.Series:
+    """
+    `clean_tracking_number` for a whole column at once (object dtype out).
+
+    Fast paths cover the shapes `read_excel` produces: int64 columns are
+    rendered by numpy, real floats up to 2**53 are truncated through int64,
+    and digit strings are found with one `str.isdigit` pass and kept as they
+    are (leading zeros included). Only the rest (alphanumeric TNs,
+    '1.2E+11' / '123.0' strings, Python ints in object columns, huge floats)
+    falls back to the scalar rules, which keep ints' exact digits.
+    """
+    n = len(values)
+    out = np.full(n, "", dtype=object)
+    if n == 0:
+        return pd.Series(out, index=values.index, name=values.name, dtype="object")
+
+    if pd.api.types.is_integer_dtype(values.dtype) and not values.hasnans:
+        # exact: no float round-trip for 16+ digit TNs stored as int64
+        out[:] = values.to_numpy().astype(str).astype(object)
+        return pd.Series(out, index=values.index, name=values.name, dtype="object")
+
+    raw = values.to_numpy(dtype=object)
+    kind = pd.api.types.infer_dtype(raw, skipna=True)
+    if kind in ("floating", "integer", "mixed-integer-float"):
+        f = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        fast = np.isfinite(f) & (np.abs(f) <= _FLOAT_EXACT_LIMIT)
+        if kind != "floating":
+            # ints (of any size) keep their exact digits through str()
+            fast &= np.fromiter((isinstance(v, (float, np.floating)) for v in raw),
+                                dtype=bool, count=n)
+        out[fast] = np.trunc(f[fast]).astype(np.int64).astype(str).astype(object)
+        rest = ~fast & ~pd.isna(raw)
+    else:
+        s = values.astype("string").str.strip()
+        digits = s.str.isdigit().fillna(False).to_numpy(dtype=bool)
+        if digits.any():
+            out[digits] = s[digits].to_numpy(dtype=object)
+        rest = ~digits & s.notna().to_numpy(dtype=bool)
+
+    if rest.any():
+        out[rest] = [clean_tracking_number(v) for v in raw[rest]]
+    return pd.Series(out, index=values.index, name=values.name, dtype="object")
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from order_shipping_status.io.paths import PROCESSED_SUFFIX, derive_output_paths, derive_views_dir
+from order_shipping_status.models import EnvCfg
+from order_shipping_status.pipelines.workbook_processor import WorkbookProcessor
+
+_Signature = Tuple[int, int]  # (size, mtime_ns)
+
+
+class InboxWatcher:
+    """
+    Poll an inbox directory and process each new `.xlsx` as it arrives.
+
+    Runs inside one long-lived process so the processor's client (OAuth
+    token, HTTP connection pool, response cache) stays warm between files.
+
+    A file is picked up once its size/mtime are unchanged across
+    `settle_polls` consecutive polls (so half-copied workbooks are not read),
+    and is processed again only if it changes. The pickup delay, between
+    `settle_polls` and `settle_polls + 1` poll intervals (0.25-0.5 s by
+    default), comes on top of the workbook's processing time. Inputs whose processed output
+    is already newer than the input are skipped, which makes restarts safe.
+    """
+
+    def __init__(
+        self,
+        processor: WorkbookProcessor,
+        inbox: Path,
+        env_cfg: Optional[EnvCfg] = None,
+        *,
+        poll_interval: float = 0.25,
+        settle_polls: int = 1,
+        sidecar_dir: Optional[Path] = None,
+    ) -> None:
+        self.processor = processor
+        self.logger = processor.logger
+        self.inbox = Path(inbox)
+        self.env_cfg = env_cfg
+        self.poll_interval = float(poll_interval)
+        self.settle_polls = max(0, int(settle_polls))
+        self.sidecar_dir = sidecar_dir
+        self._pending: Dict[Path, Tuple[_Signature, int]] = {}
+        self._done: Dict[Path, _Signature] = {}
+
+    def _candidates(self) -> List[Path]:
+        return sorted(
+            p for p in self.inbox.glob("*.xlsx")
+            if p.is_file() and not p.name.endswith(PROCESSED_SUFFIX) and not p.name.startswith("~$")
+        )
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[_Signature]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    def _already_processed(self, path: Path, sig: _Signature) -> bool:
+        processed = path.with_name(f"{path.stem}{PROCESSED_SUFFIX}")
+        if getattr(self.processor, "output_format", "xlsx") != "xlsx":
+            processed = derive_views_dir(processed)
+        try:
+            return processed.stat().st_mtime_ns >= sig[1]
+        except OSError:
+            return False
+
+    def poll_once(self) -> List[Dict[str, Any]]:
+        """Scan the inbox once; process every settled file. Returns the results."""
+        results: List[Dict[str, Any]] = []
+        seen = set()
+        for path in self._candidates():
+            seen.add(path)
+            sig = self._signature(path)
+            if sig is None or self._done.get(path) == sig:
+                continue
+            if path not in self._done and self._already_processed(path, sig):
+                self._done[path] = sig
+                continue
+
+            prev = self._pending.get(path)
+            stable = prev[1] + 1 if prev and prev[0] == sig else 0
+            if stable < self.settle_polls:
+                self._pending[path] = (sig, stable)
+                continue
+
+            self._pending.pop(path, None)
+            self._done[path] = sig
+            results.append(self._process(path))
+
+        # Forget files that left the inbox
+        for path in list(self._pending):
+            if path not in seen:
+                del self._pending[path]
+        for path in list(self._done):
+            if path not in seen:
+                del self._done[path]
+        return results
+
+    def _process(self, path: Path) -> Dict[str, Any]:
+        try:
+            processed_path, _ = derive_output_paths(path)
+            file_sidecar = (Path(self.sidecar_dir) /
+                            path.stem) if self.sidecar_dir else None
+            res = self.processor.process(
+                path, processed_path, env_cfg=self.env_cfg, sidecar_dir=file_sidecar)
+            res["input_path"] = str(path)
+            return res
+        except Exception as ex:
+            self.logger.exception("Failed to process %s: %s", path, ex)
+            return {"input_path": str(path), "error": str(ex)}
+
+    def run(
+        self,
+        stop_event: Optional[threading.Event] = None,
+        *,
+        max_polls: Optional[int] = None,
+    ) -> None:
+        """Poll until `stop_event` is set (or `max_polls` scans have run)."""
+        stop_event = stop_event or threading.Event()
+        self.logger.info("Watching %s (poll every %.2fs; new files are picked up after %.2f-%.2fs)",
+                         self.inbox, self.poll_interval,
+                         self.settle_polls * self.poll_interval,
+                         (self.settle_polls + 1) * self.poll_interval)
+        polls = 0
+        while not stop_event.is_set():
+            for res in self.poll_once():
+                if res.get("error"):
+                    self.logger.error("Inbox file failed: %s (%s)",
+                                      res["input_path"], res["error"])
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                break
+            stop_event.wait(self.poll_interval)
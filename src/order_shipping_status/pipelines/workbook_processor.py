@@ -2,20 +2,92 @@ from __future__ import annotations
 
 import datetime as dt
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Collection, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 import warnings
 
+from order_shipping_status.io.paths import (
+    derive_enriched_path,
+    derive_views_dir,
+    derive_window_output_path,
+)
+from order_shipping_status.io.schema import INPUT_DTYPES
+from order_shipping_status.io.sidecar import open_sidecar_sink
 from order_shipping_status.models import EnvCfg
 from order_shipping_status.pipelines.column_contract import ColumnContract
 from order_shipping_status.pipelines.enricher import Enricher
-from order_shipping_status.pipelines.preprocessor import Preprocessor
+from order_shipping_status.pipelines.preprocessor import DateWindow, Preprocessor
+from order_shipping_status.pipelines.tracking_numbers import (
+    clean_tracking_numbers,
+    tracking_number_cell,
+)
 from order_shipping_status.rules.indicators import apply_indicators
 from order_shipping_status.rules.status_mapper import map_indicators_to_status
 from openpyxl import load_workbook
 
 
+# ---- view helpers ----------------------------------------------------------
+def _finalize_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean "Tracking Number" to text and place UnableToDeliver right after
+    Damaged, in a single copy of `df`.
+    """
+    out = df.copy()
+    if "Tracking Number" in out.columns:
+        out["Tracking Number"] = clean_tracking_numbers(out["Tracking Number"])
+    if "Damaged" in out.columns:
+        if "UnableToDeliver" not in out.columns:
+            out["UnableToDeliver"] = 0
+        cols = [c for c in out.columns if c != "UnableToDeliver"]
+        cols.insert(cols.index("Damaged") + 1, "UnableToDeliver")
+        if cols != list(out.columns):
+            out = out[cols]
+    return out
+
+
+# View membership bits assigned per row by `_view_bits`
+VIEW_PRETRANSIT = 1
+VIEW_STALLED = 2
+VIEW_DAMAGED_OR_RETURNED = 4
+VIEW_ISSUES = 8
+_VIEW_BITS = {
+    "All Issues": VIEW_ISSUES,
+    "PreTransit": VIEW_PRETRANSIT,
+    "Stalled": VIEW_STALLED,
+    "Damaged or Returned": VIEW_DAMAGED_OR_RETURNED,
+}
+
+
+def _view_bits(df: pd.DataFrame) -> np.ndarray:
+    """
+    One categorization pass: a uint8 bitmask per row saying which views it
+    belongs to. Missing indicator columns count as 0. All Issues is every
+    non-delivered row, or exception/stalled/RTS rows when IsDelivered is absent.
+    """
+    n = len(df)
+
+    def flag(col: str) -> np.ndarray:
+        if col not in df.columns:
+            return np.zeros(n, dtype=bool)
+        return (pd.to_numeric(df[col], errors="coerce") == 1).to_numpy(dtype=bool, na_value=False)
+
+    is_rts = flag("IsRTS")
+    is_stalled = flag("IsStalled")
+    if "IsDelivered" in df.columns:
+        issues = ~flag("IsDelivered")
+    else:
+        issues = flag("HasException") | is_stalled | is_rts
+
+    bits = np.zeros(n, dtype=np.uint8)
+    bits[flag("IsPreTransit")] |= VIEW_PRETRANSIT
+    bits[is_stalled] |= VIEW_STALLED
+    bits[flag("Damaged") | is_rts] |= VIEW_DAMAGED_OR_RETURNED
+    bits[issues] |= VIEW_ISSUES
+    return bits
+
+
 class WorkbookProcessor:
     """Orchestrates pre-processing, column contract, enrichment, and rules."""
 
@@ -29,6 +101,11 @@ class WorkbookProcessor:
         enable_date_filter: bool = True,
         stalled_threshold_days: int = 4,
         reference_now: dt.datetime | None = None,
+        sidecar_format: str = "jsonl",
+        only_tracking_numbers: Optional[Collection[str]] = None,
+        enriched_format: Optional[str] = None,
+        output_format: str = "xlsx",
+        carrier_registry: Optional[Any] = None,
     ) -> None:
         self.logger = logger
         self.client = client
@@ -37,6 +114,16 @@ class WorkbookProcessor:
         self.enable_date_filter = enable_date_filter
         self.stalled_threshold_days = int(stalled_threshold_days)
         self.reference_now = reference_now
+        self.sidecar_format = sidecar_format
+        # Restrict processing to these TNs (e.g. a retry queue); None = all rows
+        self.only_tracking_numbers = (
+            None if only_tracking_numbers is None else {str(t) for t in only_tracking_numbers})
+        # Also write the enriched frame as "parquet"/"arrow" next to the xlsx
+        self.enriched_format = enriched_format
+        # "xlsx" (workbook) or "csv"/"jsonl" (one file per view, see io.view_writer)
+        self.output_format = output_format
+        # Optional CarrierRegistry: route rows to per-carrier client/normalizer pairs
+        self.carrier_registry = carrier_registry
 
     def process(
         self,
@@ -56,6 +143,87 @@ class WorkbookProcessor:
         df_in = self._read_input(input_path)
 
         df_out = self._prepare_and_enrich(df_in, sidecar_dir=sidecar_dir)
+        return self._emit(input_path, processed_path, env_cfg, df_in, df_out)
+
+    def process_enriched(
+        self,
+        input_path: Path,
+        enriched_path: Path,
+        processed_path: Path,
+        env_cfg: Optional[EnvCfg] = None,
+    ) -> dict[str, Any]:
+        """
+        Regenerate the xlsx views from a previously written enriched file
+        (`enriched_format`) without preprocessing or enrichment. The original
+        input is still read for the 'All Shipments' sheet and the Marker.
+        """
+        from order_shipping_status.io.columnar import read_enriched
+
+        input_path = Path(input_path)
+        enriched_path = Path(enriched_path)
+        processed_path = Path(processed_path)
+        if not enriched_path.exists():
+            self.logger.error("Enriched file does not exist: %s", enriched_path)
+            raise FileNotFoundError(enriched_path)
+
+        df_in = self._read_input(input_path) if input_path.exists() else pd.DataFrame()
+        df_out = read_enriched(enriched_path)
+        self.logger.info("Loaded enriched frame ← %s (rows=%d)", enriched_path, len(df_out))
+        return self._emit(input_path, processed_path, env_cfg, df_in, df_out,
+                          write_enriched=False)
+
+    def process_windows(
+        self,
+        input_path: Path,
+        windows: Sequence[DateWindow],
+        env_cfg: Optional[EnvCfg] = None,
+        *,
+        output_dir: Optional[Path] = None,
+        sidecar_dir: Optional[Path] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Produce one processed workbook per date window from a single read and a
+        single enrichment (one fetch for the union of all windows' rows).
+
+        Outputs are named `<stem>_<start>_<end>_processed.xlsx` (see
+        `derive_window_output_path`) next to the input or in `output_dir`.
+        """
+        input_path = Path(input_path)
+        if not input_path.exists():
+            self.logger.error("Input file does not exist: %s", input_path)
+            raise FileNotFoundError(input_path)
+
+        df_in = self._read_input(input_path)
+        buckets = Preprocessor(
+            self.reference_date,
+            logger=self.logger,
+        ).prepare_windows(df_in, windows)
+        buckets = {w: self._restrict_to_queued(b) for w, b in buckets.items()}
+
+        frames = [b for b in buckets.values() if len(b)]
+        df_prep = pd.concat(frames) if frames else next(
+            iter(buckets.values()), df_in.iloc[0:0, 1:])
+        df_all = self._enrich_prepared(df_prep, sidecar_dir=sidecar_dir)
+
+        results = []
+        for (start, end), bucket in buckets.items():
+            processed_path = derive_window_output_path(
+                input_path, start, end, output_dir=output_dir)
+            self.logger.info("Window %s..%s: %d rows", start, end, len(bucket))
+            results.append(self._emit(
+                input_path, processed_path, env_cfg, df_in, df_all.loc[bucket.index]))
+        return results
+
+    def _emit(
+        self,
+        input_path: Path,
+        processed_path: Path,
+        env_cfg: Optional[EnvCfg],
+        df_in: pd.DataFrame,
+        df_out: pd.DataFrame,
+        *,
+        write_enriched: bool = True,
+    ) -> dict[str, Any]:
         # Optional: developer preview of a few columns (only those that exist)
         try:
             _want = [
@@ -80,30 +248,55 @@ class WorkbookProcessor:
             and getattr(env_cfg, "SHIPPING_CLIENT_SECRET", "")
         )
 
+        output_path = (processed_path if self.output_format == "xlsx"
+                       else derive_views_dir(processed_path))
         marker = self._build_marker(
-            input_path, processed_path, now_utc, has_creds, df_in, df_out)
+            input_path, output_path, now_utc, has_creds, df_in, df_out)
 
-        # Ensure output dir exists
-        processed_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.output_format == "xlsx":
+            # Ensure output dir exists
+            processed_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write workbook (All Shipments, All Issues, PreTransit, Stalled, Processed, Marker)
-        self._write_workbook(processed_path, df_in, df_out, marker)
+            # Write workbook (All Shipments, All Issues, PreTransit, Stalled, Processed, Marker)
+            self._write_workbook(processed_path, df_in, df_out, marker)
 
-        # Post-process workbook (fix empty-string cells in 'Processed')
-        self._postprocess_workbook(processed_path)
+            # Post-process workbook (fix empty-string cells in 'Processed')
+            self._postprocess_workbook(processed_path)
 
-        self.logger.info("Wrote processed workbook → %s", processed_path)
-        return {
-            "output_path": str(processed_path),
+            self.logger.info("Wrote processed workbook → %s", processed_path)
+        else:
+            # Flat files for machine consumers: no openpyxl, one file per view
+            from order_shipping_status.io.view_writer import write_views
+
+            write_views(self._derive_views(df_in, df_out, marker),
+                        output_path, self.output_format)
+            self.logger.info("Wrote %s views → %s", self.output_format, output_path)
+
+        result = {
+            "output_path": str(output_path),
             "env_has_creds": has_creds,
             "timestamp_utc": now_utc,
             "output_cols": list(df_out.columns),
             "output_shape": (len(df_out), len(df_out.columns)),
         }
+        if write_enriched and self.enriched_format:
+            enriched_path = derive_enriched_path(processed_path, self.enriched_format)
+            try:
+                from order_shipping_status.io.columnar import write_enriched as _write
+
+                _write(df_out, enriched_path)
+                self.logger.info("Wrote enriched frame → %s", enriched_path)
+                result["enriched_path"] = str(enriched_path)
+            except Exception as ex:
+                # The workbook is the primary output; don't fail the run over this
+                self.logger.warning("Could not write enriched frame (%s): %s", enriched_path, ex)
+        return result
 
     def _read_input(self, input_path: Path) -> pd.DataFrame:
         try:
-            df_in = pd.read_excel(input_path, sheet_name=0, engine="openpyxl")
+            df_in = pd.read_excel(input_path, sheet_name=0, engine="openpyxl",
+                                  dtype=dict(INPUT_DTYPES),
+                                  converters={"Tracking Number": tracking_number_cell})
             self.logger.debug(
                 "Opened input workbook: %s (rows=%d, cols=%d)",
                 input_path.name,
@@ -115,6 +308,10 @@ class WorkbookProcessor:
                 "Could not read input workbook (%s): %s", input_path.name, ex
             )
             df_in = pd.DataFrame()
+        if "Tracking Number" in df_in.columns:
+            # The converter already fixed numeric cells; text cells (leading
+            # zeros included) are kept as typed. Blank cells come back as NaN.
+            df_in["Tracking Number"] = df_in["Tracking Number"].astype(object).fillna("")
         return df_in
 
     def _prepare_and_enrich(self, df_in: pd.DataFrame, *, sidecar_dir: Optional[Path] = None) -> pd.DataFrame:
@@ -124,14 +321,34 @@ class WorkbookProcessor:
             logger=self.logger,
             enable_date_filter=self.enable_date_filter,
         ).prepare(df_in)
-
+        df_prep = self._restrict_to_queued(df_prep)
+        return self._enrich_prepared(df_prep, sidecar_dir=sidecar_dir)
+
+    def _restrict_to_queued(self, df_prep: pd.DataFrame) -> pd.DataFrame:
+        """Keep only rows whose TN is in `only_tracking_numbers` (no-op when unset)."""
+        if self.only_tracking_numbers is None or "Tracking Number" not in df_prep.columns:
+            return df_prep
+        keep = df_prep["Tracking Number"].astype(
+            "string").str.strip().isin(self.only_tracking_numbers)
+        df_prep = df_prep.loc[keep.fillna(False).to_numpy(dtype=bool)]
+        self.logger.info("Restricted to %d row(s) with queued tracking numbers",
+                         len(df_prep))
+        return df_prep
+
+    def _enrich_prepared(self, df_prep: pd.DataFrame, *, sidecar_dir: Optional[Path] = None) -> pd.DataFrame:
         df_out = ColumnContract().ensure(df_prep)
 
-        df_out = Enricher(
+        enricher = Enricher(
             self.logger,
             client=self.client,
             normalizer=self.normalizer,
-        ).enrich(df_out, sidecar_dir=sidecar_dir)
+            registry=self.carrier_registry,
+        )
+        if sidecar_dir is None:
+            df_out = enricher.enrich(df_out, sidecar_dir=None)
+        else:
+            with open_sidecar_sink(sidecar_dir, self.sidecar_format, logger=self.logger) as sink:
+                df_out = enricher.enrich(df_out, sidecar_sink=sink)
 
         # --- Metrics: DaysSinceLatestEvent (vectorized, NaT-safe) ---
         now = pd.Timestamp(
@@ -216,151 +433,50 @@ class WorkbookProcessor:
             ]
         )
 
-    def _write_workbook(self, processed_path: Path, df_in: pd.DataFrame, df_out: pd.DataFrame, marker: pd.DataFrame) -> None:
-        # ---- helpers ------------------------------------------------------------
-        def _clean_tn_value(v) -> str:
-            """Return a clean string tracking number (no decimals/scientific)."""
-            if v is None:
-                return ""
-            s = str(v).strip()
-            if s == "" or s.lower() in ("nan", "none"):
-                return ""
-            # common cases: 1.2345E+11, 123456789012.0, ints/floats
-            try:
-                # if it's numeric in any form, render as integer with no decimal
-                as_float = float(s.replace(",", ""))  # allow accidental commas
-                # guard against scientific strings like '1.234e+11' -> int ok
-                return str(int(as_float))
-            except Exception:
-                # not numeric -> keep as-is
-                # but if it's like '123456789012.0', strip trailing '.0'
-                if s.endswith(".0"):
-                    return s[:-2]
-                return s
-
-        def _format_tracking_number_col(df: pd.DataFrame) -> pd.DataFrame:
-            if "Tracking Number" not in df.columns:
-                return df
-            out = df.copy()
-            out["Tracking Number"] = (
-                out["Tracking Number"]
-                .astype("object")  # don't let pandas coerce back to numeric
-                .map(_clean_tn_value)
-            )
-            return out
-
-        def _ensure_column_after(df: pd.DataFrame, col: str, after_col: str, default_value=0) -> pd.DataFrame:
-            out = df.copy()
-            if col not in out.columns:
-                out[col] = default_value
-            if after_col in out.columns:
-                cols = list(out.columns)
-                if col in cols:
-                    cols.remove(col)
-                insert_at = cols.index(after_col) + 1
-                cols.insert(insert_at, col)
-                out = out[cols]
-            return out
-
-        def _finalize(df: pd.DataFrame) -> pd.DataFrame:
-            out = _format_tracking_number_col(df)
-            if "Damaged" in out.columns:
-                out = _ensure_column_after(
-                    out, "UnableToDeliver", "Damaged", default_value=0)
-            return out
-
-        # ---- derive views -------------------------------------------------------
-        if "IsPreTransit" in df_out.columns:
-            pretransit = df_out[df_out["IsPreTransit"] == True]
-        else:
-            pretransit = pd.DataFrame(columns=df_out.columns)
-
-        if "IsStalled" in df_out.columns:
-            stalled = df_out[df_out["IsStalled"] == 1]
-        else:
-            stalled = pd.DataFrame(columns=df_out.columns)
+    @staticmethod
+    def _derive_views(df_in: pd.DataFrame, df_out: pd.DataFrame, marker: pd.DataFrame) -> dict[str, pd.DataFrame]:
+        """Return the output views keyed by sheet name, TN-cleaned and in sheet order."""
+        # TN cleanup / column order once on the base frame, then slice by bitmask
+        base = _finalize_view(df_out)
+        bits = _view_bits(df_out)
+        views = {"All Shipments": _finalize_view(df_in)}
+        for name, bit in _VIEW_BITS.items():
+            views[name] = base[(bits & bit) != 0]
+        views["Marker"] = marker
+        return views
 
-        if "Damaged" in df_out.columns or "IsRTS" in df_out.columns:
-            damaged_or_returned = df_out[
-                ((df_out["Damaged"] == 1)
-                 if "Damaged" in df_out.columns else False)
-                | ((df_out["IsRTS"] == 1) if "IsRTS" in df_out.columns else False)
-            ]
-        else:
-            damaged_or_returned = pd.DataFrame(columns=df_out.columns)
-
-        if "IsDelivered" in df_out.columns:
-            try:
-                all_issues = df_out[df_out["IsDelivered"] != 1]
-            except Exception:
-                all_issues = pd.DataFrame(columns=df_out.columns)
-        else:
-            has_exc = df_out["HasException"] == 1 if "HasException" in df_out.columns else pd.Series([
-                                                                                                     False] * len(df_out))
-            is_stalled = df_out["IsStalled"] == 1 if "IsStalled" in df_out.columns else pd.Series([
-                                                                                                  False] * len(df_out))
-            is_rts = df_out["IsRTS"] == 1 if "IsRTS" in df_out.columns else pd.Series([
-                                                                                      False] * len(df_out))
-            try:
-                issues_mask = (has_exc | is_stalled | is_rts)
-                issues_mask.index = df_out.index
-                all_issues = df_out[issues_mask]
-            except Exception:
-                all_issues = pd.DataFrame(columns=df_out.columns)
-
-        # finalize frames
-        df_in_w = _finalize(df_in)
-        all_issues_w = _finalize(all_issues)
-        pretransit_w = _finalize(pretransit)
-        stalled_w = _finalize(stalled)
-        damaged_or_returned_w = _finalize(damaged_or_returned)
+    def _write_workbook(self, processed_path: Path, df_in: pd.DataFrame, df_out: pd.DataFrame, marker: pd.DataFrame) -> None:
+        views = self._derive_views(df_in, df_out, marker)
 
         # ---- write --------------------------------------------------------------
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             with pd.ExcelWriter(processed_path, engine="openpyxl", mode="w") as xw:
                 try:
-                    df_in_w.to_excel(
+                    views["All Shipments"].to_excel(
                         xw, sheet_name="All Shipments", index=False, na_rep="")
                 except Exception:
                     pd.DataFrame().to_excel(xw, sheet_name="All Shipments", index=False, na_rep="")
 
-                all_issues_w.to_excel(
-                    xw, sheet_name="All Issues", index=False, na_rep="")
-                pretransit_w.to_excel(
-                    xw, sheet_name="PreTransit", index=False, na_rep="")
-                stalled_w.to_excel(xw, sheet_name="Stalled",
-                                   index=False, na_rep="")
-                damaged_or_returned_w.to_excel(
-                    xw, sheet_name="Damaged or Returned", index=False, na_rep="")
+                for name in ("All Issues", "PreTransit", "Stalled", "Damaged or Returned"):
+                    views[name].to_excel(xw, sheet_name=name, index=False, na_rep="")
                 marker.to_excel(xw, sheet_name="Marker", index=False)
 
-        # ---- force Excel TEXT type for "Tracking Number" ------------------------
-        try:
-            wb = load_workbook(processed_path)
-            for sheet_name in ["All Shipments", "All Issues", "PreTransit", "Stalled", "Damaged or Returned"]:
-                if sheet_name not in wb.sheetnames:
-                    continue
-                ws = wb[sheet_name]
-                if ws.max_row < 1:
-                    continue
-                # find TN column by header
-                tn_col_idx = None
-                for col_idx, cell in enumerate(ws[1], start=1):
-                    if (cell.value or "").strip() == "Tracking Number":
-                        tn_col_idx = col_idx
-                        break
-                if tn_col_idx is None:
-                    continue
-                # coerce every TN cell to string and set number format to text
-                for r in range(2, ws.max_row + 1):
-                    c = ws.cell(row=r, column=tn_col_idx)
-                    c.value = _clean_tn_value(c.value)
-                    c.number_format = "@"  # Excel 'Text' format
-            wb.save(processed_path)
-        except Exception:
-            # non-fatal if anything goes sideways here
-            pass
+                # ---- force Excel TEXT type for "Tracking Number" --------------------
+                # Values are already clean strings (see _finalize_view); only the
+                # cell format is set, on the in-memory sheets before the single save.
+                for name in ("All Shipments", "All Issues", "PreTransit", "Stalled", "Damaged or Returned"):
+                    try:
+                        cols = list(views[name].columns)
+                        if "Tracking Number" not in cols or name not in xw.sheets:
+                            continue
+                        tn_col_idx = cols.index("Tracking Number") + 1
+                        for (c,) in xw.sheets[name].iter_rows(
+                                min_row=2, min_col=tn_col_idx, max_col=tn_col_idx):
+                            c.number_format = "@"  # Excel 'Text' format
+                    except Exception:
+                        # non-fatal if anything goes sideways here
+                        pass
 
     def _postprocess_workbook(self, processed_path: Path) -> None:
         try:
@@ -3,16 +3,7 @@ from __future__ import annotations
 import re
 import pandas as pd
 
-# Public indicator column names (used by tests and ColumnContract)
-INDICATOR_COLS: tuple[str, ...] = (
-    "IsPreTransit",
-    "IsDelivered",
-    "HasException",
-    "IsRTS",
-    "IsStalled",
-    "Damaged",
-    "UnableToDeliver",
-)
+from order_shipping_status.io.schema import INDICATOR_COLS  # public; defined once in io.schema
 
 # ---- Helpers -----------------------------------------------------------------
 
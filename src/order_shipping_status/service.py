@@ -0,0 +1,315 @@
+# src/order_shipping_status/service.py
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from .api.cache import CachingClient
+from .pipelines.batch_processor import PrefetchedClient
+from .pipelines.workbook_processor import WorkbookProcessor
+
+MAX_BODY_BYTES = 1 << 20
+MAX_TNS_PER_REQUEST = 500
+# Bulky columns not returned to HTTP callers
+_OMIT_COLUMNS = ("raw",)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 502: "Bad Gateway"}
+
+
+class MicroBatcher:
+    """
+    Pack concurrent single-TN lookups into `fetch_batch` calls of up to
+    `max_batch` TNs.
+
+    A lookup waits at most `window_ms` for company; a full batch is sent
+    immediately. Concurrent lookups for the same TN share one request. The
+    blocking client call runs in the loop's default executor.
+    """
+
+    def __init__(self, client: Any, *, max_batch: int = 30, window_ms: float = 10.0) -> None:
+        self.client = client
+        self.max_batch = max(1, int(max_batch))
+        self.window = max(0.0, float(window_ms)) / 1000.0
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self._carriers: Dict[str, str] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def fetch(self, tracking_number: str, carrier_code: Optional[str] = None) -> dict:
+        tn = str(tracking_number)
+        fut = self._pending.get(tn)
+        if fut is None:
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._pending[tn] = fut
+            self._queue.append(tn)
+            if carrier_code:
+                self._carriers[tn] = carrier_code
+            if len(self._queue) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+        return await asyncio.shield(fut)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+            carriers = {tn: self._carriers.pop(tn)
+                        for tn in batch if tn in self._carriers}
+            asyncio.ensure_future(self._dispatch(batch, carriers))
+
+    async def _dispatch(self, batch: List[str], carriers: Dict[str, str]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                None, lambda: self.client.fetch_batch(batch, carrier_map=carriers) or {})
+            error = None
+        except Exception as ex:
+            results, error = {}, ex
+        for tn in batch:
+            fut = self._pending.pop(tn, None)
+            if fut is None or fut.done():
+                continue
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(results.get(tn, {}))
+
+
+class StatusService:
+    """
+    Tracking-status lookups through the same pipeline as the workbook CLI.
+
+    Payloads are fetched through a TTL cache and a MicroBatcher, then run
+    through `WorkbookProcessor._enrich_prepared` (normalize, indicators,
+    status mapping) and returned as JSON-ready row dicts.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        normalizer: Any,
+        logger: logging.Logger,
+        *,
+        cache_ttl: float = 300.0,
+        max_batch: int = 30,
+        window_ms: float = 10.0,
+        stalled_threshold_days: int = 4,
+    ) -> None:
+        self.logger = logger
+        self.cache = CachingClient(client, ttl_seconds=cache_ttl)
+        self.batcher = MicroBatcher(
+            self.cache, max_batch=max_batch, window_ms=window_ms)
+        self.processor = WorkbookProcessor(
+            logger,
+            normalizer=normalizer,
+            enable_date_filter=False,
+            stalled_threshold_days=stalled_threshold_days,
+        )
+
+    async def lookup(self, items: Sequence[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        payloads = await asyncio.gather(
+            *(self.batcher.fetch(tn, carrier) for tn, carrier in items))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._enrich, list(items), dict(zip((tn for tn, _ in items), payloads)))
+
+    def _enrich(self, items: List[Tuple[str, Optional[str]]], payloads: Dict[str, dict]) -> List[Dict[str, Any]]:
+        df = pd.DataFrame({
+            "Tracking Number": [tn for tn, _ in items],
+            "Carrier Code": [carrier or "" for _, carrier in items],
+        })
+        worker = copy.copy(self.processor)
+        worker.client = PrefetchedClient(payloads)
+        out = worker._enrich_prepared(df)
+        out = out.drop(columns=[c for c in _OMIT_COLUMNS if c in out.columns])
+        return json.loads(out.to_json(orient="records", date_format="iso", default_handler=str))
+
+
+def _parse_items(query: Dict[str, List[str]], body: Any) -> List[Tuple[str, Optional[str]]]:
+    """Accept `?tn=A&tn=B` / `?tn=A,B` or a JSON list of TNs / `{"tn", "carrier"}` objects."""
+    items: List[Tuple[str, Optional[str]]] = []
+    carrier = (query.get("carrier") or [None])[0]
+    for raw in query.get("tn", []):
+        items.extend((tn.strip(), carrier)
+                     for tn in raw.split(",") if tn.strip())
+    if isinstance(body, dict):
+        body = body.get("tracking_numbers", [])
+    if isinstance(body, list):
+        for entry in body:
+            if isinstance(entry, dict):
+                tn = str(entry.get("tn") or entry.get(
+                    "trackingNumber") or "").strip()
+                if tn:
+                    items.append((tn, entry.get("carrier") or carrier))
+            elif entry is not None and str(entry).strip():
+                items.append((str(entry).strip(), carrier))
+    elif body is not None:
+        raise ValueError("body must be a JSON list or {\"tracking_numbers\": [...]}")
+    return items
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode("ascii")
+    writer.write(head + body)
+    await writer.drain()
+
+
+async def handle_connection(service: StatusService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve one request: `GET /status?tn=...`, `POST /status` (JSON body), `GET /healthz`."""
+    try:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) < 2:
+            await _respond(writer, 400, {"error": "malformed request line"})
+            return
+        method, target = parts[0].upper(), parts[1]
+        headers: Dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            k, _, v = line.partition(":")
+            headers[k.strip().lower()] = v.strip()
+
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY_BYTES:
+            await _respond(writer, 413, {"error": "body too large"})
+            return
+        raw_body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        if url.path == "/healthz":
+            await _respond(writer, 200, {"status": "ok"})
+            return
+        if url.path != "/status":
+            await _respond(writer, 404, {"error": f"unknown path {url.path}"})
+            return
+        if method not in ("GET", "POST"):
+            await _respond(writer, 405, {"error": "use GET or POST"})
+            return
+
+        try:
+            body = json.loads(raw_body) if raw_body else None
+            items = _parse_items(parse_qs(url.query), body)
+        except ValueError as ex:
+            await _respond(writer, 400, {"error": str(ex)})
+            return
+        if not items:
+            await _respond(writer, 400, {"error": "no tracking numbers given"})
+            return
+        if len(items) > MAX_TNS_PER_REQUEST:
+            await _respond(writer, 413, {
+                "error": f"at most {MAX_TNS_PER_REQUEST} tracking numbers per request"})
+            return
+
+        try:
+            results = await service.lookup(items)
+        except Exception as ex:
+            service.logger.warning("Lookup failed (%d TNs): %s", len(items), ex)
+            await _respond(writer, 502, {"error": f"carrier lookup failed: {ex}"})
+            return
+        await _respond(writer, 200, {"results": results})
+    except Exception as ex:
+        try:
+            service.logger.exception("Request failed: %s", ex)
+            await _respond(writer, 500, {"error": "internal error"})
+        except Exception:
+            pass
+    finally:
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+
+async def serve(service: StatusService, host: str = "127.0.0.1", port: int = 8080) -> asyncio.base_events.Server:
+    """Start listening; the caller owns the returned server."""
+    return await asyncio.start_server(
+        lambda r, w: handle_connection(service, r, w), host, port)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="order-shipping-status-service",
+        description="Serve tracking status over HTTP: GET /status?tn=... or POST /status with a JSON list.",
+    )
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--replay-dir", type=Path, default=None,
+                   help="Serve payloads from a combined JSON dump instead of the live API.")
+    p.add_argument("--use-api", action="store_true",
+                   help="Use live FedEx API (requires credentials in env).")
+    p.add_argument("--strict-env", action="store_true",
+                   help="Require SHIPPING_CLIENT_ID/SECRET to be present; otherwise exit 2.")
+    p.add_argument("--cache-ttl", type=float, default=300.0,
+                   help="Seconds to reuse a carrier response per tracking number (0 disables). Default: 300")
+    p.add_argument("--batch-window-ms", type=float, default=10.0,
+                   help="How long a lookup waits to share a 30-TN carrier request. Default: 10")
+    p.add_argument("--stalled-threshold-days", type=int, default=4)
+    p.add_argument("--log-level", default="INFO")
+    return p
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .cli import build_client
+    from .config.env import get_app_env
+    from .config.logging_config import get_logger
+
+    args = build_parser().parse_args(argv)
+    logger = get_logger("order_shipping_status", level=args.log_level)
+    try:
+        env_cfg = get_app_env(strict=args.strict_env)
+    except RuntimeError as e:
+        logger.error("Environment error: %s", e)
+        return 2
+
+    client, normalizer = build_client(
+        env_cfg, logger, replay_dir=args.replay_dir, use_api=args.use_api)
+    if client is None:
+        logger.error("No carrier source: pass --replay-dir or --use-api")
+        return 2
+
+    service = StatusService(
+        client,
+        normalizer,
+        logger,
+        cache_ttl=args.cache_ttl,
+        window_ms=args.batch_window_ms,
+        stalled_threshold_days=args.stalled_threshold_days,
+    )
+
+    async def _main() -> None:
+        server = await serve(service, args.host, args.port)
+        logger.info("Serving on http://%s:%d", args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        logger.info("Service stopped.")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
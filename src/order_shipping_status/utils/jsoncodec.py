@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from typing import Any, Callable, Optional, Union
+
+# Preference order; the first importable backend wins unless
+# OSS_JSON_BACKEND (orjson | ujson | stdlib) says otherwise.
+BACKENDS = ("orjson", "ujson", "stdlib")
+ENV_VAR = "OSS_JSON_BACKEND"
+
+_name = "stdlib"
+_loads_impl: Callable[[Union[str, bytes]], Any] = json.loads
+_dumps_impl: Callable[..., bytes]
+
+
+def _stdlib_dumps(obj: Any, indent: Optional[int], default: Optional[Callable[[Any], Any]]) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, indent=indent, default=default).encode("utf-8")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """True if `obj` holds a NaN/Infinity float anywhere in its dicts/lists."""
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, float):
+            if not math.isfinite(o):
+                return True
+        elif isinstance(o, dict):
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple)):
+            stack.extend(o)
+    return False
+
+
+def _bind(name: str) -> bool:
+    global _name, _loads_impl, _dumps_impl
+    if name == "stdlib":
+        _name, _loads_impl, _dumps_impl = "stdlib", json.loads, _stdlib_dumps
+        return True
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return False
+
+        # datetimes/dataclasses go through `default` (or raise) as with stdlib
+        base_opts = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                     | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+        def _dumps(obj: Any, indent: Optional[int], default: Optional[Callable[[Any], Any]]) -> bytes:
+            def _default(o: Any) -> Any:
+                if isinstance(o, float):
+                    return float(o)  # float subclasses (numpy.float64) stay numbers
+                if default is None:
+                    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+                return default(o)
+
+            opts = base_opts | orjson.OPT_INDENT_2 if indent else base_opts
+            try:
+                out = orjson.dumps(obj, default=_default, option=opts)
+            except (TypeError, orjson.JSONEncodeError):
+                # e.g. ints beyond 64 bits: keep stdlib semantics
+                return _stdlib_dumps(obj, indent, default)
+            if b"null" in out and _has_non_finite(obj):
+                # orjson writes NaN/Infinity as null; stdlib keeps the literals
+                return _stdlib_dumps(obj, indent, default)
+            return out
+
+        def _loads(data: Union[str, bytes]) -> Any:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # stdlib also accepts NaN/Infinity literals; raise its error otherwise
+                return json.loads(data)
+
+        _name, _loads_impl, _dumps_impl = "orjson", _loads, _dumps
+        return True
+    if name == "ujson":
+        try:
+            import ujson
+        except ImportError:
+            return False
+
+        def _dumps(obj: Any, indent: Optional[int], default: Optional[Callable[[Any], Any]]) -> bytes:
+            try:
+                kwargs = {"default": default} if default is not None else {}
+                return ujson.dumps(obj, ensure_ascii=False, indent=indent or 0,
+                                   escape_forward_slashes=False, **kwargs).encode("utf-8")
+            except (TypeError, OverflowError):
+                return _stdlib_dumps(obj, indent, default)
+
+        def _loads(data: Union[str, bytes]) -> Any:
+            try:
+                return ujson.loads(data)
+            except ValueError:
+                return json.loads(data)
+
+        _name, _loads_impl, _dumps_impl = "ujson", _loads, _dumps
+        return True
+    raise ValueError(f"Unknown JSON backend {name!r}; expected one of {BACKENDS}")
+
+
+def use_backend(name: Optional[str] = None) -> str:
+    """
+    Select the JSON backend (None = env override, else fastest available).
+    Returns the name actually bound; an unavailable explicit choice falls
+    back down the preference list.
+    """
+    choice = name
+    if choice is None:
+        env = (os.environ.get(ENV_VAR) or "").strip().lower()
+        choice = env if env in BACKENDS else None  # ignore typos in the env
+    order = BACKENDS if choice is None else (choice,) + BACKENDS
+    for candidate in order:
+        if _bind(candidate):
+            break
+    return _name
+
+
+def backend() -> str:
+    return _name
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Parse JSON from str or UTF-8 bytes."""
+    if isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    return _loads_impl(data)
+
+
+def dumps_bytes(obj: Any, *, indent: Optional[int] = None, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize to UTF-8 bytes (non-ASCII kept as-is; `indent` is 2 spaces when set)."""
+    return _dumps_impl(obj, indent, default)
+
+
+def dumps(obj: Any, *, indent: Optional[int] = None, default: Optional[Callable[[Any], Any]] = None) -> str:
+    return _dumps_impl(obj, indent, default).decode("utf-8")
+
+
+use_backend()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Protocol, Sequence, Tuple, Union
+
+
+class MetricsSink(Protocol):
+    """Minimal interface used by the API layer to report counters/histograms."""
+
+    def inc(self, name: str, value: float = 1.0) -> None:
+        ...
+
+    def observe(self, name: str, value: float) -> None:
+        ...
+
+
+class NullMetrics:
+    """Default sink: accepts everything, records nothing."""
+
+    def inc(self, name: str, value: float = 1.0) -> None:
+        pass
+
+    def observe(self, name: str, value: float) -> None:
+        pass
+
+
+# Histogram buckets for the metrics emitted by FedExClient / FedexHelper.
+# Names not listed here fall back to _GENERIC_BUCKETS.
+DEFAULT_BUCKETS: Dict[str, Tuple[float, ...]] = {
+    "fedex_request_seconds": (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    "fedex_response_bytes": (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000),
+    "fedex_chunk_size": (1, 5, 10, 20, 30),
+}
+_GENERIC_BUCKETS: Tuple[float, ...] = (
+    0.01, 0.1, 1.0, 10.0, 100.0, 1_000.0, 10_000.0)
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * len(self.bounds)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        for i, b in enumerate(self.bounds):
+            if value <= b:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> list[Tuple[str, int]]:
+        out: list[Tuple[str, int]] = []
+        running = 0
+        for b, c in zip(self.bounds, self.counts):
+            running += c
+            out.append((_fmt_num(b), running))
+        out.append(("+Inf", self.count))
+        return out
+
+
+def _fmt_num(v: float) -> str:
+    if isinstance(v, float) and v.is_integer() and not math.isinf(v):
+        return str(int(v))
+    return repr(v) if isinstance(v, float) else str(v)
+
+
+class RunMetrics:
+    """Thread-safe in-memory counters and histograms for a single run.
+
+    Call `write(path)` at the end of the run: a `.json` suffix produces a JSON
+    document, anything else produces a Prometheus textfile (suitable for the
+    node exporter textfile collector). Writes are atomic (tmp file + rename).
+    """
+
+    def __init__(
+        self,
+        *,
+        prefix: str = "oss_",
+        buckets: Optional[Dict[str, Sequence[float]]] = None,
+    ) -> None:
+        self.prefix = prefix
+        self._buckets: Dict[str, Tuple[float, ...]] = dict(DEFAULT_BUCKETS)
+        if buckets:
+            self._buckets.update({k: tuple(v) for k, v in buckets.items()})
+        self._counters: Dict[str, float] = {}
+        self._histograms: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0.0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            h = self._histograms.get(name)
+            if h is None:
+                h = _Histogram(self._buckets.get(name, _GENERIC_BUCKETS))
+                self._histograms[name] = h
+            h.observe(float(value))
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0.0)
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable view of all recorded metrics."""
+        with self._lock:
+            return {
+                "counters": {self.prefix + k: v for k, v in sorted(self._counters.items())},
+                "histograms": {
+                    self.prefix + k: {
+                        "buckets": dict(h.cumulative()),
+                        "sum": h.total,
+                        "count": h.count,
+                    }
+                    for k, h in sorted(self._histograms.items())
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for k, v in sorted(self._counters.items()):
+                name = self.prefix + k
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {_fmt_num(v)}")
+            for k, h in sorted(self._histograms.items()):
+                name = self.prefix + k
+                lines.append(f"# TYPE {name} histogram")
+                for le, c in h.cumulative():
+                    lines.append(f'{name}_bucket{{le="{le}"}} {c}')
+                lines.append(f"{name}_sum {_fmt_num(h.total)}")
+                lines.append(f"{name}_count {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Union[str, Path]) -> Path:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        if p.suffix.lower() == ".json":
+            text = json.dumps(self.snapshot(), indent=2)
+        else:
+            text = self.to_prometheus()
+        tmp = p.with_name(f".{p.name}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, p)
+        return p
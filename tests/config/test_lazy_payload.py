@@ -0,0 +1,77 @@
+import logging
+
+from order_shipping_status.api.fedex import FedExAuth, FedExClient, FedExConfig
+from order_shipping_status.config.logging_config import BodyLogSampler, LazyPayload
+from order_shipping_status.utils import jsoncodec
+
+
+class Exploding:
+    """Fails loudly if anyone tries to serialize it."""
+
+    def __str__(self):
+        raise AssertionError("payload rendered")
+
+
+def test_lazy_payload_renders_and_truncates_on_demand():
+    lp = LazyPayload({"a": "x" * 50}, limit=10)
+    assert str(lp) == jsoncodec.dumps({"a": "x" * 50})[:10] + "..."
+    assert str(LazyPayload({"t": "é", "w": float("nan")})) == jsoncodec.dumps({"t": "é", "w": float("nan")})
+    assert str(LazyPayload("plain text")) == "plain text"
+
+
+def test_lazy_payload_not_rendered_when_level_disabled(caplog):
+    logger = logging.getLogger("oss.lazy.off")
+    logger.setLevel(logging.INFO)
+    with caplog.at_level(logging.INFO, logger="oss.lazy.off"):
+        logger.debug("body=%s", LazyPayload(Exploding()))
+    assert caplog.records == []
+
+
+def test_body_log_sampler_every_and_limit():
+    s = BodyLogSampler(every=2, limit=2)
+    assert [s.allow() for _ in range(7)] == [
+        True, False, True, False, False, False, False]
+
+
+class _Resp:
+    status_code = 200
+    content = b"{}"
+    text = "{}"
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"output": {}}
+
+
+class _Transport:
+    def post(self, url, **kw):
+        return _Resp()
+
+
+def test_post_tracking_skips_body_rendering_at_info(caplog):
+    logger = logging.getLogger("oss.lazy.client")
+    logger.setLevel(logging.INFO)
+    auth = FedExAuth(client_id="i", client_secret="s", token_url="t")
+    client = FedExClient(auth, FedExConfig(base_url="https://x/track"),
+                         transport=_Transport(), logger=logger)
+    with caplog.at_level(logging.INFO, logger="oss.lazy.client"):
+        out = client.post_tracking({"trackingInfo": [Exploding()]},
+                                   access_token="tok")
+    assert out == {"output": {}}
+
+
+def test_post_tracking_logs_sampled_bodies_at_debug(caplog):
+    logger = logging.getLogger("oss.lazy.debug")
+    logger.setLevel(logging.DEBUG)
+    auth = FedExAuth(client_id="i", client_secret="s", token_url="t")
+    client = FedExClient(auth, FedExConfig(base_url="https://x/track"),
+                         transport=_Transport(), logger=logger,
+                         body_sampler=BodyLogSampler(limit=1))
+    with caplog.at_level(logging.DEBUG, logger="oss.lazy.debug"):
+        client.post_tracking({"trackingInfo": []}, access_token="tok")
+        client.post_tracking({"trackingInfo": []}, access_token="tok")
+    bodies = [r.getMessage() for r in caplog.records if "_body=" in r.getMessage()]
+    assert len(bodies) == 2  # request + response of the first call only
+    assert "response_body=" + jsoncodec.dumps({"output": {}}) in bodies[1]
@@ -90,3 +90,34 @@ def test_multiple_calls_different_targets_do_not_duplicate(tmp_path):
     assert lg1 is lg2
     # Expect 2: console + file
     assert len(lg2.handlers) == 2
+
+
+def test_get_logger_queue_mode_writes_via_background_listener(tmp_path):
+    from logging.handlers import QueueHandler
+    from order_shipping_status.config.logging_config import stop_queue_logging
+
+    name = "oss.queue"
+    lg = logging.getLogger(name)
+    for h in list(lg.handlers):
+        lg.removeHandler(h)
+
+    log_file = tmp_path / "q.log"
+    logger = get_logger(name, level="INFO", log_file=log_file,
+                        console=False, use_queue=True)
+    # Repeat calls must not add a second queue or file handler
+    get_logger(name, level="INFO", log_file=log_file,
+               console=False, use_queue=True)
+
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], QueueHandler)
+
+    for i in range(100):
+        logger.info("queued %d", i)
+    stop_queue_logging(name)
+
+    text = log_file.read_text(encoding="utf-8")
+    assert "queued 0" in text and "queued 99" in text
+    # After stopping, the file handler is attached directly again
+    assert [type(h).__name__ for h in logger.handlers] == ["RotatingFileHandler"]
+    logger.info("after stop")
+    assert "after stop" in log_file.read_text(encoding="utf-8")
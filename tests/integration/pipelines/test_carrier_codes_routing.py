@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+from order_shipping_status.pipelines.carrier_registry import fedex_registry
+
+
+def _carrier_codes(path: Path) -> set[str]:
+    ws = load_workbook(path, read_only=True).active
+    header = next(ws.iter_rows(max_row=1, values_only=True))
+    col = header.index("Carrier Code") + 1
+    return {str(v).strip() for (v,) in ws.iter_rows(
+        min_row=2, min_col=col, max_col=col, values_only=True) if v is not None}
+
+
+def test_fedex_registry_claims_every_code_the_baseline_enriched():
+    # The 10-13 capture carries every code seen across the sample workbooks
+    repo_root = Path(__file__).resolve().parents[3]
+    codes = _carrier_codes(repo_root / "tests" / "data" / "RAW_TransitIssues_10-13-2025.xlsx")
+    assert {"FDXG", "AMZ", "FESZ", "F2DZ", "FPOZ", "FPSZ"} <= codes
+
+    reg = fedex_registry(lambda payload, **_: payload)
+    # LTL freight is the only code whose TNs are not FedEx TNs
+    assert {c for c in codes if reg.handler_for(c) != "fedex"} == {"LTL"}
@@ -0,0 +1,113 @@
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from order_shipping_status.io import columnar
+from order_shipping_status.io.paths import derive_enriched_path
+from order_shipping_status.pipelines.workbook_processor import WorkbookProcessor
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+class Logger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, msg, *args, **_):
+        self.warnings.append(msg % args)
+
+    def __getattr__(self, _):
+        return lambda *a, **k: None
+
+
+class Client:
+    def fetch_batch(self, tns, carrier_map=None):
+        return {
+            "T1": {"code": "DL", "derivedCode": "DL", "statusByLocale": "Delivered",
+                   "LatestEventTimestampUtc": "2025-10-01T12:30:00Z",
+                   "scanEvents": [{"date": f"2025-10-01T{h}:30:00Z"} for h in (10, 11, 12)]},
+            "T2": {"code": "IT", "derivedCode": "IT", "statusByLocale": "In transit",
+                   "LatestEventTimestampUtc": "2025-10-03T08:00:00Z"},
+        }
+
+
+def _normalizer(payload, *, tracking_number, **_):
+    return payload
+
+
+def _write_input(path: Path):
+    pd.DataFrame({
+        "Order": [1, 2],
+        "Tracking Number": ["T1", "T2"],
+        "Carrier Code": ["FDX", "FDX"],
+    }).to_excel(path, index=False)
+
+
+def test_derive_enriched_path():
+    assert derive_enriched_path(Path("/x/in_processed.xlsx")).name == "in_enriched.parquet"
+    assert derive_enriched_path(Path("/x/in_processed.xlsx"), "arrow").name == "in_enriched.arrow"
+
+
+def test_unknown_suffix_is_rejected():
+    with pytest.raises(ValueError):
+        columnar.columnar_format("frame.csv")
+
+
+@pytest.mark.skipif(HAS_PYARROW, reason="pyarrow is installed")
+def test_missing_pyarrow_is_reported_and_workbook_still_written(tmp_path: Path):
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        columnar.write_enriched(pd.DataFrame({"a": [1]}), tmp_path / "x.parquet")
+
+    src = tmp_path / "in.xlsx"
+    _write_input(src)
+    logger = Logger()
+    proc = WorkbookProcessor(logger, client=Client(), normalizer=_normalizer,
+                             enable_date_filter=False, enriched_format="parquet")
+    result = proc.process(src, tmp_path / "in_processed.xlsx", SimpleNamespace())
+
+    assert (tmp_path / "in_processed.xlsx").exists()
+    assert "enriched_path" not in result
+    assert any("pyarrow" in w for w in logger.warnings)
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_enriched_round_trip_regenerates_views(tmp_path: Path, fmt):
+    pa = pytest.importorskip("pyarrow")
+
+    src = tmp_path / "in.xlsx"
+    _write_input(src)
+    proc = WorkbookProcessor(Logger(), client=Client(), normalizer=_normalizer,
+                             enable_date_filter=False, enriched_format=fmt)
+    result = proc.process(src, tmp_path / "in_processed.xlsx", SimpleNamespace())
+    enriched = Path(result["enriched_path"])
+    assert enriched.name == f"in_enriched.{fmt}"
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(enriched)
+    else:
+        with pa.memory_map(str(enriched), "r") as source:
+            schema = pa.ipc.open_file(source).schema
+    assert schema.field("IsDelivered").type == pa.int8()
+    assert schema.field("CalculatedStatus").type in (pa.string(), pa.large_string())
+    assert pa.types.is_timestamp(schema.field("LatestEventTimestampUtc").type)
+    assert schema.field("ScanEventsCount").type == pa.int64()
+
+    df = columnar.read_enriched(enriched)
+    assert df["IsDelivered"].dtype == "int64"
+    assert df["IsDelivered"].tolist() == [1, 0]
+    assert df["ScanEventsCount"].dtype == "Int64"
+    assert df["ScanEventsCount"].tolist() == [3, 0]
+    assert df["LatestEventTimestampUtc"].tolist() == [
+        "2025-10-01T12:30:00Z", "2025-10-03T08:00:00Z"]
+
+    rebuilt = tmp_path / "rebuilt_processed.xlsx"
+    WorkbookProcessor(Logger()).process_enriched(src, enriched, rebuilt, SimpleNamespace())
+    for sheet in ("All Shipments", "All Issues", "PreTransit", "Stalled", "Damaged or Returned"):
+        a = pd.read_excel(tmp_path / "in_processed.xlsx", sheet_name=sheet)
+        b = pd.read_excel(rebuilt, sheet_name=sheet)
+        pd.testing.assert_frame_equal(a, b, check_dtype=False)
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from order_shipping_status.api.fedex_helper import FedexHelper
+from order_shipping_status.io.journal import ChunkJournal
+
+
+class CountingClient:
+    def __init__(self, fail_after=None, missing=()):
+        self.posts = []
+        self.fail_after = fail_after
+        self.missing = set(missing)
+
+    def authenticate(self):
+        return "tok"
+
+    def post_tracking(self, body, access_token=None):
+        if self.fail_after is not None and len(self.posts) >= self.fail_after:
+            raise RuntimeError("process died")
+        tns = [i["trackingNumberInfo"]["trackingNumber"]
+               for i in body["trackingInfo"]]
+        self.posts.append(tns)
+        return {"output": {"completeTrackResults": [
+            {"trackingNumber": tn, "trackResults": [{"ok": tn}]}
+            for tn in tns if tn not in self.missing]}}
+
+
+def test_resume_skips_journaled_chunks(tmp_path: Path):
+    path = tmp_path / "in-journal.jsonl"
+    tns = [f"T{i}" for i in range(75)]
+
+    # First run dies after two of three chunks
+    j1 = ChunkJournal(path, "sha-a")
+    try:
+        FedexHelper(CountingClient(fail_after=2), journal=j1).fetch_batch(tns)
+    except RuntimeError:
+        pass
+    j1.close()
+
+    client = CountingClient()
+    j2 = ChunkJournal(path, "sha-a", resume=True)
+    out = FedexHelper(client, journal=j2).fetch_batch(tns)
+
+    assert client.posts == [tns[60:]]
+    assert len(out) == 75 and all(out[tn] for tn in tns)
+    assert len(j2) == 75
+    j2.close(remove=True)
+    assert not path.exists()
+
+
+def test_resume_refetches_tns_that_came_back_empty(tmp_path: Path):
+    path = tmp_path / "in-journal.jsonl"
+    tns = [f"T{i}" for i in range(5)]
+
+    # The response omits T2, so its payload is empty and must not be journaled
+    j1 = ChunkJournal(path, "sha-a")
+    out = FedexHelper(CountingClient(missing={"T2"}), journal=j1).fetch_batch(tns)
+    j1.close()
+    assert out["T2"] == {}
+
+    client = CountingClient()
+    j2 = ChunkJournal(path, "sha-a", resume=True)
+    out = FedexHelper(client, journal=j2).fetch_batch(tns)
+
+    assert client.posts == [["T2"]]
+    assert all(out[tn] for tn in tns)
+    j2.close(remove=True)
+
+
+def test_journal_for_other_input_or_without_resume_starts_over(tmp_path: Path):
+    path = tmp_path / "j.jsonl"
+    j = ChunkJournal(path, "sha-a")
+    j.record({"A": {"x": 1}})
+    j.close()
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write('{"type": "chunk", "results": {"B"')  # torn write
+
+    assert len(ChunkJournal(path, "sha-a", resume=True)) == 1
+    assert len(ChunkJournal(path, "sha-b", resume=True)) == 0
+    assert len(ChunkJournal(path, "sha-b", resume=True)) == 0  # rewritten for sha-b
+    assert len(ChunkJournal(path, "sha-a")) == 0
@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from order_shipping_status.io.sidecar import (
+    DirectorySidecarSink,
+    JsonlSidecarSink,
+    main as sidecar_main,
+    read_sidecar,
+)
+from order_shipping_status.pipelines.enricher import Enricher
+
+
+def test_jsonl_sink_writes_single_file_with_index(tmp_path: Path):
+    with JsonlSidecarSink(tmp_path) as sink:
+        for i in range(500):
+            sink.write("FDX", f"TN{i}", {"code": "DL", "i": i})
+        sink.write("FDX", "TN7", {"code": "OC", "i": 7})  # later write wins
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "sidecars.index.json", "sidecars.jsonl"]
+    lines = (tmp_path / "sidecars.jsonl").read_text().splitlines()
+    assert len(lines) == 501
+
+    assert read_sidecar(tmp_path, "TN42", "FDX") == {"code": "DL", "i": 42}
+    assert read_sidecar(tmp_path, "TN7") == {"code": "OC", "i": 7}
+    assert read_sidecar(tmp_path, "missing") is None
+
+
+def test_read_sidecar_falls_back_to_per_file_layout(tmp_path: Path):
+    DirectorySidecarSink(tmp_path).write("FDX", "123", {"code": "DL"})
+    assert read_sidecar(tmp_path, "123", "FDX") == {"code": "DL"}
+    assert read_sidecar(tmp_path, "123") == {"code": "DL"}
+
+
+def test_read_sidecar_without_carrier_matches_the_whole_tn(tmp_path: Path):
+    with JsonlSidecarSink(tmp_path / "jsonl") as sink:
+        sink.write("FDX", "A_1", {"code": "DL"})
+    DirectorySidecarSink(tmp_path / "files").write("FDX", "A_1", {"code": "DL"})
+
+    for d in (tmp_path / "jsonl", tmp_path / "files"):
+        assert read_sidecar(d, "1") is None
+        assert read_sidecar(d, "A_1") == {"code": "DL"}
+
+
+def test_enricher_writes_to_supplied_sink(tmp_path: Path, capsys):
+    class FakeClient:
+        def fetch_status(self, tn, carrier=None):
+            return {"code": "DL", "statusByLocale": "Delivered"}
+
+    df = pd.DataFrame([{"Tracking Number": "A1", "Carrier Code": "FDX"},
+                       {"Tracking Number": "B2", "Carrier Code": "FDX"}])
+    with JsonlSidecarSink(tmp_path) as sink:
+        Enricher(None, client=FakeClient(), normalizer=lambda p, **_: p).enrich(
+            df, sidecar_sink=sink)
+
+    assert read_sidecar(tmp_path, "B2", "FDX")["code"] == "DL"
+
+    assert sidecar_main([str(tmp_path), "A1"]) == 0
+    assert json.loads(capsys.readouterr().out)["statusByLocale"] == "Delivered"
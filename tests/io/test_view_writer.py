@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from order_shipping_status.io.view_writer import view_file_name, write_views
+from order_shipping_status.pipelines.workbook_processor import WorkbookProcessor
+
+
+class Logger:
+    def __getattr__(self, _):
+        return lambda *a, **k: None
+
+
+class Client:
+    def fetch_batch(self, tns, carrier_map=None):
+        return {
+            "123456789012": {"code": "DL", "derivedCode": "DL", "statusByLocale": "Delivered"},
+            "T2": {"code": "IT", "derivedCode": "IT", "statusByLocale": "In transit"},
+        }
+
+
+def _normalizer(payload, *, tracking_number, **_):
+    return payload
+
+
+def test_view_file_name_slugs():
+    assert view_file_name("Damaged or Returned", "csv") == "damaged_or_returned.csv"
+    assert view_file_name("All Issues", "jsonl") == "all_issues.jsonl"
+
+
+def test_write_views_streams_every_view(tmp_path: Path):
+    big = pd.DataFrame({"Tracking Number": [str(i) for i in range(5000)], "v": [None] * 5000})
+    out = write_views({"All Issues": big, "Marker": pd.DataFrame([{"_oss_marker": "ok"}])},
+                      tmp_path / "views", "jsonl")
+    lines = out["All Issues"].read_text().splitlines()
+    assert len(lines) == 5000
+    assert json.loads(lines[-1]) == {"Tracking Number": "4999", "v": None}
+    assert not list((tmp_path / "views").glob(".*.tmp"))
+    with pytest.raises(ValueError):
+        write_views({}, tmp_path, "xml")
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_processor_writes_views_instead_of_workbook(tmp_path: Path, fmt):
+    src = tmp_path / "in.xlsx"
+    pd.DataFrame({
+        "Order": [1, 2],
+        "Tracking Number": [123456789012.0, "T2"],
+        "Carrier Code": ["FDX", "FDX"],
+    }).to_excel(src, index=False)
+
+    proc = WorkbookProcessor(Logger(), client=Client(), normalizer=_normalizer,
+                             enable_date_filter=False, output_format=fmt)
+    res = proc.process(src, tmp_path / "in_processed.xlsx", SimpleNamespace())
+
+    views_dir = tmp_path / "in_views"
+    assert res["output_path"] == str(views_dir)
+    assert not (tmp_path / "in_processed.xlsx").exists()
+    assert sorted(p.name for p in views_dir.iterdir()) == sorted(
+        f"{n}.{fmt}" for n in ("all_shipments", "all_issues", "pretransit",
+                               "stalled", "damaged_or_returned", "marker"))
+
+    path = views_dir / f"all_shipments.{fmt}"
+    if fmt == "csv":
+        shipments = pd.read_csv(path, dtype=str)
+    else:
+        shipments = pd.read_json(path, lines=True, dtype=False)
+    assert shipments["Tracking Number"].tolist() == ["123456789012", "T2"]
+
+    path = views_dir / f"all_issues.{fmt}"
+    issues = pd.read_csv(path, dtype=str) if fmt == "csv" else pd.read_json(path, lines=True, dtype=False)
+    assert issues["Tracking Number"].tolist() == ["T2"]
+    assert list(issues.columns).index("UnableToDeliver") == list(issues.columns).index("Damaged") + 1
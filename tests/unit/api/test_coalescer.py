@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from order_shipping_status.api.coalescer import CoalescingClient
+from order_shipping_status.pipelines.enricher import Enricher
+
+
+class Logger:
+    def __getattr__(self, _):
+        return lambda *a, **k: None
+
+
+class BatchOnly:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def fetch_batch(self, tns, carrier_map=None):
+        with self.lock:
+            self.calls.append((list(tns), dict(carrier_map or {})))
+        return {tn: {"tn": tn} for tn in tns}
+
+
+def test_concurrent_fetch_status_calls_share_batches():
+    inner = BatchOnly()
+    with CoalescingClient(inner, window_ms=200) as client:
+        tns = [f"T{i}" for i in range(45)]
+        with ThreadPoolExecutor(max_workers=45) as pool:
+            results = list(pool.map(client.fetch_status, tns))
+
+    assert results == [{"tn": tn} for tn in tns]
+    sizes = [len(c[0]) for c in inner.calls]
+    assert sum(sizes) == 45 and max(sizes) <= 30 and len(sizes) <= 3
+
+
+def test_errors_propagate_to_every_waiting_future():
+    class Boom:
+        def fetch_batch(self, tns, carrier_map=None):
+            raise RuntimeError("down")
+
+    with CoalescingClient(Boom(), window_ms=1) as client:
+        futs = [client.submit("A"), client.submit("B"), client.submit("A")]
+        assert futs[0] is futs[2]
+        for f in futs:
+            assert isinstance(f.exception(timeout=5), RuntimeError)
+
+
+def test_enricher_fallback_submits_all_tns_before_waiting():
+    inner = BatchOnly()
+
+    class FlakyBatch(CoalescingClient):
+        def fetch_batch(self, tracking_numbers, carrier_map=None):
+            raise RuntimeError("batch endpoint failed")
+
+    df = pd.DataFrame({"Tracking Number": ["A", "B", "A", "C"],
+                       "Carrier Code": ["FDX", "FDX", "FDX", None]})
+    with FlakyBatch(inner, window_ms=20) as client:
+        out = Enricher(Logger(), client=client,
+                       normalizer=lambda p, **_: dict(p)).enrich(df)
+
+    assert out["tn"].tolist() == ["A", "B", "A", "C"]
+    assert len(inner.calls) == 1
+    assert inner.calls[0] == (["A", "B", "C"], {"A": "FDX", "B": "FDX"})
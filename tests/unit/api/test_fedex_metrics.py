@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from order_shipping_status.api.fedex import FedExAuth, FedExClient, FedExConfig
+from order_shipping_status.api.fedex_helper import FedexHelper
+from order_shipping_status.api.simulator import FedExSimulator, SimulatorConfig
+from order_shipping_status.api.transport import RequestsTransport
+from order_shipping_status.utils.metrics import RunMetrics
+
+
+class FakeResp:
+    def __init__(self, status_code, payload, retries=()):
+        self.status_code = status_code
+        self._payload = payload
+        self.content = json.dumps(payload).encode("utf-8")
+        self.text = self.content.decode("utf-8")
+        self.raw = SimpleNamespace(retries=SimpleNamespace(history=retries))
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self._payload
+
+
+class FakeTransport:
+    def __init__(self, track_resp):
+        self.track_resp = track_resp
+
+    def post(self, url, *, headers=None, data=None, json=None, params=None):
+        if "oauth" in url:
+            return FakeResp(200, {"access_token": "tok", "expires_in": 3600})
+        return self.track_resp
+
+
+def _client(transport, metrics):
+    auth = FedExAuth(client_id="id", client_secret="secret",
+                     token_url="https://example/oauth/token")
+    return FedExClient(auth, FedExConfig(base_url="https://example/track"),
+                       transport=transport, metrics=metrics)
+
+
+def test_client_records_latency_size_retries_and_429s():
+    body = {"output": {"completeTrackResults": [
+        {"trackingNumber": "TN1", "trackResults": []}]}}
+    retries = (SimpleNamespace(status=429), SimpleNamespace(status=503))
+    m = RunMetrics()
+    client = _client(FakeTransport(FakeResp(200, body, retries)), m)
+
+    assert client.post_tracking({"trackingInfo": []}) == body
+
+    snap = m.snapshot()
+    assert snap["counters"]["oss_fedex_requests_total"] == 1
+    assert snap["counters"]["oss_fedex_retries_total"] == 2
+    assert snap["counters"]["oss_fedex_http_429_total"] == 1
+    assert snap["counters"]["oss_fedex_token_refreshes_total"] == 1
+    assert snap["histograms"]["oss_fedex_request_seconds"]["count"] == 1
+    assert snap["histograms"]["oss_fedex_response_bytes"]["sum"] == len(
+        json.dumps(body))
+
+
+def test_client_records_retries_and_429s_when_retries_run_out():
+    m = RunMetrics()
+    with FedExSimulator(SimulatorConfig(rate_429=1.0, retry_after=0)) as sim:
+        client = FedExClient(
+            FedExAuth("id", "secret", sim.token_url), FedExConfig(sim.base_url),
+            transport=RequestsTransport(max_retries=3, backoff_factor=0), metrics=m)
+        assert client.post_tracking(
+            {"trackingInfo": [{"trackingNumberInfo": {"trackingNumber": "T1"}}]}) == {}
+        injected = sim.stats()["injected_429"]
+
+    assert injected == 4
+    assert m.counter("fedex_requests_total") == 1
+    assert m.counter("fedex_retries_total") == 3
+    assert m.counter("fedex_http_429_total") == 4
+    assert m.counter("fedex_request_errors_total") == 1
+    assert m.snapshot()["histograms"]["oss_fedex_request_seconds"]["count"] == 1
+
+
+def test_helper_records_chunks_empty_results_and_fallbacks():
+    # A body without completeTrackResults cannot be mapped per TN
+    m = RunMetrics()
+    client = _client(FakeTransport(FakeResp(200, {"errors": ["x"]})), m)
+    helper = FedexHelper(client, metrics=m)
+
+    tns = [f"TN{i}" for i in range(31)]
+    out = helper.fetch_batch(tns)
+
+    assert set(out) == set(tns)
+    snap = m.snapshot()
+    assert snap["histograms"]["oss_fedex_chunk_size"]["count"] == 2
+    assert snap["histograms"]["oss_fedex_chunk_size"]["sum"] == 31
+    # The 30-TN chunk cannot be scoped (empty results); the 1-TN chunk can
+    assert snap["counters"]["oss_fedex_empty_results_total"] == 30
+    assert snap["counters"]["oss_fedex_whole_body_fallbacks_total"] == 1
+
+
+def test_run_metrics_writes_prometheus_textfile_and_json(tmp_path: Path):
+    m = RunMetrics()
+    m.inc("fedex_requests_total", 3)
+    m.observe("fedex_chunk_size", 30)
+    m.observe("fedex_chunk_size", 5)
+
+    prom = m.write(tmp_path / "oss.prom").read_text(encoding="utf-8")
+    assert "# TYPE oss_fedex_requests_total counter" in prom
+    assert "oss_fedex_requests_total 3" in prom
+    assert 'oss_fedex_chunk_size_bucket{le="5"} 1' in prom
+    assert 'oss_fedex_chunk_size_bucket{le="+Inf"} 2' in prom
+    assert "oss_fedex_chunk_size_count 2" in prom
+
+    data = json.loads(m.write(tmp_path / "oss.json").read_text())
+    assert data["counters"]["oss_fedex_requests_total"] == 3
+    assert data["histograms"]["oss_fedex_chunk_size"]["sum"] == 35
@@ -0,0 +1,127 @@
+from pathlib import Path
+
+from order_shipping_status.api.fedex_helper import FedexHelper
+from order_shipping_status.io.retry_queue import RetryQueue
+from order_shipping_status.utils.metrics import RunMetrics
+
+
+class PoisonClient:
+    """Fails any POST containing a poison TN, like a 400 for the whole chunk."""
+
+    def __init__(self, poison=(), down=False):
+        self.poison = set(poison)
+        self.down = down
+        self.posts = []
+
+    def authenticate(self):
+        return "tok"
+
+    def post_tracking(self, body, access_token=None):
+        tns = [i["trackingNumberInfo"]["trackingNumber"]
+               for i in body["trackingInfo"]]
+        self.posts.append(tns)
+        if self.down or self.poison.intersection(tns):
+            return {}
+        return {"output": {"completeTrackResults": [
+            {"trackingNumber": tn, "trackResults": [{"ok": tn}]} for tn in tns]}}
+
+
+class StatusPoisonClient(PoisonClient):
+    """Like FedExClient: reports 400 for a poison chunk and 503 while down."""
+
+    def post_tracking_with_status(self, body, access_token=None):
+        j = self.post_tracking(body, access_token)
+        return j, (503 if self.down else 400 if not j else 200)
+
+
+def test_bisection_isolates_poison_tn_and_keeps_the_rest(tmp_path: Path):
+    client = PoisonClient(poison={"T7"})
+    queue = RetryQueue(tmp_path / "q.json")
+    m = RunMetrics()
+    helper = FedexHelper(client, bisect_failures=True,
+                         retry_queue=queue, metrics=m)
+
+    tns = [f"T{i}" for i in range(8)]
+    out = helper.fetch_batch(tns, carrier_map={"T7": "FDX"})
+
+    assert out["T7"] == {}
+    assert all(out[tn] for tn in tns if tn != "T7")
+    assert helper.failed_tns == {"T7": "FDX"}
+    # 1 full chunk + 3 levels of halves
+    assert len(client.posts) == 1 + 2 * 3
+    assert queue.tracking_numbers() == ["T7"]
+    assert queue.carrier_map() == {"T7": "FDX"}
+    assert m.counter("fedex_failed_tns_total") == 1
+
+
+def test_poison_tns_in_both_halves_are_isolated(tmp_path: Path):
+    client = StatusPoisonClient(poison={"T3", "T20"})
+    queue = RetryQueue(tmp_path / "q.json")
+    helper = FedexHelper(client, bisect_failures=True, retry_queue=queue)
+
+    tns = [f"T{i}" for i in range(30)]
+    out = helper.fetch_batch(tns)
+
+    assert sum(1 for tn in tns if out[tn]) == 28
+    assert sorted(helper.failed_tns) == ["T20", "T3"]
+    assert sorted(queue.tracking_numbers()) == ["T20", "T3"]
+    assert len(client.posts) <= 1 + 60
+
+
+def test_bisect_budget_caps_requests_and_queues_the_rest(tmp_path: Path):
+    client = StatusPoisonClient(poison={"T3", "T20"})
+    helper = FedexHelper(client, bisect_failures=True, bisect_budget=4)
+
+    out = helper.fetch_batch([f"T{i}" for i in range(30)])
+
+    assert len(client.posts) == 1 + 4
+    assert {"T3", "T20"} <= set(helper.failed_tns)
+    assert all(out[tn] for tn in out if tn not in helper.failed_tns)
+
+
+def test_outage_stops_bisecting_and_queues_the_chunk(tmp_path: Path):
+    client = StatusPoisonClient(down=True)
+    queue = RetryQueue(tmp_path / "q.json")
+    helper = FedexHelper(client, bisect_failures=True, retry_queue=queue)
+
+    out = helper.fetch_batch([f"T{i}" for i in range(30)])
+
+    assert all(v == {} for v in out.values())
+    assert len(client.posts) == 1  # a 503 says nothing about the TNs
+    assert len(queue) == 30
+
+
+def test_retry_queue_persists_and_drains(tmp_path: Path):
+    path = tmp_path / "q.json"
+    q = RetryQueue(path)
+    assert q.save() is None and not path.exists()  # nothing to record
+
+    q.add("A", "FDX")
+    q.add("A")
+    q.add("B")
+    q.save()
+
+    q2 = RetryQueue(path)
+    assert q2.tracking_numbers() == ["A", "B"]
+    assert q2.carrier_map() == {"A": "FDX"}
+
+    # A follow-up run that fetches A drops it from the queue
+    helper = FedexHelper(PoisonClient(), bisect_failures=True, retry_queue=q2)
+    helper.fetch_batch(["A"])
+    q2.save()
+    assert RetryQueue(path).tracking_numbers() == ["B"]
+
+
+def test_tns_missing_from_a_good_response_stay_queued(tmp_path: Path):
+    class PartialClient(PoisonClient):
+        def post_tracking(self, body, access_token=None):
+            j = super().post_tracking(body, access_token)
+            crs = j["output"]["completeTrackResults"]
+            j["output"]["completeTrackResults"] = [c for c in crs if c["trackingNumber"] != "B"]
+            return j
+
+    q = RetryQueue(tmp_path / "q.json")
+    q.add("A")
+    q.add("B")
+    FedexHelper(PartialClient(), retry_queue=q).fetch_batch(["A", "B"])
+    assert q.tracking_numbers() == ["B"]
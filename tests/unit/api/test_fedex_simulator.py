@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+
+import requests
+
+from order_shipping_status.api.fedex import FedExAuth, FedExClient, FedExConfig
+from order_shipping_status.api.fedex_helper import FedexHelper
+from order_shipping_status.api.normalize import normalize_fedex
+from order_shipping_status.api.simulator import (
+    FedExSimulator,
+    SimulatorConfig,
+    replay_source,
+    synthetic_payload,
+)
+from order_shipping_status.api.transport import RequestsTransport
+
+
+def _client(sim, max_retries=0):
+    return FedExClient(
+        FedExAuth("id", "secret", sim.token_url),
+        FedExConfig(sim.base_url),
+        transport=RequestsTransport(timeout=5, max_retries=max_retries, backoff_factor=0),
+    )
+
+
+def _track(sim, tns, token):
+    return requests.post(
+        sim.base_url + "/v1/trackingnumbers",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"trackingInfo": [{"trackingNumberInfo": {"trackingNumber": tn}} for tn in tns]},
+        timeout=5,
+    )
+
+
+def test_helper_fetches_synthetic_payloads_in_30_tn_chunks():
+    tns = [f"7946{i:08d}" for i in range(35)]
+    with FedExSimulator() as sim:
+        out = FedexHelper(_client(sim)).fetch_batch(tns)
+        stats = sim.stats()
+
+    assert stats["token_requests"] == 1
+    assert stats["track_requests"] == 2
+    assert stats["tracking_numbers"] == 35
+    for tn in tns:
+        expected = synthetic_payload(tn)["trackResults"][0]["latestStatusDetail"]["code"]
+        assert normalize_fedex(
+            out[tn], tracking_number=tn, carrier_code="FDX", source="sim").code == expected
+
+
+def test_replay_source_serves_dump_and_not_found_for_unknown(tmp_path: Path):
+    body = {"output": {"completeTrackResults": [
+        {"trackingNumber": "TN1", "trackResults": [{"latestStatusDetail": {"code": "DL"}}]},
+        {"trackingNumber": "TN2", "trackResults": [{"latestStatusDetail": {"code": "IT"}}]},
+    ]}}
+    dump = tmp_path / "dump.json"
+    dump.write_text(json.dumps([body]), encoding="utf-8")
+
+    with FedExSimulator(source=replay_source(dump)) as sim:
+        j = _client(sim).post_tracking(
+            {"trackingInfo": [{"trackingNumberInfo": {"trackingNumber": tn}}
+                              for tn in ("TN2", "NOPE")]})
+
+    crs = j["output"]["completeTrackResults"]
+    assert crs[0]["trackingNumber"] == "TN2"
+    assert crs[0]["trackResults"][0]["latestStatusDetail"]["code"] == "IT"
+    assert crs[1]["trackResults"][0]["error"]["code"] == "TRACKING.TRACKINGNUMBER.NOTFOUND"
+
+
+def test_5xx_injection_is_retried_by_the_transport():
+    with FedExSimulator(SimulatorConfig(rate_5xx=1.0, seed=1)) as sim:
+        assert _client(sim, max_retries=2).post_tracking(
+            {"trackingInfo": [{"trackingNumberInfo": {"trackingNumber": "T1"}}]}) == {}
+        # Retries exhausted: no response, which FedexHelper treats as an outage
+        assert _client(sim).post_tracking_with_status(
+            {"trackingInfo": [{"trackingNumberInfo": {"trackingNumber": "T1"}}]}) == ({}, None)
+        stats = sim.stats()
+    assert stats["track_requests"] == 4
+    assert stats["injected_5xx"] == 4
+
+
+def test_quota_and_auth_are_enforced():
+    with FedExSimulator(SimulatorConfig(quota_per_second=2, retry_after=0)) as sim:
+        assert _track(sim, ["T1"], "bogus").status_code == 401
+        token = _client(sim).authenticate()
+        statuses = [_track(sim, ["T1"], token).status_code for _ in range(6)]
+        stats = sim.stats()
+
+    assert statuses[0] == 200
+    assert statuses.count(429) >= 2  # six requests span at most two 1s windows
+    assert stats["quota_429"] == statuses.count(429)
+    assert stats["unauthorized"] == 1
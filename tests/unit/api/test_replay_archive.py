@@ -0,0 +1,77 @@
+import gzip
+import json
+from pathlib import Path
+
+from order_shipping_status.api.archive import ArchiveReader, compress_dump, index_path_for, iter_archive
+from order_shipping_status.api.client import ReplayClient
+from order_shipping_status.api.fedex_writer import FedExWriter
+
+
+def _body(*tns):
+    return {"output": {"completeTrackResults": [
+        {"trackingNumber": tn, "trackResults": [{"status": tn}]} for tn in tns]}}
+
+
+def test_writer_frames_are_one_gzip_stream_with_random_access(tmp_path: Path):
+    path = tmp_path / "in-json-bodies.json.gz"
+    w = FedExWriter(path=path)
+    w.write(["A", "B"], _body("A", "B"))
+    w.write(["C"], _body("C"))
+    w.close()
+
+    # Whole-file decompression still works (concatenated gzip members)
+    lines = gzip.decompress(path.read_bytes()).decode("utf-8").splitlines()
+    assert [json.loads(l) for l in lines] == [_body("A", "B"), _body("C")]
+    assert w.read_all() == [_body("A", "B"), _body("C")]
+
+    reader = ArchiveReader(path)
+    assert reader.has_index
+    assert reader.frame_for("C") == 1
+    assert reader.read_frame(reader.frame_for("B")) == _body("A", "B")
+
+
+def test_replay_client_reads_archives_with_and_without_index(tmp_path: Path):
+    plain = tmp_path / "dump.json"
+    plain.write_text(json.dumps([_body("A", "B"), _body("C")]), encoding="utf-8")
+    archive = tmp_path / "dump.json.gz"
+    assert compress_dump(plain, archive) == 2
+
+    expected = ReplayClient(plain)
+    indexed = ReplayClient(archive)
+    assert indexed._archive is not None
+    for tn in ("A", "B", "C", "missing"):
+        assert indexed.fetch_status(tn) == expected.fetch_status(tn)
+
+    # A stale/missing index falls back to streaming the archive
+    index_path_for(archive).unlink()
+    streamed = ReplayClient(archive)
+    assert streamed._archive is None
+    assert streamed.fetch_status("B") == expected.fetch_status("B")
+    assert len(list(iter_archive(archive))) == 2
+
+
+def test_appending_to_archive_without_index_rebuilds_it(tmp_path: Path):
+    archive = tmp_path / "a.json.gz"
+    w = FedExWriter(path=archive)
+    w.write(["A"], _body("A"))
+    w.close()
+    index_path_for(archive).unlink()
+
+    w = FedExWriter(path=archive)
+    w.write(["B"], _body("B"))
+    w.close()
+    reader = ArchiveReader(archive)
+    assert reader.frame_for("A") == 0 and reader.frame_for("B") == 1
+
+
+def test_writer_batches_index_rewrites_and_close_writes_the_last_one(tmp_path: Path):
+    archive = tmp_path / "a.json.gz"
+    w = FedExWriter(path=archive, index_every=2)
+    for tn in "ABC":
+        w.write([tn], _body(tn))
+
+    # Two bodies were indexed; the third is only covered once the writer closes
+    assert not ArchiveReader(archive).has_index
+    w.close()
+    reader = ArchiveReader(archive)
+    assert reader.has_index and reader.frame_for("C") == 2
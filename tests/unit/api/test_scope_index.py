@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+from order_shipping_status.api.client import ReplayClient
+from order_shipping_status.api.fedex_helper import FedexHelper
+from order_shipping_status.api.normalize import (
+    index_payload_by_tn,
+    normalize_fedex,
+    scope_payload_to_tn,
+)
+
+
+def _tr(tn, code):
+    return {"trackingNumberInfo": {"trackingNumber": tn},
+            "latestStatusDetail": {"code": code, "statusByLocale": code}}
+
+
+BATCH = {
+    "transactionId": "t-1",
+    "output": {"completeTrackResults": [
+        {"trackingNumber": "A", "trackResults": [_tr("A", "DL")]},
+        {"trackingNumber": "B", "trackResults": [_tr("B", "OC")]},
+        # container without a direct TN holding two nested TNs
+        {"trackResults": [_tr("C", "IT"), _tr("D", "DE")]},
+    ]},
+}
+
+
+def test_index_payload_by_tn_scopes_direct_and_nested_matches():
+    idx = index_payload_by_tn(BATCH)
+    assert set(idx) == {"A", "B", "C", "D"}
+    a_ctr = idx["A"]["output"]["completeTrackResults"]
+    assert a_ctr == [BATCH["output"]["completeTrackResults"][0]]
+    d_ctr = idx["D"]["output"]["completeTrackResults"]
+    assert [tr["trackingNumberInfo"]["trackingNumber"]
+            for tr in d_ctr[0]["trackResults"]] == ["D"]
+
+
+def test_scope_payload_passes_through_already_scoped_payloads():
+    scoped = index_payload_by_tn(BATCH)["B"]
+    assert scope_payload_to_tn(scoped, "B") is scoped
+    assert scope_payload_to_tn(BATCH, "ZZZ") is BATCH
+    assert normalize_fedex(BATCH, tracking_number="D", carrier_code="FDX",
+                           source="t").code == "DE"
+
+
+class _Client:
+    def authenticate(self):
+        return "tok"
+
+    def post_tracking(self, body, access_token=None):
+        return BATCH
+
+
+def test_helper_returns_scoped_payloads_and_never_the_whole_batch():
+    out = FedexHelper(_Client()).fetch_batch(["A", "C", "MISSING"])
+    assert out["A"] == index_payload_by_tn(BATCH)["A"]
+    assert out["C"]["output"]["completeTrackResults"][0]["trackResults"][0][
+        "latestStatusDetail"]["code"] == "IT"
+    assert out["MISSING"] == {}
+
+
+def test_replay_client_indexes_batch_bodies_per_tn(tmp_path: Path):
+    p = tmp_path / "bodies.json"
+    p.write_text(json.dumps([BATCH]), encoding="utf-8")
+    client = ReplayClient(p)
+    assert client.fetch_status("B") == index_payload_by_tn(BATCH)["B"]
+    assert len(client.fetch_status("C")["output"]["completeTrackResults"]) == 1
@@ -0,0 +1,84 @@
+import importlib.util
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from order_shipping_status.api.fedex import FedExAuth, FedExClient, FedExConfig
+from order_shipping_status.api.simulator import FedExSimulator, SimulatorConfig
+from order_shipping_status.api.transport import Http2Transport, RequestsTransport
+from order_shipping_status.utils.metrics import RunMetrics
+
+HAS_HTTPX = importlib.util.find_spec("httpx") is not None
+HAS_H2 = importlib.util.find_spec("h2") is not None
+
+
+def _burst(transport, url, rounds=3, width=8):
+    with ThreadPoolExecutor(max_workers=width) as ex:
+        for _ in range(rounds):
+            list(ex.map(lambda _: transport.post(url).status_code, range(width)))
+
+
+def test_pool_sized_to_concurrency_reuses_connections():
+    with FedExSimulator(SimulatorConfig(latency_ms=20)) as sim:
+        url = sim.base_url + "/v1/trackingnumbers"  # 401s are fine: only pooling matters
+        small, sized = RequestsTransport(pool_maxsize=1), RequestsTransport(pool_maxsize=8)
+        _burst(small, url)
+        _burst(sized, url)
+
+    s, z = small.connection_stats(), sized.connection_stats()
+    assert s["requests"] == z["requests"] == 24
+    assert z["connections_opened"] <= 8
+    assert z["connections_reused"] >= 16
+    assert s["connections_opened"] > z["connections_opened"]
+
+
+def test_tcp_keepalive_and_blocking_pool_options_reach_urllib3():
+    t = RequestsTransport(pool_maxsize=4, pool_block=True, tcp_keepalive=True)
+    kw = t._adapter.poolmanager.connection_pool_kw
+    assert kw["maxsize"] == 4 and kw["block"] is True
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in kw["socket_options"]
+
+
+@pytest.mark.skipif(HAS_HTTPX, reason="httpx is installed")
+def test_http2_transport_requires_httpx():
+    with pytest.raises(RuntimeError, match="httpx"):
+        Http2Transport()
+
+
+@pytest.mark.skipif(not HAS_HTTPX or HAS_H2, reason="needs httpx without h2")
+def test_http2_transport_without_h2_raises_runtime_error():
+    with pytest.raises(RuntimeError, match="h2"):
+        Http2Transport(http2=True)
+    Http2Transport(http2=False).close()
+
+
+def test_http2_transport_retries_and_reports_reuse():
+    pytest.importorskip("httpx")
+    with FedExSimulator(SimulatorConfig(rate_5xx=1.0, seed=1)) as sim:
+        t = Http2Transport(http2=False, max_retries=2, backoff_factor=0)
+        token = t.post(sim.token_url, data={"grant_type": "client_credentials"}).json()
+        resp = t.post(sim.base_url + "/v1/trackingnumbers",
+                      headers={"Authorization": f"Bearer {token['access_token']}"},
+                      json={"trackingInfo": [{"trackingNumberInfo": {"trackingNumber": "T1"}}]})
+        assert resp.status_code >= 500
+        assert sim.stats()["injected_5xx"] == 3
+    stats = t.connection_stats()
+    assert stats["requests"] == 4
+    assert stats["connections_opened"] == 1
+
+
+def test_http2_transport_retries_reach_client_metrics():
+    pytest.importorskip("httpx")
+    metrics = RunMetrics()
+    with FedExSimulator(SimulatorConfig(rate_429=1.0, retry_after=0, seed=1)) as sim:
+        client = FedExClient(
+            FedExAuth("id", "secret", sim.token_url),
+            FedExConfig(sim.base_url),
+            transport=Http2Transport(http2=False, max_retries=2, backoff_factor=0),
+            metrics=metrics,
+        )
+        client.post_tracking({"trackingInfo": [{"trackingNumberInfo": {"trackingNumber": "T1"}}]})
+
+    assert metrics.counter("fedex_retries_total") == 2
+    assert metrics.counter("fedex_http_429_total") == 3
@@ -0,0 +1,75 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+
+from order_shipping_status.pipelines.batch_processor import BatchProcessor, discover_inputs
+from order_shipping_status.pipelines.workbook_processor import WorkbookProcessor
+
+
+class Logger:
+    def __getattr__(self, _):
+        return lambda *a, **k: None
+
+
+def _write_input(path: Path, tns):
+    pd.DataFrame({
+        "X": range(len(tns)),
+        "Tracking Number": tns,
+        "Carrier Code": ["FDX"] * len(tns),
+    }).to_excel(path, index=False)
+
+
+def test_discover_inputs_skips_processed_outputs_and_lock_files(tmp_path: Path):
+    for name in ("b.xlsx", "a.xlsx", "a_processed.xlsx", "~$a.xlsx", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    assert [p.name for p in discover_inputs(tmp_path)] == ["a.xlsx", "b.xlsx"]
+    assert [p.name for p in discover_inputs(tmp_path / "b*.xlsx")] == ["b.xlsx"]
+
+
+def test_batch_fetches_each_tn_once_and_writes_every_workbook(tmp_path: Path):
+    calls = []
+    normalized = []
+
+    class BatchClient:
+        def fetch_batch(self, tns, carrier_map=None):
+            calls.append(list(tns))
+            return {tn: {"code": "IT", "statusByLocale": "In transit"} for tn in tns}
+
+    def normalizer(payload, *, tracking_number, **_):
+        normalized.append(tracking_number)
+        return payload
+
+    _write_input(tmp_path / "a.xlsx", ["T1", "T2"])
+    _write_input(tmp_path / "b.xlsx", ["T2", "T3", "T1"])
+
+    proc = WorkbookProcessor(Logger(), client=BatchClient(), normalizer=normalizer,
+                             enable_date_filter=False)
+    results = BatchProcessor(proc, max_workers=2).run(
+        discover_inputs(tmp_path), SimpleNamespace())
+
+    assert calls == [["T1", "T2", "T3"]]
+    assert sorted(normalized) == ["T1", "T2", "T3"]
+    assert [Path(r["output_path"]).name for r in results] == [
+        "a_processed.xlsx", "b_processed.xlsx"]
+    b = pd.read_excel(tmp_path / "b_processed.xlsx", sheet_name="All Shipments")
+    assert b["Tracking Number"].astype(str).tolist() == ["T2", "T3", "T1"]
+
+
+def test_batch_honours_only_tracking_numbers(tmp_path: Path):
+    calls = []
+
+    class BatchClient:
+        def fetch_batch(self, tns, carrier_map=None):
+            calls.append(list(tns))
+            return {tn: {"code": "IT"} for tn in tns}
+
+    _write_input(tmp_path / "a.xlsx", ["T1", "T2"])
+    _write_input(tmp_path / "b.xlsx", ["T3", "T1"])
+
+    proc = WorkbookProcessor(Logger(), client=BatchClient(), normalizer=lambda p, **_: p,
+                             enable_date_filter=False, only_tracking_numbers={"T1"})
+    results = BatchProcessor(proc).run(discover_inputs(tmp_path), SimpleNamespace())
+
+    assert calls == [["T1"]]
+    assert [r["output_shape"][0] for r in results] == [1, 1]
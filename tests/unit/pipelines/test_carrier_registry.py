@@ -0,0 +1,61 @@
+import pandas as pd
+
+from order_shipping_status.pipelines.carrier_registry import CarrierRegistry, fedex_registry
+from order_shipping_status.pipelines.enricher import Enricher
+
+
+class Logger:
+    def __getattr__(self, _):
+        return lambda *a, **k: None
+
+
+class RecordingClient:
+    def __init__(self, code):
+        self.code = code
+        self.calls = []
+
+    def fetch_batch(self, tns, carrier_map=None):
+        self.calls.append(list(tns))
+        return {tn: {"code": self.code, "statusByLocale": self.code} for tn in tns}
+
+
+def _passthrough(payload, **_):
+    return payload
+
+
+def test_fedex_registry_routes_fedex_and_blank_codes_only():
+    reg = fedex_registry(_passthrough)
+    assert reg.handler_for("FDX") == "fedex"
+    assert reg.handler_for(" fedex ground ") == "fedex"
+    assert reg.handler_for(None) == "fedex"
+    assert reg.handler_for("UPS") is None
+
+
+def test_rows_are_grouped_by_carrier_and_merged_back_in_order():
+    fedex, ups = RecordingClient("FX"), RecordingClient("UP")
+    reg = (CarrierRegistry()
+           .register("fedex", _passthrough, client=fedex, codes=["FDX"], default=True)
+           .register("ups", _passthrough, client=ups, codes=["UPS"]))
+    df = pd.DataFrame({
+        "Tracking Number": ["F1", "U1", "D1", "F2", "U2"],
+        "Carrier Code": ["FDX", "UPS", "DHL", "FDX", "ups"],
+        "Order": [1, 2, 3, 4, 5],
+    }, index=[10, 11, 12, 13, 14])
+
+    out = Enricher(Logger(), client=None, normalizer=None, registry=reg).enrich(df)
+
+    assert fedex.calls == [["F1", "F2"]]
+    assert ups.calls == [["U1", "U2"]]
+    assert list(out.index) == [10, 11, 12, 13, 14]
+    assert out["Order"].tolist() == [1, 2, 3, 4, 5]
+    assert out["code"].tolist() == ["FX", "UP", "", "FX", "UP"]
+    assert out["code"].dtype.name == "string"
+
+
+def test_handler_without_client_uses_the_enrichers_client():
+    shared = RecordingClient("FX")
+    df = pd.DataFrame({"Tracking Number": ["F1", "X1"], "Carrier Code": ["FDX", "UPS"]})
+    out = Enricher(Logger(), client=shared, normalizer=None,
+                   registry=fedex_registry(_passthrough)).enrich(df)
+    assert shared.calls == [["F1"]]
+    assert out["code"].tolist() == ["FX", ""]
@@ -12,3 +12,17 @@ def test_ensure_is_idempotent_and_string_dtype():
     for col in OUTPUT_FEDEX_COLUMNS + [OUTPUT_STATUS_COLUMN]:
         assert col in one.columns
         assert one[col].dtype.name == "string"
+
+
+def test_ensure_fills_defaults_and_coerces_junk_indicators():
+    from order_shipping_status.io.schema import INDICATOR_COLS, OUTPUT_CONTRACT
+    from order_shipping_status.rules import indicators
+
+    base = pd.DataFrame({"code": [None, "x"], "IsRTS": ["1", "junk"], "IsStalled": [1.0, None]})
+    out = ColumnContract().ensure(base)
+    assert out["code"].tolist() == ["", "x"]
+    assert out["IsRTS"].tolist() == [1, 0] and out["IsRTS"].dtype == "int64"
+    assert out["IsStalled"].tolist() == [1, 0]
+    assert list(out.columns[:3]) == ["code", "IsRTS", "IsStalled"]
+    assert indicators.INDICATOR_COLS is INDICATOR_COLS
+    assert [n for n in OUTPUT_CONTRACT.names if n in INDICATOR_COLS] == list(INDICATOR_COLS)
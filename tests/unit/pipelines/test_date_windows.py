@@ -0,0 +1,105 @@
+import datetime as dt
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from order_shipping_status.pipelines.preprocessor import Preprocessor, week_windows
+from order_shipping_status.pipelines.workbook_processor import WorkbookProcessor
+
+
+class Logger:
+    def __getattr__(self, _):
+        return lambda *a, **k: None
+
+
+def test_week_windows_cover_range_sunday_to_saturday():
+    w = week_windows(dt.date(2025, 1, 8), dt.date(2025, 1, 20))
+    assert w == [
+        (dt.date(2025, 1, 5), dt.date(2025, 1, 11)),
+        (dt.date(2025, 1, 12), dt.date(2025, 1, 18)),
+        (dt.date(2025, 1, 19), dt.date(2025, 1, 25)),
+    ]
+
+
+def test_prepare_windows_buckets_rows_in_one_pass():
+    df = pd.DataFrame({
+        "X": range(6),
+        "Promised Delivery Date": ["2025-01-05", "2025-01-11", "2025-01-12",
+                                   "2025-01-18", "2025-01-26", "garbage"],
+        "Delivery Tracking Status": ["in transit", "in transit", "Delivered",
+                                     "in transit", "in transit", "in transit"],
+    })
+    windows = week_windows(dt.date(2025, 1, 5), dt.date(2025, 1, 18))
+    buckets = Preprocessor().prepare_windows(df, windows)
+
+    assert list(buckets) == windows
+    assert buckets[windows[0]].index.tolist() == [0, 1]
+    assert buckets[windows[1]].index.tolist() == [3]  # 2 is delivered
+    assert "X" not in buckets[windows[0]].columns
+
+
+def test_prepare_windows_rejects_overlapping_windows():
+    df = pd.DataFrame({"X": [0], "Promised Delivery Date": ["2025-01-05"]})
+    with pytest.raises(ValueError):
+        Preprocessor().prepare_windows(df, [
+            (dt.date(2025, 1, 1), dt.date(2025, 1, 10)),
+            (dt.date(2025, 1, 5), dt.date(2025, 1, 12)),
+        ])
+
+
+def test_process_windows_fetches_once_and_writes_one_output_per_week(tmp_path: Path):
+    calls = []
+
+    class BatchClient:
+        def fetch_batch(self, tns, carrier_map=None):
+            calls.append(list(tns))
+            return {tn: {"code": "IT", "statusByLocale": "In transit"} for tn in tns}
+
+    src = tmp_path / "in.xlsx"
+    pd.DataFrame({
+        "X": [0, 1, 2],
+        "Promised Delivery Date": ["2025-01-06", "2025-01-13", "2025-01-14"],
+        "Tracking Number": ["A", "B", "C"],
+        "Carrier Code": ["FDX", "FDX", "FDX"],
+    }).to_excel(src, index=False)
+
+    windows = week_windows(dt.date(2025, 1, 5), dt.date(2025, 1, 18))
+    proc = WorkbookProcessor(Logger(), client=BatchClient(),
+                             normalizer=lambda p, **_: p)
+    results = proc.process_windows(
+        src, windows, SimpleNamespace(), output_dir=tmp_path / "out")
+
+    assert calls == [["A", "B", "C"]]
+    paths = [Path(r["output_path"]).name for r in results]
+    assert paths == ["in_2025-01-05_2025-01-11_processed.xlsx",
+                     "in_2025-01-12_2025-01-18_processed.xlsx"]
+    second = pd.read_excel(tmp_path / "out" / paths[1], sheet_name="All Issues")
+    assert second["Tracking Number"].astype(str).tolist() == ["B", "C"]
+
+
+def test_process_windows_honours_only_tracking_numbers(tmp_path: Path):
+    calls = []
+
+    class BatchClient:
+        def fetch_batch(self, tns, carrier_map=None):
+            calls.append(list(tns))
+            return {tn: {"code": "IT"} for tn in tns}
+
+    src = tmp_path / "in.xlsx"
+    pd.DataFrame({
+        "X": [0, 1, 2],
+        "Promised Delivery Date": ["2025-01-06", "2025-01-13", "2025-01-14"],
+        "Tracking Number": ["A", "B", "C"],
+        "Carrier Code": ["FDX", "FDX", "FDX"],
+    }).to_excel(src, index=False)
+
+    windows = week_windows(dt.date(2025, 1, 5), dt.date(2025, 1, 18))
+    proc = WorkbookProcessor(Logger(), client=BatchClient(),
+                             normalizer=lambda p, **_: p, only_tracking_numbers={"C"})
+    results = proc.process_windows(
+        src, windows, SimpleNamespace(), output_dir=tmp_path / "out")
+
+    assert calls == [["C"]]
+    assert [r["output_shape"][0] for r in results] == [0, 1]
@@ -48,3 +48,44 @@ def test_enrich_writes_sidecar_when_dir_passed(tmp_path: Path):
     assert files, "expected a sidecar JSON"
     data = json.loads(files[0].read_text())
     assert (data.get("code") or data.get("payload", {}).get("code")) == "DLV"
+
+
+def test_enrich_resolves_tn_and_carrier_text_per_column():
+    seen = {}
+
+    class BatchClient:
+        def fetch_batch(self, tns, carrier_map=None):
+            seen["tns"], seen["carriers"] = list(tns), dict(carrier_map)
+            return {tn: {"code": "IT"} for tn in tns}
+
+    df = pd.DataFrame({"Tracking Number": [" T1 ", "nan", None, "T2"],
+                       "Carrier Code": ["FDX ", "FDX", "FDX", "None"]})
+    out = Enricher(QL(), client=BatchClient(),
+                   normalizer=lambda p, **_: p).enrich(df)
+    assert seen == {"tns": ["T1", "T2"], "carriers": {"T1": "FDX"}}
+    assert out["code"].tolist() == ["IT", "", "", "IT"]
+
+
+def test_repeated_tns_are_fetched_and_normalized_once():
+    fetched, normalized, sidecar = [], [], []
+
+    class BatchClient:
+        def fetch_batch(self, tns, carrier_map=None):
+            fetched.append(list(tns))
+            return {tn: {"code": tn + "-IT"} for tn in tns}
+
+    class Sink:
+        def write(self, carrier, tn, cols):
+            sidecar.append(tn)
+
+    def normalizer(p, *, tracking_number, **_):
+        normalized.append(tracking_number)
+        return p
+
+    df = pd.DataFrame({"Tracking Number": ["T1", "T2", "T1", "T1", "T2"],
+                       "Carrier Code": ["FDX"] * 5})
+    out = Enricher(QL(), client=BatchClient(), normalizer=normalizer).enrich(
+        df, sidecar_sink=Sink())
+    assert fetched == [["T1", "T2"]]
+    assert normalized == sidecar == ["T1", "T2"]
+    assert out["code"].tolist() == ["T1-IT", "T2-IT", "T1-IT", "T1-IT", "T2-IT"]
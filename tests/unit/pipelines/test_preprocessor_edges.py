@@ -38,3 +38,32 @@ def test_garbage_dates_and_missing_status_are_kept_by_filters_then_removed_on_st
     out = Preprocessor(reference_date=ref).prepare(df)
     assert len(out) == 1
     assert out["Promised Delivery Date"].iloc[0] == "2025-01-07"
+
+
+def test_mixed_date_formats_sniffed_once_and_leftovers_fall_back():
+    ref = dt.date(2025, 1, 15)  # prior week 2025-01-05..2025-01-11
+    df = pd.DataFrame({
+        "X": range(6),
+        "Promised Delivery Date": [
+            "2025-01-05", "01/11/2025", "2025-01-12",
+            "Jan 7, 2025",   # matches no explicit format -> dateutil fallback
+            None, dt.datetime(2025, 1, 8, 13, 30),
+        ],
+    }, index=[0, 0, 1, 1, 2, 2])  # duplicate labels must not confuse parsing
+    p = Preprocessor(reference_date=ref)
+    out = p.prepare(df)
+    assert out["Promised Delivery Date"].tolist() == [
+        "2025-01-05", "01/11/2025", "Jan 7, 2025", dt.datetime(2025, 1, 8, 13, 30)]
+    assert p._date_formats["Promised Delivery Date"] == (
+        "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%m/%d/%Y")
+
+
+def test_datetime_column_and_delivered_casefold_without_status_nans():
+    ref = dt.date(2025, 1, 15)
+    df = pd.DataFrame({
+        "X": [0, 1, 2],
+        "Promised Delivery Date": pd.to_datetime(["2025-01-06", "2025-01-07", "2025-01-20"]),
+        "Delivery Tracking Status": ["Delivered", pd.NA, "in transit"],
+    })
+    out = Preprocessor(reference_date=ref).prepare(df)
+    assert out["Promised Delivery Date"].dt.day.tolist() == [7]
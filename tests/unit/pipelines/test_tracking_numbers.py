@@ -0,0 +1,92 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from order_shipping_status.pipelines.tracking_numbers import (
+    clean_tracking_number,
+    clean_tracking_numbers,
+)
+from order_shipping_status.pipelines.workbook_processor import WorkbookProcessor
+
+
+class Logger:
+    def __getattr__(self, _):
+        return lambda *a, **k: None
+
+
+def test_vectorized_cleaning_matches_scalar_rules():
+    values = [None, np.nan, pd.NA, "", " nan ", "None", "123", "00123", "123.0",
+              "1.2345E+11", "1,234", "-5", "12.5", "ABC.0", " 7 ", 123456789012.0,
+              12, "inf", "0.0", "12.0.0"]
+    got = clean_tracking_numbers(pd.Series(values, dtype=object))
+    assert got.tolist() == [clean_tracking_number(v) for v in values]
+    assert got.dtype == object
+
+
+def test_digit_strings_are_left_unchanged():
+    tns = ["00123", "00340123450000000018", "0"]
+    assert clean_tracking_numbers(pd.Series(tns)).tolist() == tns
+    assert [clean_tracking_number(t) for t in tns] == tns
+    assert clean_tracking_numbers(pd.Series(["123.0", "1.2345E+11"])).tolist() == [
+        "123", "123450000000"]
+
+
+def test_long_digit_tns_keep_every_digit():
+    tn = "9612019123456789012345678901"  # 28 digits, beyond float precision
+    assert clean_tracking_numbers(pd.Series([tn])).tolist() == [tn]
+
+
+def test_large_int_tns_match_the_scalar_rules():
+    values = [1234567890123456789, 2 ** 53 + 1, 9612019123456789012345, 12, 123456789012.0,
+              float(2 ** 60), None]
+    got = clean_tracking_numbers(pd.Series(values, dtype=object))
+    assert got.tolist() == [clean_tracking_number(v) for v in values]
+    assert got[0] == "1234567890123456789"
+
+
+def test_float_tns_are_fixed_at_read_time_and_written_as_text(tmp_path: Path):
+    src = tmp_path / "in.xlsx"
+    pd.DataFrame({"Tracking Number": [123456789012, None, 987654321098],
+                  "Carrier Code": ["FDX"] * 3}).to_excel(src, index=False)
+    proc = WorkbookProcessor(Logger(), enable_date_filter=False)
+
+    df_in = proc._read_input(src)
+    assert df_in["Tracking Number"].tolist() == ["123456789012", "", "987654321098"]
+
+    proc.process(src, tmp_path / "in_processed.xlsx", SimpleNamespace())
+    ws = load_workbook(tmp_path / "in_processed.xlsx")["All Shipments"]
+    cells = [row[0] for row in ws.iter_rows(min_row=2, max_col=1)]
+    assert [c.value for c in cells if c.value] == ["123456789012", "987654321098"]
+    assert {c.number_format for c in cells} == {"@"}
+
+
+def test_numeric_columns_take_the_numpy_path():
+    floats = pd.Series([123456789012.0, np.nan, 1.5, -2.0])
+    assert clean_tracking_numbers(floats).tolist() == ["123456789012", "", "1", "-2"]
+    ints = pd.Series([12345678901234567, 7], dtype="int64")
+    assert clean_tracking_numbers(ints).tolist() == ["12345678901234567", "7"]
+
+
+def test_zero_prefixed_text_tn_reaches_client_and_output_unchanged(tmp_path: Path):
+    seen = []
+
+    class RecordingClient:
+        def fetch_batch(self, tns, carrier_map=None):
+            seen.extend(tns)
+            return {tn: {"code": "IT"} for tn in tns}
+
+    src = tmp_path / "in.xlsx"
+    pd.DataFrame({"Order": [1, 2],  # the preprocessor drops the first column
+                  "Tracking Number": ["00340123450000000018", 123456789012],
+                  "Carrier Code": ["FDX", "FDX"]}).to_excel(src, index=False)
+    proc = WorkbookProcessor(Logger(), client=RecordingClient(),
+                             normalizer=lambda p, **_: p, enable_date_filter=False)
+    proc.process(src, tmp_path / "in_processed.xlsx", SimpleNamespace())
+
+    assert seen == ["00340123450000000018", "123456789012"]
+    ws = load_workbook(tmp_path / "in_processed.xlsx")["All Shipments"]
+    assert [row[1].value for row in ws.iter_rows(min_row=2, max_col=2)] == [
+        "00340123450000000018", "123456789012"]
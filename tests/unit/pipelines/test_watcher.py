@@ -0,0 +1,97 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+
+from order_shipping_status.api.cache import CachingClient
+from order_shipping_status.pipelines.watcher import InboxWatcher
+from order_shipping_status.pipelines.workbook_processor import WorkbookProcessor
+
+
+class Logger:
+    def __getattr__(self, _):
+        return lambda *a, **k: None
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_batch(self, tns, carrier_map=None):
+        self.calls.append(list(tns))
+        return {tn: {"code": "IT"} for tn in tns}
+
+
+def _write_input(path: Path, tns):
+    pd.DataFrame({
+        "X": range(len(tns)),
+        "Tracking Number": tns,
+        "Carrier Code": ["FDX"] * len(tns),
+    }).to_excel(path, index=False)
+
+
+def test_watcher_waits_for_settled_files_and_processes_each_once(tmp_path: Path):
+    inner = CountingClient()
+    proc = WorkbookProcessor(Logger(), client=CachingClient(inner),
+                             normalizer=lambda p, **_: p, enable_date_filter=False)
+    w = InboxWatcher(proc, tmp_path, SimpleNamespace(), settle_polls=1)
+
+    _write_input(tmp_path / "a.xlsx", ["T1", "T2"])
+    assert w.poll_once() == []  # first sighting: not yet settled
+    [res] = w.poll_once()
+    assert Path(res["output_path"]).name == "a_processed.xlsx"
+    assert w.poll_once() == []  # unchanged: not reprocessed
+
+    # The warm cache serves TNs seen in earlier files
+    _write_input(tmp_path / "b.xlsx", ["T2", "T3"])
+    w.poll_once()
+    w.poll_once()
+    assert inner.calls == [["T1", "T2"], ["T3"]]
+
+
+def test_default_pickup_delay_is_sub_second(tmp_path: Path):
+    w = InboxWatcher(WorkbookProcessor(Logger()), tmp_path)
+    assert (w.settle_polls + 1) * w.poll_interval <= 0.5
+
+
+def test_watcher_skips_inputs_processed_before_restart(tmp_path: Path):
+    _write_input(tmp_path / "a.xlsx", ["T1"])
+    (tmp_path / "a_processed.xlsx").write_bytes(b"")
+    proc = WorkbookProcessor(Logger(), client=CountingClient(),
+                             normalizer=lambda p, **_: p, enable_date_filter=False)
+    w = InboxWatcher(proc, tmp_path, settle_polls=0)
+    assert w.poll_once() == []
+
+
+def test_caching_client_expires_entries_and_skips_empty_payloads():
+    now = [0.0]
+
+    class Inner:
+        calls = 0
+
+        def fetch_status(self, tn, carrier_code=None):
+            Inner.calls += 1
+            return {} if tn == "EMPTY" else {"tn": tn}
+
+    c = CachingClient(Inner(), ttl_seconds=10, clock=lambda: now[0])
+    c.fetch_status("T1")
+    c.fetch_status("T1")
+    c.fetch_status("EMPTY")
+    c.fetch_status("EMPTY")
+    assert Inner.calls == 3
+    now[0] = 11.0
+    c.fetch_status("T1")
+    assert Inner.calls == 4
+    assert (c.hits, c.misses) == (1, 4)
+
+
+def test_caching_client_exposes_inner_writer_to_the_marker(tmp_path: Path):
+    inner = CountingClient()
+    inner._writer = SimpleNamespace(path=tmp_path / "in-json-bodies.json")
+    proc = WorkbookProcessor(Logger(), client=CachingClient(inner),
+                             normalizer=lambda p, **_: p, enable_date_filter=False)
+    _write_input(tmp_path / "in.xlsx", ["T1"])
+    proc.process(tmp_path / "in.xlsx", tmp_path / "out.xlsx")
+
+    marker = pd.read_excel(tmp_path / "out.xlsx", sheet_name="Marker")
+    assert marker.loc[0, "api_bodies_path"] == str(inner._writer.path)
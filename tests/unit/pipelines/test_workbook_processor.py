@@ -84,3 +84,31 @@ def test_processor_handles_empty_input(tmp_path: Path):
     env = SimpleNamespace(SHIPPING_CLIENT_ID="", SHIPPING_CLIENT_SECRET="")
     WorkbookProcessor(QL()).process(src, out, env)
     assert out.exists()
+
+
+def test_derive_views_slices_by_bitmask_and_cleans_tns_once():
+    df_out = pd.DataFrame({
+        "Tracking Number": [1.0, "T2", "T3", "T4"],
+        "IsPreTransit": [1, 0, 0, 0],
+        "IsDelivered": [0, 1, 0, 0],
+        "IsRTS": [0, 0, 1, 0],
+        "IsStalled": [0, 0, 0, 1],
+        "Damaged": [0, 1, 0, 0],
+        "Extra": ["a", "b", "c", "d"],
+    })
+    marker = pd.DataFrame([{"_oss_marker": "ok"}])
+    views = WorkbookProcessor._derive_views(df_out.iloc[:, :1], df_out, marker)
+
+    assert list(views) == ["All Shipments", "All Issues", "PreTransit",
+                           "Stalled", "Damaged or Returned", "Marker"]
+    tns = {k: v["Tracking Number"].tolist() for k, v in views.items() if k != "Marker"}
+    assert tns == {
+        "All Shipments": ["1", "T2", "T3", "T4"],
+        "All Issues": ["1", "T3", "T4"],
+        "PreTransit": ["1"],
+        "Stalled": ["T4"],
+        "Damaged or Returned": ["T2", "T3"],
+    }
+    cols = list(views["Stalled"].columns)
+    assert cols.index("UnableToDeliver") == cols.index("Damaged") + 1
+    assert views["Marker"] is marker
@@ -3,6 +3,7 @@ import types
 import sys
 import os
 import pandas as pd
+import pytest
 
 from order_shipping_status import cli
 
@@ -92,3 +93,24 @@ def test_cli_strict_env_missing_returns_2(tmp_path, monkeypatch):
         os.chdir(cwd)
 
     assert code == 2
+
+
+def test_retry_failed_is_rejected_in_batch_mode(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("SHIPPING_CLIENT_ID", "x")
+    monkeypatch.setenv("SHIPPING_CLIENT_SECRET", "y")
+    queue = tmp_path / "q.json"
+    queue.write_text('{"version": 1, "items": {"A": {"attempts": 1}}}', encoding="utf-8")
+    rc = run_cli([str(tmp_path), "--batch", "--retry-failed",
+                  "--retry-queue", str(queue), "--no-console"])
+    assert rc == 2
+
+
+@pytest.mark.parametrize("extra", [
+    ["--weeks-from", "2025-01-05", "--weeks-to", "2025-01-18"],
+    ["--from-enriched", "x_enriched.parquet"],
+])
+@pytest.mark.parametrize("mode", ["--batch", "--watch"])
+def test_single_workbook_options_are_rejected_in_batch_and_watch(tmp_path: Path, mode, extra):
+    pd.DataFrame({"Order": [1], "Tracking Number": ["T1"]}).to_excel(
+        tmp_path / "in.xlsx", index=False)
+    assert run_cli([str(tmp_path), mode, "--no-console", *extra]) == 2
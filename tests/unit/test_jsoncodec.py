@@ -0,0 +1,79 @@
+import datetime as dt
+import importlib.util
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from order_shipping_status.api.client import ReplayClient
+from order_shipping_status.utils import jsoncodec
+
+BACKENDS = [
+    pytest.param(name, marks=pytest.mark.skipif(
+        name != "stdlib" and importlib.util.find_spec(name) is None,
+        reason=f"{name} not installed"))
+    for name in jsoncodec.BACKENDS
+]
+
+SAMPLE = {
+    "output": {"completeTrackResults": [{
+        "trackingNumber": "123456789012",
+        "trackResults": [{"latestStatusDetail": {"code": "DL", "description": "Délivré ✓"},
+                          "scanEvents": [{"date": "2025-10-07T10:00:00-05:00"}],
+                          "weight": 1.25, "pieces": 2, "flags": [True, False, None]}],
+    }]},
+    "big": 2 ** 70,
+}
+
+
+@pytest.fixture
+def backend(request):
+    yield jsoncodec.use_backend(request.param)
+    jsoncodec.use_backend()
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+def test_round_trip_matches_stdlib(backend):
+    assert jsoncodec.backend() == backend
+    encoded = jsoncodec.dumps_bytes(SAMPLE)
+    assert json.loads(encoded) == SAMPLE
+    assert jsoncodec.loads(encoded) == SAMPLE
+    assert jsoncodec.loads(json.dumps(SAMPLE)) == SAMPLE
+    assert "Délivré ✓" in jsoncodec.dumps(SAMPLE)  # non-ASCII kept as-is
+    assert json.loads(jsoncodec.dumps(SAMPLE, indent=2)) == SAMPLE
+    assert jsoncodec.loads(jsoncodec.dumps({"t": object()}, default=lambda o: "x")) == {"t": "x"}
+    assert math.isnan(jsoncodec.loads("[NaN]")[0])  # stdlib leniency preserved
+    with pytest.raises(ValueError):
+        jsoncodec.loads("{not json")
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+def test_nan_datetime_and_numpy_values_match_stdlib(backend):
+    record = {"weight": float("nan"), "cap": float("inf"), "scale": np.float64(1.5),
+              "at": dt.datetime(2025, 10, 7, 10, 0), "on": dt.date(2025, 10, 7), "n": None}
+    expected = json.dumps(record, default=str)
+    # Compare via stdlib re-rendering: backends differ only in whitespace
+    assert json.dumps(json.loads(jsoncodec.dumps(record, default=str))) == expected
+    assert json.dumps(json.loads(jsoncodec.dumps(record, default=str, indent=2))) == expected
+    with pytest.raises(TypeError):
+        jsoncodec.dumps({"at": dt.datetime(2025, 10, 7)})
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+def test_replay_client_parity_across_backends(backend, tmp_path: Path):
+    dump = tmp_path / "dump.json"
+    dump.write_text(json.dumps([SAMPLE]), encoding="utf-8")
+    assert ReplayClient(dump).fetch_status("123456789012")["output"] == SAMPLE["output"]
+
+
+def test_env_override_and_unknown_backend(monkeypatch):
+    monkeypatch.setenv(jsoncodec.ENV_VAR, "stdlib")
+    try:
+        assert jsoncodec.use_backend() == "stdlib"
+    finally:
+        monkeypatch.delenv(jsoncodec.ENV_VAR)
+        jsoncodec.use_backend()
+    with pytest.raises(ValueError):
+        jsoncodec.use_backend("simdjson")
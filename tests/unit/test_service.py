@@ -0,0 +1,54 @@
+import asyncio
+import json
+import logging
+
+from order_shipping_status.service import StatusService, serve
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_batch(self, tns, carrier_map=None):
+        self.calls.append(list(tns))
+        return {tn: {"code": "DL", "statusByLocale": "Delivered"} for tn in tns}
+
+
+async def _request(port, method, target, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write((f"{method} {target} HTTP/1.1\r\nHost: x\r\n"
+                  f"Content-Length: {len(data)}\r\n\r\n").encode() + data)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_concurrent_requests_share_one_batched_fetch_and_cache():
+    client = CountingClient()
+    svc = StatusService(client, lambda p, **_: p,
+                        logging.getLogger("test-service"), window_ms=50)
+
+    async def scenario():
+        server = await serve(svc, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            first = await asyncio.gather(
+                _request(port, "GET", "/status?tn=A"),
+                _request(port, "GET", "/status?tn=B,A"),
+                _request(port, "POST", "/status", ["C", {"tn": "D", "carrier": "FDX"}]),
+            )
+            again = await _request(port, "GET", "/status?tn=C")
+            missing = await _request(port, "GET", "/status")
+            return first, again, missing
+
+    first, again, missing = asyncio.run(scenario())
+
+    assert [status for status, _ in first] == [200, 200, 200]
+    assert [r["Tracking Number"] for r in first[1][1]["results"]] == ["B", "A"]
+    assert first[2][1]["results"][1]["Carrier Code"] == "FDX"
+    assert len(client.calls) == 1 and sorted(client.calls[0]) == ["A", "B", "C", "D"]
+    assert again[0] == 200 and client.calls[1:] == []  # served from cache
+    assert missing[0] == 400
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Load-test FedExClient/FedexHelper/RequestsTransport against the local simulator.
+
+Usage: PYTHONPATH=src python tools/bench_fedex_sim.py [--tns N] [--workers W]
+           [--latency-ms MS] [--jitter-ms MS] [--rate-429 P] [--rate-5xx P]
+           [--quota-per-second Q] [--retries R] [--pool-size P] [--http2]
+
+Starts an in-process `FedExSimulator` with the given fault profile, then
+fetches N synthetic TNs in 30-TN chunks spread over W threads sharing one
+client (and so one token and one connection pool). Prints throughput, how
+many TNs came back empty, the transport's connection reuse and the
+simulator's request/error counters. `--http2` uses Http2Transport (needs
+httpx; the simulator speaks HTTP/1.1, so this measures httpx pooling).
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from order_shipping_status.api.fedex import FedExAuth, FedExClient, FedExConfig
+from order_shipping_status.api.fedex_helper import FedexHelper
+from order_shipping_status.api.simulator import FedExSimulator, SimulatorConfig
+from order_shipping_status.api.transport import Http2Transport, RequestsTransport
+from order_shipping_status.utils.metrics import RunMetrics
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--tns", type=int, default=3000)
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--latency-ms", type=float, default=50.0)
+    p.add_argument("--jitter-ms", type=float, default=20.0)
+    p.add_argument("--rate-429", type=float, default=0.0)
+    p.add_argument("--rate-5xx", type=float, default=0.0)
+    p.add_argument("--quota-per-second", type=int, default=0)
+    p.add_argument("--retries", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--pool-size", type=int, default=10)
+    p.add_argument("--http2", action="store_true")
+    args = p.parse_args()
+
+    cfg = SimulatorConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        quota_per_second=args.quota_per_second,
+        retry_after=0,
+        seed=args.seed,
+    )
+    tns = [f"79{i:010d}" for i in range(args.tns)]
+    chunks = [tns[i:i + 30] for i in range(0, len(tns), 30)]
+
+    with FedExSimulator(cfg) as sim:
+        metrics = RunMetrics()
+        if args.http2:
+            transport = Http2Transport(
+                max_retries=args.retries, backoff_factor=0.05,
+                max_connections=args.pool_size, max_keepalive_connections=args.pool_size)
+        else:
+            transport = RequestsTransport(
+                max_retries=args.retries, backoff_factor=0.05, pool_maxsize=args.pool_size)
+        client = FedExClient(
+            FedExAuth("bench", "bench", sim.token_url),
+            FedExConfig(sim.base_url),
+            transport=transport,
+            metrics=metrics,
+        )
+        helper = FedexHelper(client, metrics=metrics)
+        client.authenticate()
+
+        t = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            results = list(pool.map(helper.fetch_batch, chunks))
+        elapsed = time.perf_counter() - t
+        stats = sim.stats()
+
+    empty = sum(1 for r in results for payload in r.values() if not payload)
+    print(f"{args.tns} TNs, {len(chunks)} chunks, {args.workers} worker(s): "
+          f"{elapsed:.2f} s ({args.tns / elapsed:,.0f} TNs/s), {empty} empty")
+    print("connections: " + ", ".join(
+        f"{k}={v}" for k, v in transport.connection_stats().items()))
+    print("simulator: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Benchmark the JSON backends on the replay dumps in tests/data.
+
+Usage: PYTHONPATH=src python tools/bench_json.py [FILES...] [--repeat R]
+
+For each available backend (orjson, ujson, stdlib) it measures:
+  - decode: parsing each dump (what ReplayClient does on startup)
+  - encode: serializing every body once, as the writer/archive paths do
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import time
+from pathlib import Path
+
+from order_shipping_status.utils import jsoncodec
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("files", nargs="*", type=Path)
+    p.add_argument("--repeat", type=int, default=7)
+    args = p.parse_args()
+    files = args.files or [Path(f) for f in sorted(
+        glob.glob("tests/data/*_api_bodies.json"))]
+    blobs = [f.read_bytes() for f in files]
+    total_mb = sum(len(b) for b in blobs) / 1e6
+    print(f"{len(files)} file(s), {total_mb:.2f} MB")
+
+    for name in jsoncodec.BACKENDS:
+        if jsoncodec.use_backend(name) != name:
+            print(f"{name:>7}: not installed")
+            continue
+        bodies = [b for blob in blobs for b in jsoncodec.loads(blob)]
+        dec = _best(lambda: [jsoncodec.loads(b) for b in blobs], args.repeat)
+        enc = _best(lambda: [jsoncodec.dumps_bytes(b) for b in bodies], args.repeat)
+        print(f"{name:>7}: decode {dec * 1e3:7.2f} ms ({total_mb / dec:6.0f} MB/s)"
+              f"  encode {enc * 1e3:7.2f} ms")
+    jsoncodec.use_backend()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark Preprocessor.prepare on synthetic 100k-row inputs.
+
+Usage: PYTHONPATH=src python tools/bench_preprocessor.py [--rows N] [--repeat R]
+
+Three date-column shapes are measured: datetime64 (what read_excel returns
+for real date cells), ISO text, and mixed text (ISO + US + a few free-form
+leftovers that need the dateutil fallback).
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import time
+
+import numpy as np
+import pandas as pd
+
+from order_shipping_status.pipelines.preprocessor import Preprocessor
+
+REF = dt.date(2025, 10, 22)
+STATUSES = np.array(["delivered", "in_transit", "Delivered",
+                    "out_for_delivery", "pre_transit"])
+
+
+def _frame(rows: int, shape: str) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    days = pd.Timestamp("2025-09-01") + pd.to_timedelta(
+        rng.integers(0, 60, rows), unit="D")
+    if shape == "datetime":
+        dates = pd.Series(days)
+    elif shape == "iso":
+        dates = pd.Series(days.strftime("%Y-%m-%d"))
+    else:
+        iso = days.strftime("%Y-%m-%d")
+        us = days.strftime("%m/%d/%Y")
+        free = days.strftime("%b %d, %Y")
+        pick = rng.integers(0, 100, rows)
+        dates = pd.Series(np.where(pick < 60, iso, np.where(pick < 98, us, free)))
+    return pd.DataFrame({
+        "Unnamed: 0": np.arange(rows),
+        "Promised Delivery Date": dates,
+        "Tracking Number": (393_000_000_000 + np.arange(rows)).astype(str),
+        "Delivery Tracking Status": STATUSES[rng.integers(0, len(STATUSES), rows)],
+    })
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    for shape in ("datetime", "iso", "mixed"):
+        df = _frame(args.rows, shape)
+        best = float("inf")
+        kept = 0
+        for _ in range(args.repeat):
+            p = Preprocessor(reference_date=REF)  # fresh format cache each run
+            t0 = time.perf_counter()
+            kept = len(p.prepare(df))
+            best = min(best, time.perf_counter() - t0)
+        print(f"{shape:>8}: rows={args.rows} kept={kept} best={best * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()